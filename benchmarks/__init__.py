@@ -0,0 +1,9 @@
+"""
+Benchmarks offline do minero.
+
+Gera repositórios git sintéticos de tamanho configurável e mede o tempo de
+cada comando de ponta a ponta e de cada etapa da análise separadamente,
+comparando os resultados com um baseline salvo em disco.
+
+Uso: python -m benchmarks --help
+"""
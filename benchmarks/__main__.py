@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import platform
+import subprocess
+import tempfile
+
+import typer
+from rich.console import Console
+from rich.table import Table
+from typing_extensions import Annotated
+
+from .baseline import compare, load_baseline, save_baseline
+from .measure import command_arguments, findings_memory, measure_stages, peak_memory, run_command, time_call
+from .synthetic_repo import RepoSpec, build_repository
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+
+# saída do benchmark vai para stderr: o stdout é usado pelos comandos medidos
+console = Console(stderr=True)
+
+app = typer.Typer(help="Benchmarks offline do minero com repositórios git sintéticos.", add_completion=False)
+
+def _root_commit(repo_path: str) -> str:
+    return subprocess.run(["git", "-C", repo_path, "rev-list", "--max-parents=0", "HEAD"], check=True,
+                          capture_output=True, text=True).stdout.split()[0]
+
+def _head_commit(repo_path: str) -> str:
+    return subprocess.run(["git", "-C", repo_path, "rev-parse", "HEAD"], check=True,
+                          capture_output=True, text=True).stdout.strip()
+
+def run_benchmarks(repo_path: str, spec: RepoSpec, commands: List[str], repeat: int, memory: bool) -> Dict[str, Any]:
+    """Mede as etapas e os comandos no repositório e devolve o resultado serializável."""
+    stages, commit_count, file_count = measure_stages(repo_path)
+    arguments = command_arguments(repo_path, _root_commit(repo_path), _head_commit(repo_path))
+
+    results: Dict[str, Any] = {
+        "spec": spec.to_dict(),
+        "python": platform.python_version(),
+        "commits": commit_count,
+        "files": file_count,
+        "stages": {name: round(seconds, 6) for name, seconds in sorted(stages.items())},
+        "commands": {},
+    }
+    if memory:
+        results["findings_kib"] = findings_memory(repo_path)
+    for name in commands:
+        args = arguments[name]
+        seconds = time_call(lambda: run_command(args), repeat)
+        entry = {
+            "seconds": round(seconds, 6),
+            "commits_per_s": round(commit_count / seconds, 2),
+            "files_per_s": round(file_count / seconds, 2),
+        }
+        if memory:
+            entry["peak_kib"] = peak_memory(lambda: run_command(args))
+        results["commands"][name] = entry
+    return results
+
+def _print_results(results: Dict[str, Any]) -> None:
+    console.print(f"[bold]Repositório:[/bold] {results['commits']} commits, {results['files']} arquivos analisados")
+
+    commands = Table(title="Comandos (ponta a ponta)", header_style="bold magenta")
+    for column in ("Comando", "Segundos", "Commits/s", "Arquivos/s", "Pico (KiB)"):
+        commands.add_column(column, justify="right" if column != "Comando" else "left")
+    for name, values in results["commands"].items():
+        commands.add_row(name, f"{values['seconds']:.3f}", f"{values['commits_per_s']:.1f}",
+                         f"{values['files_per_s']:.1f}", str(values.get("peak_kib", "-")))
+    console.print(commands)
+
+    stages = Table(title="Etapas", header_style="bold magenta")
+    stages.add_column("Etapa")
+    stages.add_column("Segundos", justify="right")
+    stages.add_column("Arquivos/s", justify="right")
+    for name, seconds in results["stages"].items():
+        rate = f"{results['files'] / seconds:.1f}" if seconds else "-"
+        stages.add_row(name, f"{seconds:.4f}", rate)
+    console.print(stages)
+
+    if "findings_kib" in results:
+        findings = results["findings_kib"]
+        console.print(f"[bold]Achados do histórico em memória:[/bold] {findings['records']} KiB "
+                      f"(dicionários equivalentes: {findings['dicts']} KiB)")
+
+@app.command()
+def main(
+    commits: Annotated[int, typer.Option(min=1, help="Quantidade de commits do repositório sintético.")] = 20,
+    files_per_commit: Annotated[int, typer.Option(min=1, help="Arquivos .py modificados por commit.")] = 5,
+    functions_per_file: Annotated[int, typer.Option(min=1, help="Funções por arquivo.")] = 10,
+    nesting_depth: Annotated[int, typer.Option(min=0, help="Profundidade de aninhamento das funções.")] = 3,
+    lines_per_function: Annotated[int, typer.Option(min=2, help="Linhas por função (tamanho dos arquivos).")] = 20,
+    command: Annotated[Optional[List[str]], typer.Option("--command", "-c", help="Comando a medir (pode repetir; padrão: todos).")] = None,
+    repeat: Annotated[int, typer.Option(min=1, help="Execuções por comando (vale o melhor tempo).")] = 3,
+    memory: Annotated[bool, typer.Option(help="Mede o pico de memória de cada comando (tracemalloc).")] = True,
+    baseline: Annotated[Path, typer.Option(help="Arquivo de baseline para comparação.")] = DEFAULT_BASELINE,
+    save: Annotated[bool, typer.Option("--save-baseline", help="Grava o resultado como novo baseline.")] = False,
+    tolerance: Annotated[float, typer.Option(help="Aumento máximo aceito em relação ao baseline (fração).")] = 0.25,
+    repo_dir: Annotated[Optional[Path], typer.Option(help="Mantém o repositório sintético neste diretório.")] = None,
+):
+    """
+    Gera um repositório sintético, mede cada comando e cada etapa e compara com o baseline.
+    Termina com código 1 se alguma métrica regrediu.
+    """
+    spec = RepoSpec(commits, files_per_commit, functions_per_file, nesting_depth, lines_per_function)
+    selected = command or list(command_arguments("", "", ""))
+
+    with tempfile.TemporaryDirectory(prefix="minero-bench-") as tmp_dir:
+        repo_path = str(repo_dir or Path(tmp_dir) / "repo")
+        console.print(f"Gerando repositório sintético em {repo_path}: {spec.to_dict()}")
+        build_repository(repo_path, spec)
+        results = run_benchmarks(repo_path, spec, selected, repeat, memory)
+
+    _print_results(results)
+
+    if save:
+        save_baseline(baseline, results)
+        console.print(f"[green]Baseline salvo em {baseline}[/green]")
+        return
+    if not baseline.exists():
+        console.print(f"[yellow]Nenhum baseline em {baseline}; use --save-baseline para criar um.[/yellow]")
+        return
+
+    try:
+        regressions = compare(results, load_baseline(baseline), tolerance)
+    except ValueError as e:
+        console.print(f"[yellow]{e}[/yellow]")
+        return
+
+    if not regressions:
+        console.print("[bold green]Nenhuma regressão em relação ao baseline.[/bold green]")
+        return
+    for regression in regressions:
+        console.print(f"[red]Regressão em {regression.metric}: {regression.baseline} -> "
+                      f"{regression.current} ({regression.ratio:.2f}x)[/red]")
+    raise typer.Exit(code=1)
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List
+import json
+
+# diferenças absolutas menores que isso são ruído de medição, não regressão
+MIN_SECONDS_DELTA = 0.01
+MIN_KIB_DELTA = 256
+
+@dataclass
+class Regression:
+    metric: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else float("inf")
+
+def load_baseline(path: Path) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def save_baseline(path: Path, results: Dict[str, Any]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False, sort_keys=True)
+        f.write("\n")
+
+def flatten_metrics(results: Dict[str, Any]) -> Dict[str, float]:
+    """
+    Métricas comparáveis de um resultado, em que valores maiores são piores:
+    segundos por comando e por etapa, pico de memória por comando e a
+    memória retida pelos achados do histórico.
+    """
+    metrics = {}
+    for command, values in results.get("commands", {}).items():
+        metrics[f"commands.{command}.seconds"] = values["seconds"]
+        if "peak_kib" in values:
+            metrics[f"commands.{command}.peak_kib"] = values["peak_kib"]
+    for stage, seconds in results.get("stages", {}).items():
+        metrics[f"stages.{stage}"] = seconds
+    if "findings_kib" in results:
+        metrics["findings_kib.records"] = results["findings_kib"]["records"]
+    return metrics
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.25) -> List[Regression]:
+    """
+    Compara um resultado com o baseline.
+
+    Uma métrica regrediu quando ficou mais de `tolerance` (fração) acima do
+    baseline e a diferença absoluta passa do ruído de medição. Resultados
+    gerados com outro tamanho de repositório não são comparáveis.
+
+    Raises:
+        ValueError: se o baseline foi gerado com outra especificação de repositório.
+    """
+    if results.get("spec") != baseline.get("spec"):
+        raise ValueError(f"Baseline gerado com outro repositório: {baseline.get('spec')} != {results.get('spec')}")
+
+    regressions = []
+    current = flatten_metrics(results)
+    for metric, old in flatten_metrics(baseline).items():
+        new = current.get(metric)
+        if new is None:
+            continue
+        min_delta = MIN_KIB_DELTA if "kib" in metric else MIN_SECONDS_DELTA
+        if new > old * (1 + tolerance) and new - old > min_delta:
+            regressions.append(Regression(metric, old, new))
+    return regressions
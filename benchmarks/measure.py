@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+from contextlib import contextmanager, redirect_stdout
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+import ast
+import io
+import time
+import tracemalloc
+
+from pydriller import Repository
+from typer.testing import CliRunner
+
+from src.minero.main import app
+from src.minero.analysis_engine import analyze_source, _print_file_analysis, PARAM_LIMIT, COMPLEXITY_THRESHOLD
+from src.minero.cognitive_analysis import analyze_functions_in_source, safe_analyze_functions
+from src.minero.code_smells_analysis import (
+    detect_bad_variable_names,
+    detect_code_smells,
+    detect_dead_code_comments,
+    detect_large_classes,
+    detect_long_parameter_lists,
+    detect_magic_numbers,
+)
+from src.minero.loc_analysis import check_function_sizes
+from src.minero.param_analysis import check_functions_num_params
+
+# analisadores por arquivo, como os comandos os chamam (cada um faz o seu ast.parse)
+FILE_ANALYZERS: Dict[str, Callable[[str, str], object]] = {
+    "loc": check_function_sizes,
+    "params": check_functions_num_params,
+    "cognitive": safe_analyze_functions,
+    "code_smells": detect_code_smells,
+    "engine": analyze_source,
+}
+
+# detectores de code smell isolados, sobre a árvore já parseada
+SMELL_DETECTORS: Dict[str, Callable[[ast.AST, str, str], object]] = {
+    "magic_number": lambda tree, source, filename: detect_magic_numbers(tree, source, filename),
+    "long_parameter_list": lambda tree, source, filename: detect_long_parameter_lists(tree, filename),
+    "large_class": lambda tree, source, filename: detect_large_classes(tree, filename),
+    "bad_variable_name": lambda tree, source, filename: detect_bad_variable_names(tree, filename),
+    "dead_code": lambda tree, source, filename: detect_dead_code_comments(source, filename),
+}
+
+@dataclass
+class StageTimer:
+    """Acumula o tempo gasto em cada etapa nomeada."""
+    seconds: Dict[str, float] = field(default_factory=dict)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] = self.seconds.get(name, 0.0) + time.perf_counter() - start
+
+def measure_stages(repo_path: str) -> Tuple[Dict[str, float], int, int]:
+    """
+    Percorre todo o histórico medindo cada etapa separadamente: travessia
+    dos commits, leitura do conteúdo, ast.parse, cada analisador, cada
+    detector de code smell e a renderização da tabela do comando all.
+
+    Returns:
+        Uma tupla (segundos por etapa, commits percorridos, arquivos analisados).
+    """
+    timer = StageTimer()
+    commits = 0
+    files = 0
+    sink = io.StringIO()
+
+    traversal = iter(Repository(repo_path).traverse_commits())
+    while True:
+        with timer.stage("traversal"):
+            commit = next(traversal, None)
+            if commit is None:
+                break
+            python_files = [mf for mf in commit.modified_files if mf.filename.endswith(".py")]
+        commits += 1
+
+        for modified_file in python_files:
+            with timer.stage("source_read"):
+                source = modified_file.source_code
+            if not source:
+                continue
+            files += 1
+            with timer.stage("ast_parse"):
+                tree = ast.parse(source)
+            for name, analyzer in FILE_ANALYZERS.items():
+                with timer.stage(f"analyzer.{name}"):
+                    analyzer(source, modified_file.filename)
+            for name, detector in SMELL_DETECTORS.items():
+                with timer.stage(f"detector.{name}"):
+                    detector(tree, source, modified_file.filename)
+
+            analysis = analyze_source(source, modified_file.filename)
+            with timer.stage("rendering"), redirect_stdout(sink):
+                _print_file_analysis(analysis, PARAM_LIMIT, COMPLEXITY_THRESHOLD)
+            sink.seek(0)
+            sink.truncate()
+
+    return timer.seconds, commits, files
+
+def retained_kib(build: Callable[[], Any]) -> int:
+    """Memória que continua alocada depois da chamada, enquanto o resultado existe, em KiB."""
+    tracemalloc.start()
+    try:
+        result = build()
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return current // 1024
+
+def _findings(source: str, filename: str) -> List[Any]:
+    return detect_code_smells(source, filename) + analyze_functions_in_source(source, filename)
+
+def _as_dict(finding: Any) -> Dict[str, Any]:
+    return finding.as_dict() if hasattr(finding, "as_dict") else asdict(finding)
+
+def findings_memory(repo_path: str) -> Dict[str, int]:
+    """
+    Memória para guardar todos os achados do histórico (code smells e
+    métricas por função), como uma execução longa faria: nos registros com
+    __slots__ usados pelos analisadores e, para comparação, nos dicionários
+    equivalentes com a descrição já formatada.
+
+    Returns:
+        KiB retidos em cada representação ("records" e "dicts").
+    """
+    sources = [
+        (mf.source_code, mf.filename)
+        for commit in Repository(repo_path).traverse_commits()
+        for mf in commit.modified_files
+        if mf.filename.endswith(".py") and mf.source_code
+    ]
+    return {
+        "records": retained_kib(lambda: [_findings(source, filename) for source, filename in sources]),
+        "dicts": retained_kib(lambda: [[_as_dict(f) for f in _findings(source, filename)] for source, filename in sources]),
+    }
+
+def command_arguments(repo_path: str, root: str, head: str) -> Dict[str, List[str]]:
+    """Argumentos de cada comando para analisar o histórico inteiro, sem cache."""
+    history = ["--from", root, "--to", head, "--no-cache"]
+    return {
+        "generic": ["generic", repo_path, "--no-cache"],
+        "commits": ["commits", repo_path, "--no-cache"],
+        "loc": ["loc", repo_path, *history],
+        "params": ["params", repo_path, *history],
+        "cog-analysis": ["cog-analysis", repo_path, *history],
+        "code-smells": ["code-smells", repo_path, *history],
+        "all": ["all", repo_path, *history],
+    }
+
+def run_command(args: List[str]) -> None:
+    result = CliRunner().invoke(app, args)
+    if result.exit_code != 0:
+        raise RuntimeError(f"minero {' '.join(args)} falhou: {result.output}{result.exception!r}")
+
+def time_call(function: Callable[[], None], repeat: int = 1) -> float:
+    """Melhor tempo de `repeat` execuções (menos sensível a ruído que a média)."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def peak_memory(function: Callable[[], None]) -> int:
+    """Pico de memória alocada pelo Python durante a chamada, em KiB (tracemalloc)."""
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak // 1024
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+from typing import Callable, Dict, List, Tuple
+import ast
+import time
+
+import typer
+from rich.console import Console
+from rich.table import Table
+from typing_extensions import Annotated
+
+from src.minero.cognitive_analysis import CognitiveComplexityVisitor, function_complexities
+
+console = Console(stderr=True)
+
+app = typer.Typer(help="Complexidade cognitiva em código com funções profundamente aninhadas.", add_completion=False)
+
+def closure_chain(depth: int, statements: int = 5) -> str:
+    """
+    Cadeia de closures: cada função tem ifs, fors e operadores booleanos
+    e define a próxima dentro de si, até `depth` níveis.
+    """
+    lines: List[str] = []
+    indent = ""
+    for level in range(depth):
+        lines.append(f"{indent}def level_{level}(value_{level}):")
+        indent += "    "
+        for statement in range(statements):
+            lines.append(f"{indent}if value_{level} > {statement} and value_{level} < {statement + 10}:")
+            lines.append(f"{indent}    for item in range(value_{level}):")
+            lines.append(f"{indent}        total = item * {statement}")
+        lines.append(f"{indent}result_{level} = value_{level} or {level}")
+    lines.append(f"{indent}return {depth}")
+    return "\n".join(lines) + "\n"
+
+def decorator_stack(depth: int, statements: int = 5) -> str:
+    """
+    Fábricas de decoradores encaixadas: cada nível tem o padrão
+    fábrica -> decorador -> wrapper, e o próximo nível fica dentro do wrapper.
+    """
+    lines: List[str] = []
+    indent = ""
+    for level in range(depth):
+        lines.append(f"{indent}def factory_{level}(option_{level}):")
+        lines.append(f"{indent}    def decorator_{level}(function):")
+        lines.append(f"{indent}        @functools.wraps(function)")
+        lines.append(f"{indent}        def wrapper_{level}(*args, **kwargs):")
+        indent += "            "
+        for statement in range(statements):
+            lines.append(f"{indent}if option_{level} and args and len(args) > {statement}:")
+            lines.append(f"{indent}    return function(*args, **kwargs)")
+        lines.append(f"{indent}pass")
+    lines.append(f"{indent}return None")
+    return "\n".join(lines) + "\n"
+
+FIXTURES: Dict[str, Callable[[int], str]] = {
+    "closures": closure_chain,
+    "decorators": decorator_stack,
+}
+
+def per_function_visitor(tree: ast.AST) -> List[Tuple[ast.AST, int]]:
+    """A abordagem anterior: um CognitiveComplexityVisitor novo em cada função, que percorre de novo as aninhadas."""
+    results = []
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            visitor = CognitiveComplexityVisitor()
+            visitor.visit(node)
+            results.append((node, visitor.complexity))
+    return results
+
+def best_time(function: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def measure_nesting(fixture: str, depth: int, repeat: int = 5) -> Dict[str, float]:
+    """
+    Mede as duas abordagens na mesma árvore e confere que os resultados são iguais.
+
+    Returns:
+        Um dicionário com a quantidade de funções e de nós e os segundos de cada abordagem.
+    """
+    tree = ast.parse(FIXTURES[fixture](depth))
+    if per_function_visitor(tree) != function_complexities(tree):
+        raise AssertionError(f"resultados diferentes em {fixture} com profundidade {depth}")
+    return {
+        "functions": sum(isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) for node in ast.walk(tree)),
+        "nodes": sum(1 for _ in ast.walk(tree)),
+        "per_function": best_time(lambda: per_function_visitor(tree), repeat),
+        "single_pass": best_time(lambda: function_complexities(tree), repeat),
+    }
+
+@app.command()
+def main(
+    depth: Annotated[List[int], typer.Option("--depth", "-d", min=1, help="Profundidade de aninhamento (pode repetir).")] = [5, 10, 20],
+    repeat: Annotated[int, typer.Option(min=1, help="Execuções por medição (vale o melhor tempo).")] = 5,
+):
+    """
+    Compara, em fixtures de closures e de fábricas de decoradores, o cálculo
+    com um visitor por função (quadrático na profundidade) e o de uma única travessia.
+    """
+    table = Table(title="Complexidade cognitiva com funções aninhadas", header_style="bold magenta")
+    for column in ("Fixture", "Profundidade", "Funções", "Nós", "Visitor por função (ms)", "Uma travessia (ms)", "Ganho"):
+        table.add_column(column, justify="right" if column != "Fixture" else "left")
+    for fixture in FIXTURES:
+        for level in depth:
+            result = measure_nesting(fixture, level, repeat)
+            table.add_row(fixture, str(level), str(result["functions"]), str(result["nodes"]),
+                          f"{result['per_function'] * 1000:.2f}", f"{result['single_pass'] * 1000:.2f}",
+                          f"{result['per_function'] / result['single_pass']:.1f}x")
+    console.print(table)
+
+if __name__ == "__main__":
+    app()
@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterator, List
+import subprocess
+
+AUTHORS = ["Ana", "Bruno", "Carla", "Diego"]
+
+# data fixa (2024-01-01 UTC) para que o repositório gerado seja sempre o mesmo
+BASE_TIMESTAMP = 1704067200
+
+@dataclass
+class RepoSpec:
+    """
+    Tamanho do repositório sintético.
+
+    Attributes:
+        commits: quantidade de commits.
+        files_per_commit: arquivos .py modificados em cada commit.
+        functions_per_file: funções em cada arquivo.
+        nesting_depth: profundidade de if/for aninhados em cada função.
+        lines_per_function: linhas de código em cada função (tamanho do arquivo).
+        file_pool: quantidade de arquivos distintos (padrão: 4 * files_per_commit).
+    """
+    commits: int = 20
+    files_per_commit: int = 5
+    functions_per_file: int = 10
+    nesting_depth: int = 3
+    lines_per_function: int = 20
+    file_pool: int = 0
+
+    def __post_init__(self):
+        if not self.file_pool:
+            self.file_pool = 4 * self.files_per_commit
+
+    def to_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+def generate_function(index: int, spec: RepoSpec, version: int) -> List[str]:
+    """
+    Gera o código de uma função com parâmetros, aninhamento, operadores
+    booleanos, magic numbers e nomes ruins, para exercitar todos os detectores.
+    """
+    params = [f"param_{p}" for p in range(index % 8 + 1)]
+    lines = [f"def function_{index}({', '.join(params)}):"]
+    indent = "    "
+    for depth in range(spec.nesting_depth):
+        if depth % 2 == 0:
+            lines.append(f"{indent}if param_0 > {depth} and param_0 < {version + 100}:")
+        else:
+            lines.append(f"{indent}for item_{depth} in range(param_0):")
+        indent += "    "
+
+    body = max(spec.lines_per_function - len(lines) - 1, 1)
+    for line in range(body):
+        if line % 5 == 0:
+            lines.append(f"{indent}x = param_0 * {line + 42}")
+        else:
+            lines.append(f"{indent}value_{line} = param_0 + {line} + {version}")
+    lines.append(f"{indent}return param_0")
+    return lines
+
+def generate_source(file_index: int, spec: RepoSpec, version: int) -> str:
+    """Conteúdo de um arquivo .py sintético; `version` muda o conteúdo a cada commit."""
+    lines = [f'"""Módulo sintético {file_index}, versão {version}."""', ""]
+    for function in range(spec.functions_per_file):
+        lines.extend(generate_function(function, spec, version))
+        if function % 3 == 0:
+            lines.append(f"# return function_{function}({version})")
+        lines.append("")
+
+    lines.append(f"class Service{file_index}:")
+    for method in range(11):
+        lines.append(f"    def method_{method}(self):")
+        lines.append(f"        return {method}")
+    lines.append("")
+    return "\n".join(lines)
+
+def _fast_import_stream(spec: RepoSpec) -> Iterator[bytes]:
+    mark = 0
+    previous = None
+    for commit in range(spec.commits):
+        files = []
+        for slot in range(spec.files_per_commit):
+            file_index = (commit * spec.files_per_commit + slot) % spec.file_pool
+            data = generate_source(file_index, spec, commit).encode("utf-8")
+            mark += 1
+            yield b"blob\nmark :%d\ndata %d\n%s\n" % (mark, len(data), data)
+            files.append((f"pkg_{file_index % 10}/module_{file_index}.py", mark))
+
+        author = AUTHORS[commit % len(AUTHORS)]
+        timestamp = BASE_TIMESTAMP + commit * 3600
+        message = f"Commit sintético {commit}".encode("utf-8")
+        mark += 1
+        header = (
+            f"commit refs/heads/main\nmark :{mark}\n"
+            f"author {author} <{author.lower()}@example.com> {timestamp} +0000\n"
+            f"committer {author} <{author.lower()}@example.com> {timestamp} +0000\n"
+        ).encode("utf-8")
+        yield header + b"data %d\n%s\n" % (len(message), message)
+        if previous is not None:
+            yield b"from :%d\n" % previous
+        for path, blob in files:
+            yield f"M 100644 :{blob} {path}\n".encode("utf-8")
+        yield b"\n"
+        previous = mark
+
+def build_repository(path: str, spec: RepoSpec) -> str:
+    """
+    Cria em `path` um repositório git com o histórico descrito por `spec`.
+
+    Os objetos são escritos com um único `git fast-import`, sem checkout
+    nem um processo git por commit, então repositórios grandes são gerados
+    em poucos segundos. O resultado é determinístico (autores e datas fixos).
+
+    Returns:
+        O hash do último commit.
+    """
+    subprocess.run(["git", "init", "--quiet", "-b", "main", path], check=True)
+    process = subprocess.Popen(["git", "-C", path, "fast-import", "--quiet"], stdin=subprocess.PIPE)
+    try:
+        for chunk in _fast_import_stream(spec):
+            process.stdin.write(chunk)
+    finally:
+        process.stdin.close()
+        if process.wait() != 0:
+            raise subprocess.CalledProcessError(process.returncode, "git fast-import")
+    # deixa a árvore de trabalho igual a HEAD, como em um clone comum
+    subprocess.run(["git", "-C", path, "reset", "--quiet", "--hard"], check=True)
+    return subprocess.run(["git", "-C", path, "rev-parse", "HEAD"], check=True,
+                          capture_output=True, text=True).stdout.strip()
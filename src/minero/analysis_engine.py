@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+import ast
+
+from rich.console import Console
+from rich.table import Table
+from rich.panel import Panel
+
+from .cognitive_analysis import FunctionComplexity, function_complexities
+from .code_smells_analysis import SmellCollector
+from .records import LongFunctionRecord, ParamViolationRecord, SmellRecord
+from .param_analysis import count_function_params
+from .cache import analysis_cache
+from .parallel import iter_analyze_files, worker_pool
+from .options import AnalysisOptions
+from .commit_selection import describe_selection, select_commits
+from .ndjson_output import function_record, is_ndjson, smell_record, write_record
+
+console = Console()
+
+# limites padrão usados pelos comandos individuais
+LINE_LIMIT = 200
+PARAM_LIMIT = 5
+COMPLEXITY_THRESHOLD = 12
+
+@dataclass
+class FileAnalysis:
+    """
+    Resultado completo da análise de um arquivo: métricas de todas as funções
+    (linhas, parâmetros e complexidade cognitiva) e os code smells encontrados.
+
+    As métricas são guardadas sem aplicar limites, de forma que o mesmo
+    resultado sirva para qualquer combinação de limites.
+    """
+    file_path: str
+    functions: List[FunctionComplexity] = field(default_factory=list)
+    smells: List[SmellRecord] = field(default_factory=list)
+    parse_error: Optional[str] = None
+
+    def long_functions(self, line_limit: int = LINE_LIMIT) -> List[LongFunctionRecord]:
+        """Mesmo formato de check_function_sizes."""
+        return [
+            LongFunctionRecord(f.function_name, f.end_lineno - f.lineno + 1, f.lineno, f.end_lineno, self.file_path)
+            for f in self.functions
+            if f.end_lineno - f.lineno + 1 > line_limit
+        ]
+
+    def param_violations(self, param_limit: int = PARAM_LIMIT) -> List[ParamViolationRecord]:
+        """Mesmo formato de check_functions_num_params."""
+        return [
+            ParamViolationRecord(f.function_name, f.param_count, f.lineno, self.file_path)
+            for f in self.functions
+            if f.param_count > param_limit
+        ]
+
+    def complex_functions(self, complexity_threshold: int = COMPLEXITY_THRESHOLD) -> List[FunctionComplexity]:
+        return [f for f in self.functions if f.complexity > complexity_threshold]
+
+
+def analyze_source(source_code: str, filename: str) -> FileAnalysis:
+    """
+    Analisa um arquivo python com um único ast.parse e uma única travessia
+    da árvore, calculando tudo o que os comandos loc, params, cog-analysis
+    e code-smells calculariam separadamente.
+
+    Args:
+        source_code: string com o código fonte python a ser analisado
+        filename: nome do arquivo analisado
+    Returns:
+        Um FileAnalysis com as métricas de cada função e os code smells.
+    """
+    try:
+        tree = ast.parse(source_code)
+    except SyntaxError as e:
+        return FileAnalysis(file_path=filename, parse_error=str(e))
+
+    analysis = FileAnalysis(file_path=filename)
+    collector = SmellCollector(filename)
+
+    analysis.functions = [_measure_function(node, filename, complexity) for node, complexity in function_complexities(tree)]
+    for node in ast.walk(tree):
+        collector.visit(node)
+
+    analysis.smells = collector.smells(source_code)
+    return analysis
+
+
+def _measure_function(node: ast.AST, filename: str, complexity: int) -> FunctionComplexity:
+    return FunctionComplexity(
+        file_path=filename,
+        function_name=node.name,
+        complexity=complexity,
+        lineno=node.lineno,
+        end_lineno=node.end_lineno,
+        param_count=count_function_params(node),
+    )
+
+
+# ---- função principal ----
+
+def show_full_analysis(repo_url: str, commit_hash: Optional[str], param_limit: int = PARAM_LIMIT, complexity_level_threshold: int = COMPLEXITY_THRESHOLD,
+                       options: Optional[AnalysisOptions] = None) -> None:
+    """
+    Executa todas as análises (LOC, parâmetros, complexidade cognitiva e
+    code smells) nos arquivos python de um commit, lendo e parseando cada
+    arquivo uma única vez.
+
+    Args:
+        repo_url: O caminho para o repositorio.
+        commit_hash: Hash do commit a ser analisado (ou None para usar --from/--to ou --last).
+        param_limit: o limite de parâmetros a ser considerado
+        complexity_level_threshold: nível de complexidade máximo aceitável antes de emitir um alerta.
+        options: opções de execução (cache, paralelismo, intervalo de commits, etc.).
+    """
+    options = options or AnalysisOptions()
+
+    if not is_ndjson(options):
+        console.print(Panel.fit(
+            f"[bold cyan] Análise completa[/bold cyan]\n"
+            f"Repositório: [yellow]{repo_url}[/yellow]\n"
+            f"Commit: [green]{describe_selection(commit_hash, options)}[/green]",
+            style="blue"
+        ))
+
+    commits = select_commits(repo_url, commit_hash, options)
+
+    if is_ndjson(options):
+        with analysis_cache(options.use_cache) as cache, worker_pool(options.jobs) as pool:
+            _write_full_analysis(commits, param_limit, complexity_level_threshold, cache, pool)
+        return
+
+    files_analyzed = 0
+    total_alerts = 0
+    total_smells = 0
+
+    with analysis_cache(options.use_cache) as cache, worker_pool(options.jobs) as pool:
+        for commit in commits:
+            python_files = [mf for mf in commit.modified_files if mf.filename.endswith('.py')]
+
+            # os limites não fazem parte da chave: o resultado guarda as métricas brutas
+            for _, analysis in iter_analyze_files(python_files, analyze_source, cache=cache, pool=pool, skip_empty=True):
+                if analysis is None:
+                    continue
+
+                files_analyzed += 1
+                alerts = _print_file_analysis(analysis, param_limit, complexity_level_threshold)
+                total_alerts += alerts
+                total_smells += len(analysis.smells)
+
+    console.print()
+    if files_analyzed == 0:
+        console.print(Panel.fit(
+            "Nenhum arquivo Python encontrado no commit.",
+            style="yellow",
+            title="[bold white]Aviso[/bold white]"
+        ))
+        return
+
+    summary_color = "green" if total_alerts == 0 and total_smells == 0 else "yellow"
+    console.print(Panel.fit(
+        f"[bold]Arquivos analisados:[/bold] {files_analyzed}\n"
+        f"[bold]Funções com alerta:[/bold] {total_alerts}\n"
+        f"[bold]Code smells encontrados:[/bold] {total_smells}",
+        style=summary_color,
+        title="[bold white]Resultados[/bold white]"
+    ))
+
+
+def function_problems(f: FunctionComplexity, param_limit: int, complexity_threshold: int) -> List[str]:
+    problems = []
+    if f.end_lineno - f.lineno + 1 > LINE_LIMIT:
+        problems.append("LOC")
+    if f.param_count > param_limit:
+        problems.append("parâmetros")
+    if f.complexity > complexity_threshold:
+        problems.append("complexidade")
+    return problems
+
+
+def _write_full_analysis(commits, param_limit: int, complexity_threshold: int, cache, pool) -> None:
+    """Um registro NDJSON por função e um por code smell, arquivo a arquivo."""
+    for commit in commits:
+        python_files = [mf for mf in commit.modified_files if mf.filename.endswith('.py')]
+
+        for _, analysis in iter_analyze_files(python_files, analyze_source, cache=cache, pool=pool, skip_empty=True):
+            if analysis is None:
+                continue
+            if analysis.parse_error:
+                write_record({"kind": "parse_error", "commit_hash": commit.hash,
+                              "file_path": analysis.file_path, "error": analysis.parse_error})
+                continue
+            for f in analysis.functions:
+                write_record(function_record(
+                    commit.hash, f,
+                    line_count=f.end_lineno - f.lineno + 1,
+                    param_count=f.param_count,
+                    complexity=f.complexity,
+                    alerts=function_problems(f, param_limit, complexity_threshold),
+                ))
+            for smell in analysis.smells:
+                write_record(smell_record(commit.hash, smell))
+
+
+def _print_file_analysis(analysis: FileAnalysis, param_limit: int, complexity_threshold: int) -> int:
+    """Imprime a tabela de um arquivo e retorna quantas funções tiveram alerta."""
+    console.print()
+    console.print(f"[bold green]Arquivo:[/bold green] [yellow]{analysis.file_path}[/yellow]")
+
+    if analysis.parse_error:
+        console.print(f"[red]Erro ao parsear {analysis.file_path}: {analysis.parse_error}[/red]")
+        return 0
+
+    alerts = 0
+    if analysis.functions:
+        table = Table(show_header=True, header_style="bold magenta")
+        table.add_column("Função")
+        table.add_column("Linhas", justify="right")
+        table.add_column("Parâmetros", justify="right")
+        table.add_column("Complexidade", justify="right")
+        table.add_column("Status")
+
+        for f in analysis.functions:
+            line_count = f.end_lineno - f.lineno + 1
+            problems = function_problems(f, param_limit, complexity_threshold)
+
+            if problems:
+                alerts += 1
+                status = f"[red]ALERTA ({', '.join(problems)})[/red]"
+            else:
+                status = "[green]OK[/green]"
+            table.add_row(f.function_name, str(line_count), str(f.param_count), str(f.complexity), status)
+
+        console.print(table)
+    else:
+        console.print("Nenhuma função Python encontrada neste arquivo.")
+
+    if analysis.smells:
+        counts: Dict[str, int] = {}
+        for smell in analysis.smells:
+            counts[smell['smell_type']] = counts.get(smell['smell_type'], 0) + 1
+        details = ", ".join(f"{smell_type}: {count}" for smell_type, count in counts.items())
+        console.print(f"[bold]Code smells:[/bold] {len(analysis.smells)} ({details})")
+    else:
+        console.print("[green]Nenhum code smell detectado neste arquivo.[/green]")
+
+    return alerts
@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import subprocess
+import time
+
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
+from .analysis_engine import COMPLEXITY_THRESHOLD, PARAM_LIMIT, FileAnalysis, analyze_source, function_problems
+from .cache import analysis_cache
+from .commit_selection import last_commits
+from .ndjson_output import function_record, is_ndjson, smell_record, write_record
+from .options import AnalysisOptions, BatchAnalysis
+from .parallel import iter_analyze_files, start_workers, worker_pool
+from .snapshot import snapshot_commits
+
+console = Console()
+
+# alertas de função considerados por cada análise (ver function_problems)
+ANALYSIS_PROBLEMS = {
+    BatchAnalysis.loc: {"LOC"},
+    BatchAnalysis.params: {"parâmetros"},
+    BatchAnalysis.cog_analysis: {"complexidade"},
+    BatchAnalysis.code_smells: set(),
+    BatchAnalysis.all: {"LOC", "parâmetros", "complexidade"},
+}
+
+@dataclass
+class RepositoryReport:
+    """
+    Resultado de um repositório no modo batch.
+
+    Attributes:
+        repo_url: caminho (ou URL) do repositório, como no manifesto.
+        records: achados no formato dos registros NDJSON (funções com alerta, smells e erros de parse).
+        files_analyzed: arquivos .py analisados.
+        seconds: tempo gasto no repositório.
+        error: mensagem do erro que interrompeu a análise, ou None.
+    """
+    repo_url: str
+    records: List[Dict[str, Any]] = field(default_factory=list)
+    files_analyzed: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+    def count(self, kind: str) -> int:
+        return sum(1 for record in self.records if record["kind"] == kind)
+
+@dataclass
+class BatchSummary:
+    """Totais do modo batch, mostrados ao final."""
+    repositories: int = 0
+    failed: int = 0
+    files_analyzed: int = 0
+    alerts: int = 0
+    smells: int = 0
+
+    def add(self, report: RepositoryReport) -> None:
+        self.repositories += 1
+        self.failed += report.error is not None
+        self.files_analyzed += report.files_analyzed
+        self.alerts += report.count("function")
+        self.smells += report.count("smell")
+
+def read_manifest(path: Path) -> List[str]:
+    """
+    Lê o manifesto do modo batch: um repositório (caminho ou URL) por linha.
+    Linhas vazias e linhas iniciadas por '#' são ignoradas.
+    """
+    with open(path, encoding="utf-8") as f:
+        entries = (line.strip() for line in f)
+        return [entry for entry in entries if entry and not entry.startswith("#")]
+
+def iter_bounded(executor: Executor, function: Callable, items: Iterable[Any], limit: int) -> Iterator[Tuple[Any, Future]]:
+    """
+    Submete `function(item)` ao executor mantendo no máximo `limit` tarefas
+    pendentes e entrega cada tarefa assim que termina, em ordem de conclusão.
+    Os resultados não se acumulam: só existem `limit` deles por vez.
+
+    Returns:
+        Um gerador de tuplas (item, future concluído).
+    """
+    items = iter(items)
+    pending: Dict[Future, Any] = {}
+    while True:
+        for item in items:
+            pending[executor.submit(function, item)] = item
+            if len(pending) >= limit:
+                break
+        if not pending:
+            return
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield pending.pop(future), future
+
+def file_records(commit_hash: str, analysis: FileAnalysis, analysis_kind: BatchAnalysis,
+                 param_limit: int = PARAM_LIMIT, complexity_threshold: int = COMPLEXITY_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Achados de um arquivo para a análise escolhida, no formato dos registros
+    NDJSON: funções com alerta, code smells e erros de parse.
+    """
+    if analysis.parse_error:
+        return [{"kind": "parse_error", "commit_hash": commit_hash,
+                 "file_path": analysis.file_path, "error": analysis.parse_error}]
+
+    records = []
+    wanted = ANALYSIS_PROBLEMS[analysis_kind]
+    for f in analysis.functions:
+        problems = [p for p in function_problems(f, param_limit, complexity_threshold) if p in wanted]
+        if problems:
+            records.append(function_record(
+                commit_hash, f,
+                line_count=f.end_lineno - f.lineno + 1,
+                param_count=f.param_count,
+                complexity=f.complexity,
+                alerts=problems,
+            ))
+    if analysis_kind in (BatchAnalysis.code_smells, BatchAnalysis.all):
+        records.extend(smell_record(commit_hash, smell) for smell in analysis.smells)
+    return records
+
+def analyze_repository(repo_url: str, analysis_kind: BatchAnalysis, options: AnalysisOptions, pool: Optional[Executor],
+                       param_limit: int = PARAM_LIMIT, complexity_threshold: int = COMPLEXITY_THRESHOLD) -> RepositoryReport:
+    """
+    Analisa um repositório do manifesto. Roda em uma thread de I/O: o acesso
+    ao git acontece aqui e o parse vai para o pool de processos compartilhado.
+    Qualquer erro fica registrado no relatório, sem interromper os demais
+    repositórios.
+
+    Args:
+        repo_url: O caminho (ou URL) do repositorio.
+        analysis_kind: análise a ser executada.
+        options: opções de execução (cache, --last).
+        pool: pool de processos compartilhado por todos os repositórios, ou None.
+    Returns:
+        Um RepositoryReport com os achados.
+    """
+    report = RepositoryReport(repo_url)
+    start = time.perf_counter()
+    try:
+        # sem --last, analisa a árvore inteira de HEAD
+        commits = last_commits(repo_url, options.last) if options.last else snapshot_commits(repo_url)
+        # cada thread abre a sua conexão: conexões SQLite não são compartilhadas entre threads
+        with analysis_cache(options.use_cache) as cache:
+            for commit in commits:
+                python_files = [mf for mf in commit.modified_files if mf.filename.endswith(".py")]
+                for _, analysis in iter_analyze_files(python_files, analyze_source, cache=cache, pool=pool, skip_empty=True):
+                    if analysis is None:
+                        continue
+                    report.files_analyzed += 1
+                    report.records.extend(file_records(commit.hash, analysis, analysis_kind, param_limit, complexity_threshold))
+    except subprocess.CalledProcessError as e:
+        # a última linha do stderr do git explica o erro melhor que o comando
+        stderr = (e.stderr or "").strip() if isinstance(e.stderr, str) else ""
+        report.error = stderr.splitlines()[-1] if stderr else str(e)
+    except Exception as e:
+        report.error = f"{type(e).__name__}: {e}"
+    report.seconds = time.perf_counter() - start
+    return report
+
+def run_batch(repositories: List[str], analysis_kind: BatchAnalysis, options: AnalysisOptions, io_jobs: int = 4,
+              param_limit: int = PARAM_LIMIT, complexity_threshold: int = COMPLEXITY_THRESHOLD) -> Iterator[RepositoryReport]:
+    """
+    Analisa vários repositórios ao mesmo tempo.
+
+    O acesso ao git (clone, log e leitura de blobs) roda em um pool de
+    `io_jobs` threads, e o parse dos arquivos de todos os repositórios vai
+    para um único pool de `options.jobs` processos. No máximo 2 * io_jobs
+    repositórios ficam em andamento ou aguardando entrega ao mesmo tempo.
+
+    Returns:
+        Um gerador de RepositoryReport, na ordem em que os repositórios terminam.
+    """
+    with worker_pool(options.jobs) as pool:
+        # os processos são criados por fork na primeira tarefa: isso precisa
+        # acontecer antes das threads de I/O existirem
+        start_workers(pool)
+        with ThreadPoolExecutor(max_workers=io_jobs) as io_pool:
+            analyze = lambda repo_url: analyze_repository(repo_url, analysis_kind, options, pool,
+                                                          param_limit, complexity_threshold)
+            for repo_url, future in iter_bounded(io_pool, analyze, repositories, 2 * io_jobs):
+                yield future.result()
+
+def show_batch_analysis(manifest: Path, analysis_kind: BatchAnalysis = BatchAnalysis.all,
+                        options: Optional[AnalysisOptions] = None, io_jobs: int = 4,
+                        param_limit: int = PARAM_LIMIT, complexity_threshold: int = COMPLEXITY_THRESHOLD) -> BatchSummary:
+    """
+    Executa uma análise em todos os repositórios do manifesto, mostrando o
+    resultado de cada um assim que ele termina e um resumo ao final.
+
+    Args:
+        manifest: arquivo com um repositório por linha.
+        analysis_kind: análise a ser executada (loc, params, cog-analysis, code-smells ou all).
+        options: opções de execução (cache, processos, --last e formato de saída).
+        io_jobs: threads usadas para o acesso ao git.
+        param_limit: o limite de parâmetros a ser considerado
+        complexity_threshold: nível de complexidade máximo aceitável antes de emitir um alerta.
+    Returns:
+        Um BatchSummary com os totais.
+    """
+    options = options or AnalysisOptions()
+    repositories = read_manifest(manifest)
+    ndjson = is_ndjson(options)
+    summary = BatchSummary()
+
+    if not ndjson:
+        console.print(Panel.fit(f"Análise [bold]{analysis_kind.value}[/bold] em {len(repositories)} repositórios", style="blue"))
+
+    results = Table(show_header=True, header_style="bold magenta")
+    results.add_column("Repositório", overflow="fold")
+    results.add_column("Status")
+    results.add_column("Arquivos", justify="right")
+    results.add_column("Alertas", justify="right")
+    results.add_column("Smells", justify="right")
+    results.add_column("Segundos", justify="right")
+
+    for report in run_batch(repositories, analysis_kind, options, io_jobs, param_limit, complexity_threshold):
+        summary.add(report)
+        if ndjson:
+            _write_report(report)
+            continue
+        _print_report(report)
+        status = "[red]ERRO[/red]" if report.error else "[green]OK[/green]"
+        results.add_row(report.repo_url, status, str(report.files_analyzed), str(report.count("function")),
+                        str(report.count("smell")), f"{report.seconds:.2f}")
+
+    if ndjson:
+        write_record({"kind": "batch_summary", "repositories": summary.repositories, "failed": summary.failed,
+                      "files_analyzed": summary.files_analyzed, "alerts": summary.alerts, "smells": summary.smells})
+        return summary
+
+    console.print()
+    console.print(results)
+    summary_color = "red" if summary.failed else "green" if summary.alerts == 0 and summary.smells == 0 else "yellow"
+    console.print(Panel.fit(
+        f"[bold]Repositórios:[/bold] {summary.repositories} ({summary.failed} com erro)\n"
+        f"[bold]Arquivos analisados:[/bold] {summary.files_analyzed}\n"
+        f"[bold]Funções com alerta:[/bold] {summary.alerts}\n"
+        f"[bold]Code smells encontrados:[/bold] {summary.smells}",
+        style=summary_color,
+        title="[bold white]Resultados[/bold white]"
+    ))
+    return summary
+
+def _write_report(report: RepositoryReport) -> None:
+    for record in report.records:
+        write_record({"repository": report.repo_url, **record})
+    write_record({"kind": "repository_summary", "repository": report.repo_url, "error": report.error,
+                  "files_analyzed": report.files_analyzed, "alerts": report.count("function"),
+                  "smells": report.count("smell"), "seconds": round(report.seconds, 3)})
+
+def _print_report(report: RepositoryReport) -> None:
+    console.print()
+    if report.error:
+        console.print(f"[red]Erro ao analisar {report.repo_url}: {report.error}[/red]")
+        return
+    console.print(f"[bold green]Repositório:[/bold green] [yellow]{report.repo_url}[/yellow] "
+                  f"({report.files_analyzed} arquivos, {report.seconds:.2f}s)")
+    if not report.records:
+        console.print("[green]Nenhum alerta encontrado.[/green]")
+        return
+
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Arquivo", overflow="fold")
+    table.add_column("Linha", justify="right")
+    table.add_column("Achado")
+    for record in report.records:
+        if record["kind"] == "function":
+            finding = f"{record['function_name']}: {', '.join(record['alerts'])}"
+            line = record["start_line"]
+        elif record["kind"] == "smell":
+            finding = f"{record['smell_type']}: {record['description']}"
+            line = record["line_number"]
+        else:
+            finding = f"[red]erro de parse: {record['error']}[/red]"
+            line = None
+        table.add_row(record["file_path"], "-" if line is None else str(line), finding)
+    console.print(table)
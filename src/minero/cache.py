@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, Optional, Tuple
+import os
+import pickle
+import sqlite3
+import threading
+
+# deve ser incrementada sempre que a saída de algum analisador mudar,
+# invalidando todos os resultados já guardados
+ANALYZER_VERSION = "4"
+
+# sha do blob vazio no git: arquivos vazios não precisam nem ser lidos
+EMPTY_BLOB_SHA = "e69de29bb2d1d6434b8b29ae775ad8c2e48c5391"
+
+# marcador de "não encontrado" (None é um resultado válido)
+MISS = object()
+
+def default_cache_dir() -> Path:
+    """
+    Diretório do cache: $MINERO_CACHE_DIR, ou $XDG_CACHE_HOME/minero,
+    ou ~/.cache/minero.
+    """
+    if os.environ.get("MINERO_CACHE_DIR"):
+        return Path(os.environ["MINERO_CACHE_DIR"])
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "minero"
+
+def blob_sha(modified_file: Any) -> Optional[str]:
+    """
+    Retorna o sha do blob (conteúdo novo) de um arquivo, sem ler o conteúdo.
+    Funciona com ModifiedFile do PyDriller e com objetos que exponham
+    um atributo `blob_sha`. Retorna None quando o sha não está disponível.
+    """
+    sha = getattr(modified_file, "blob_sha", None)
+    if not isinstance(sha, str):
+        diff = getattr(modified_file, "_c_diff", None)
+        blob = getattr(diff, "b_blob", None)
+        sha = getattr(blob, "hexsha", None)
+    return sha if isinstance(sha, str) else None
+
+class AnalysisCache:
+    """
+    Cache persistente (SQLite) de resultados de análise por arquivo,
+    endereçado pelo conteúdo: a chave é o sha do blob no git, o nome do
+    arquivo, o analisador, a versão dos analisadores e os limites usados.
+
+    A conexão só é aberta no primeiro acesso, então comandos que não
+    encontram nenhum sha não criam o arquivo do banco.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else default_cache_dir() / "analysis.sqlite3"
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), timeout=30)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value BLOB NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS checkpoints "
+                "(key TEXT PRIMARY KEY, commit_hash TEXT NOT NULL, value BLOB NOT NULL)"
+            )
+        return self._conn
+
+    @staticmethod
+    def make_key(analyzer: str, sha: str, filename: str, params: tuple) -> str:
+        return f"{analyzer}|{ANALYZER_VERSION}|{sha}|{filename}|{params!r}"
+
+    def get(self, key: str) -> Any:
+        row = self._connection().execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return MISS
+        return pickle.loads(row[0])
+
+    def put(self, key: str, value: Any) -> None:
+        self._connection().execute(
+            "INSERT OR REPLACE INTO results (key, value) VALUES (?, ?)",
+            (key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)),
+        )
+
+    def get_checkpoint(self, key: str) -> Optional[Tuple[str, Any]]:
+        """
+        Retorna o checkpoint guardado para a chave: uma tupla
+        (último commit processado, valor), ou None se não houver.
+        """
+        row = self._connection().execute(
+            "SELECT commit_hash, value FROM checkpoints WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        return row[0], pickle.loads(row[1])
+
+    def put_checkpoint(self, key: str, commit_hash: str, value: Any) -> None:
+        self._connection().execute(
+            "INSERT OR REPLACE INTO checkpoints (key, commit_hash, value) VALUES (?, ?, ?)",
+            (key, commit_hash, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)),
+        )
+
+    def commit(self) -> None:
+        if self._conn is not None:
+            self._conn.commit()
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.commit()
+            self._conn.close()
+            self._conn = None
+
+# cache mantido aberto entre comandos pelo servidor (ver keep_analysis_cache),
+# e a thread dona da conexão: conexões SQLite não são compartilhadas entre threads
+_kept_cache: Optional[AnalysisCache] = None
+_kept_cache_thread: Optional[int] = None
+
+@contextmanager
+def keep_analysis_cache() -> Iterator[None]:
+    """
+    Mantém uma única conexão com o cache aberta durante o bloco: os comandos
+    executados nesta thread a reaproveitam, em vez de abrir e fechar o banco
+    a cada execução (usado por `minero serve`).
+    """
+    global _kept_cache, _kept_cache_thread
+    _kept_cache, _kept_cache_thread = AnalysisCache(), threading.get_ident()
+    try:
+        yield
+    finally:
+        cache, _kept_cache, _kept_cache_thread = _kept_cache, None, None
+        cache.close()
+
+@contextmanager
+def analysis_cache(enabled: bool = True) -> Iterator[Optional[AnalysisCache]]:
+    """Abre o cache (ou nada, se desativado) e grava tudo ao final do comando."""
+    if not enabled:
+        yield None
+        return
+    # o servidor aplica o ambiente de cada cliente: com outro $MINERO_CACHE_DIR,
+    # o comando abre o cache do cliente em vez de gravar no do servidor
+    if (_kept_cache is not None and _kept_cache_thread == threading.get_ident()
+            and _kept_cache.path == default_cache_dir() / "analysis.sqlite3"):
+        try:
+            yield _kept_cache
+        finally:
+            _kept_cache.commit()
+        return
+    cache = AnalysisCache()
+    try:
+        yield cache
+    finally:
+        cache.close()
+
+def lookup(modified_file: Any, analyzer: Callable, args: tuple,
+           cache: Optional[AnalysisCache], skip_empty: bool = False) -> Tuple[Optional[str], Any]:
+    """
+    Procura o resultado de um arquivo no cache sem ler o seu conteúdo.
+
+    Returns:
+        Uma tupla (chave, resultado). A chave é None quando o arquivo não
+        pode ser cacheado; o resultado é MISS quando a análise ainda precisa
+        ser feita (e None para arquivos vazios, se skip_empty).
+    """
+    sha = blob_sha(modified_file) if cache is not None else None
+    if skip_empty and sha == EMPTY_BLOB_SHA:
+        return None, None
+    if sha is None:
+        return None, MISS
+
+    key = cache.make_key(analyzer.__qualname__, sha, modified_file.filename, args)
+    return key, cache.get(key)
+
+def cached_analysis(modified_file: Any, analyzer: Callable, *args: Any,
+                    cache: Optional[AnalysisCache] = None, skip_empty: bool = False) -> Any:
+    """
+    Executa `analyzer(source_code, filename, *args)` sobre um arquivo
+    modificado, consultando o cache antes. Em caso de acerto, o conteúdo
+    do arquivo não é lido e o código não é parseado.
+
+    Args:
+        modified_file: arquivo do commit (ModifiedFile do PyDriller ou similar).
+        analyzer: função de análise por arquivo (ex.: check_function_sizes).
+        args: parâmetros extras do analisador, que também fazem parte da chave.
+        cache: cache a ser usado, ou None para sempre analisar.
+        skip_empty: se True, retorna None para arquivos sem conteúdo.
+    Returns:
+        O resultado do analisador (ou None, ver skip_empty).
+    """
+    key, result = lookup(modified_file, analyzer, args, cache, skip_empty)
+    if result is not MISS:
+        return result
+
+    source_code = modified_file.source_code
+    if skip_empty and not source_code:
+        return None
+
+    result = analyzer(source_code, modified_file.filename, *args)
+    if key is not None:
+        cache.put(key, result)
+    return result
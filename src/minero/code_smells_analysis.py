@@ -1,123 +1,70 @@
-from pydriller import Repository
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 
 import ast
 import re
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
+import time
 from collections import Counter
 
+from .param_analysis import count_function_params
+from .comments import iter_comments
+from .cache import analysis_cache
+from .parallel import iter_analyze_files, worker_pool
+from .options import AnalysisOptions
+from .commit_selection import describe_selection, select_commits
+from .ndjson_output import is_ndjson, smell_record, write_record
+from .top_k import TopK
+from .profiling import Profiler, StageTime, TimedSource, cprofile_dump, stage, timed
+from .records import (
+    DEAD_CODE,
+    GENERIC_NAME,
+    LARGE_CLASS,
+    LONG_PARAMETER_LIST,
+    MAGIC_NUMBER,
+    SINGLE_LETTER_NAME,
+    SmellRecord,
+)
+
 console = Console()
 
-def check_code_smells(repo_url: str, commit_hash: str):
+def check_code_smells(repo_url: str, commit_hash: Optional[str], options: Optional[AnalysisOptions] = None):
     """
     Analisa os arquivos python de um commit de um repositório
     e detecta code smells relacionados à manutenção.
 
     Args:
         repo_url: O caminho para o repositorio.
-        commit_hash: Hash do commit a ser analisado.
+        commit_hash: Hash do commit a ser analisado (ou None para usar --from/--to ou --last).
+        options: opções de execução (cache, paralelismo, intervalo de commits, etc.).
     """
-    console.print(Panel.fit(
-        f"[bold cyan] Analisando Code Smells[/bold cyan]\n"
-        f"Repositório: [yellow]{repo_url}[/yellow]\n"
-        f"Commit: [green]{commit_hash}[/green]",
-        style="blue"
-    ))
-
-    commits = Repository(repo_url, single=commit_hash).traverse_commits()
-    
-    files_analyzed = 0
-    total_smells_found = 0
-    
-    for commit in commits:
-        for modified_file in commit.modified_files:
+    options = options or AnalysisOptions()
 
-            if not modified_file.filename.endswith('.py'):
-                continue
+    if not is_ndjson(options):
+        console.print(Panel.fit(
+            f"[bold cyan] Analisando Code Smells[/bold cyan]\n"
+            f"Repositório: [yellow]{repo_url}[/yellow]\n"
+            f"Commit: [green]{describe_selection(commit_hash, options)}[/green]",
+            style="blue"
+        ))
 
-            # Verificar se o arquivo tem código fonte
-            if not modified_file.source_code:
-                continue
+    profiler = Profiler(options.profile_files) if options.profile else None
+    with cprofile_dump(options.profile_dump):
+        commits = select_commits(repo_url, commit_hash, options)
 
-            files_analyzed += 1
-            
-            # Header do arquivo com estilo similar ao cognitive_analysis
-            console.print()
-            console.print(f"[bold green]Arquivo:[/bold green] [yellow]{modified_file.filename}[/yellow]")
-            console.print()
+        # com --profile o cache fica de fora: um resultado do cache não diz onde o tempo foi gasto
+        with analysis_cache(options.use_cache and not options.profile) as cache, worker_pool(options.jobs) as pool:
+            if is_ndjson(options):
+                _write_smells(commits, cache, pool, options, profiler)
+            else:
+                files_analyzed, total_smells_found = _report_smells(commits, cache, pool, options, profiler)
 
-            smells = detect_code_smells(modified_file.source_code, modified_file.filename)
+    if is_ndjson(options):
+        if profiler is not None:
+            profiler.report(ndjson=True)
+        return
 
-            if smells:
-                total_smells_found += len(smells)
-                
-                # Agrupar por tipo de smell
-                smells_by_type: Dict[str, List[Dict]] = {}
-                for smell in smells:
-                    smell_type = smell['smell_type']
-                    if smell_type not in smells_by_type:
-                        smells_by_type[smell_type] = []
-                    smells_by_type[smell_type].append(smell)
-                
-                # Criar tabela com Rich
-                table = Table(show_header=True, header_style="bold magenta")
-                table.add_column("Code Smell", style="cyan")
-                table.add_column("Qtd", justify="center", style="bold")
-                table.add_column("Detalhes", overflow="fold")
-                
-                # Adicionar linhas com separação visual entre tipos
-                smell_types = list(smells_by_type.keys())
-                for idx, (smell_type, smell_list) in enumerate(smells_by_type.items()):
-                    # Formatar nome do smell
-                    smell_names = {
-                        'magic_number': 'Magic Numbers',
-                        'long_parameter_list': 'Lista de Parâmetros Longa',
-                        'large_class': 'God Class',
-                        'dead_code': 'Código Morto',
-                        'bad_variable_name': 'Nomes Ruins'
-                    }
-                    smell_name = smell_names.get(smell_type, smell_type.replace('_', ' ').title())
-                    count = len(smell_list)
-                    
-                    # Cor baseada na quantidade
-                    if count >= 10:
-                        count_color = "red"
-                    elif count >= 5:
-                        count_color = "yellow"
-                    else:
-                        count_color = "green"
-                    
-                    # Mostrar primeiros exemplos de forma mais limpa
-                    examples = []
-                    for i, smell in enumerate(smell_list[:3]):
-                        line_num = smell['line_number']
-                        desc = smell['description']
-                        if len(desc) > 50:
-                            desc = desc[:47] + "..."
-                        examples.append(f"• Linha {line_num}: {desc}")
-                    
-                    if len(smell_list) > 3:
-                        examples.append(f"• ... e mais {len(smell_list) - 3} ocorrências")
-                    
-                    table.add_row(
-                        smell_name,
-                        f"[{count_color}]{count}[/{count_color}]",
-                        "\n".join(examples)
-                    )
-                    
-                    # Adicionar linha separadora horizontal se não for o último item
-                    if idx < len(smell_types) - 1:
-                        table.add_row("", "", "")
-                        table.add_section()
-                
-                console.print(table)
-            else:
-                console.print("[green]Nenhum code smell detectado neste arquivo.[/green]")
-            
-            console.print()  # Linha em branco após cada arquivo
-    
     # Summary final
     console.print()
     if files_analyzed > 0:
@@ -150,144 +97,390 @@ def check_code_smells(repo_url: str, commit_hash: str):
             title="[bold white]Aviso[/bold white]"
         ))
 
-def detect_code_smells(source_code: str, filename: str) -> List[Dict]:
+    if profiler is not None:
+        profiler.report()
+    if options.profile_dump is not None:
+        console.print(f"Estatísticas do cProfile gravadas em [yellow]{options.profile_dump}[/yellow] (leia com python -m pstats).")
+
+def _iter_file_smells(commits, cache, pool, profiler: Optional[Profiler] = None):
+    """
+    Gera (commit, arquivo, smells) para cada arquivo .py com código. Com um
+    profiler, mede a travessia dos commits (inclui o diff do PyDriller), a
+    leitura dos arquivos e as etapas de cada análise.
+    """
+    if profiler is not None:
+        yield from _iter_profiled_file_smells(commits, cache, pool, profiler)
+        return
+
+    for commit in commits:
+        python_files = [mf for mf in commit.modified_files if mf.filename.endswith('.py')]
+
+        for modified_file, smells in iter_analyze_files(python_files, detect_code_smells, cache=cache, pool=pool, skip_empty=True):
+            # Arquivo sem código fonte
+            if smells is not None:
+                yield commit, modified_file, smells
+
+def _iter_profiled_file_smells(commits, cache, pool, profiler: Profiler):
+    commits = iter(commits)
+    while True:
+        with profiler.stage("traversal"):
+            commit = next(commits, None)
+            python_files = [] if commit is None else [
+                TimedSource(mf, profiler) for mf in commit.modified_files if mf.filename.endswith('.py')
+            ]
+        if commit is None:
+            return
+
+        for timed_file, result in iter_analyze_files(python_files, profile_code_smells, cache=cache, pool=pool, skip_empty=True):
+            if result is None:
+                continue
+            smells, timings = result
+            profiler.add_stages(timings)
+            seconds = timed_file.read_seconds + sum(measured.wall for measured in timings.values())
+            profiler.add_file(f"{commit.hash[:8]} {timed_file.filename}", seconds)
+            yield commit, timed_file, smells
+
+def _write_smells(commits, cache, pool, options, profiler: Optional[Profiler] = None):
+    """
+    Um registro NDJSON por code smell encontrado. Com --top, apenas os
+    smells dos K arquivos com mais smells, do pior para o melhor.
+    """
+    if not options.top:
+        for commit, _, smells in _iter_file_smells(commits, cache, pool, profiler):
+            with stage(profiler, "rendering"):
+                for smell in smells:
+                    write_record(smell_record(commit.hash, smell))
+        return
+
+    worst: TopK[tuple] = TopK(options.top, key=lambda entry: len(entry[1]))
+    for commit, _, smells in _iter_file_smells(commits, cache, pool, profiler):
+        if smells:
+            worst.push((commit.hash, smells))
+    with stage(profiler, "rendering"):
+        for commit_hash, smells in worst.items():
+            for smell in smells:
+                write_record(smell_record(commit_hash, smell))
+
+def _report_smells(commits, cache, pool, options, profiler: Optional[Profiler] = None):
+    """
+    Mostra os smells de cada arquivo. Com --top, guarda só os K arquivos
+    com mais smells (de todos os commits) e mostra apenas eles ao final;
+    com --only-violations, arquivos sem smells não aparecem.
+    """
+    files_analyzed = 0
+    total_smells_found = 0
+    worst: Optional[TopK[tuple]] = TopK(options.top, key=lambda entry: len(entry[1])) if options.top else None
+
+    for _, modified_file, smells in _iter_file_smells(commits, cache, pool, profiler):
+        files_analyzed += 1
+        total_smells_found += len(smells)
+        if options.only_violations and not smells:
+            continue
+        if worst is not None:
+            if smells:
+                worst.push((modified_file.filename, smells))
+            continue
+        with stage(profiler, "rendering"):
+            _print_file_smells(modified_file.filename, smells)
+
+    if worst is not None:
+        with stage(profiler, "rendering"):
+            for filename, smells in worst.items():
+                _print_file_smells(filename, smells)
+        if worst.truncated:
+            console.print(f"Mostrando {len(worst)} de {worst.seen} arquivos com code smells.")
+
+    return files_analyzed, total_smells_found
+
+def _print_file_smells(filename: str, smells: List[SmellRecord]) -> None:
+    # Header do arquivo com estilo similar ao cognitive_analysis
+    console.print()
+    console.print(f"[bold green]Arquivo:[/bold green] [yellow]{filename}[/yellow]")
+    console.print()
+
+    if smells:
+        # Agrupar por tipo de smell
+        smells_by_type: Dict[str, List[SmellRecord]] = {}
+        for smell in smells:
+            smell_type = smell['smell_type']
+            if smell_type not in smells_by_type:
+                smells_by_type[smell_type] = []
+            smells_by_type[smell_type].append(smell)
+        
+        # Criar tabela com Rich
+        table = Table(show_header=True, header_style="bold magenta")
+        table.add_column("Code Smell", style="cyan")
+        table.add_column("Qtd", justify="center", style="bold")
+        table.add_column("Detalhes", overflow="fold")
+        
+        # Adicionar linhas com separação visual entre tipos
+        smell_types = list(smells_by_type.keys())
+        for idx, (smell_type, smell_list) in enumerate(smells_by_type.items()):
+            # Formatar nome do smell
+            smell_names = {
+                'magic_number': 'Magic Numbers',
+                'long_parameter_list': 'Lista de Parâmetros Longa',
+                'large_class': 'God Class',
+                'dead_code': 'Código Morto',
+                'bad_variable_name': 'Nomes Ruins'
+            }
+            smell_name = smell_names.get(smell_type, smell_type.replace('_', ' ').title())
+            count = len(smell_list)
+            
+            # Cor baseada na quantidade
+            if count >= 10:
+                count_color = "red"
+            elif count >= 5:
+                count_color = "yellow"
+            else:
+                count_color = "green"
+            
+            # Mostrar primeiros exemplos de forma mais limpa
+            examples = []
+            for i, smell in enumerate(smell_list[:3]):
+                line_num = smell['line_number']
+                desc = smell['description']
+                if len(desc) > 50:
+                    desc = desc[:47] + "..."
+                examples.append(f"• Linha {line_num}: {desc}")
+            
+            if len(smell_list) > 3:
+                examples.append(f"• ... e mais {len(smell_list) - 3} ocorrências")
+            
+            table.add_row(
+                smell_name,
+                f"[{count_color}]{count}[/{count_color}]",
+                "\n".join(examples)
+            )
+            
+            # Adicionar linha separadora horizontal se não for o último item
+            if idx < len(smell_types) - 1:
+                table.add_row("", "", "")
+                table.add_section()
+        
+        console.print(table)
+    else:
+        console.print("[green]Nenhum code smell detectado neste arquivo.[/green]")
+
+    console.print()  # Linha em branco após cada arquivo
+
+def detect_code_smells(source_code: str, filename: str) -> List[SmellRecord]:
     """
     Detecta code smells no código fonte Python.
 
+    Todos os detectores baseados na AST compartilham uma única travessia
+    da árvore (ver SmellCollector).
+
     Args:
         source_code: string com o codigo python completo a ser analisado.
         filename: nome do arquivo analisado, somente para clareza nos logs.
     Returns:
-        Uma lista de dicionários com os code smells encontrados.
+        Uma lista de SmellRecord com os code smells encontrados.
     """
     try:
         tree = ast.parse(source_code)
     except SyntaxError:
         return []
     
-    smells = []
+    collector = SmellCollector(filename)
+    for node in ast.walk(tree):
+        collector.visit(node)
+    
+    return collector.smells(source_code)
+
+# ---- detectores por nó da AST ----
+
+def _magic_number_smell(node: ast.AST, filename: str) -> Optional[SmellRecord]:
+    # Compatibilidade com Python 3.8+ (ast.Constant) e versões anteriores (ast.Num)
+    value = getattr(node, 'value', getattr(node, 'n', None))
     
-    # Detectar diferentes tipos de code smells
-    smells.extend(detect_magic_numbers(tree, source_code, filename))
-    smells.extend(detect_long_parameter_lists(tree, filename))
-    smells.extend(detect_large_classes(tree, filename))
-    smells.extend(detect_dead_code_comments(source_code, filename))
-    smells.extend(detect_bad_variable_names(tree, filename))
+    # Ignorar valores comuns que não são considerados magic numbers
+    if isinstance(value, (int, float)) and value not in [0, 1, -1, 0.0, 1.0]:
+        return SmellRecord('magic_number', node.lineno, filename, MAGIC_NUMBER, value)
+    return None
+
+def _long_parameter_list_smell(node: ast.AST, filename: str) -> Optional[SmellRecord]:
+    # Contar parâmetros (excluindo *args e **kwargs)
+    param_count = count_function_params(node)
     
-    return smells
+    if param_count > 6:  # Mais restritivo que o comando params (que usa 5)
+        return SmellRecord('long_parameter_list', node.lineno, filename, LONG_PARAMETER_LIST, node.name, param_count)
+    return None
+
+def _large_class_smell(node: ast.AST, filename: str) -> Optional[SmellRecord]:
+    # Contar métodos na classe
+    method_count = 0
+    for child in node.body:
+        if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            method_count += 1
+    
+    if method_count > 10:  # Limite para God Class
+        return SmellRecord('large_class', node.lineno, filename, LARGE_CLASS, node.name, method_count)
+    return None
+
+# Nomes ruins comuns
+BAD_NAMES = ['data', 'info', 'temp', 'tmp', 'var', 'obj', 'item', 'thing', 'stuff']
+
+def _bad_variable_name_smell(node: ast.AST, filename: str) -> Optional[SmellRecord]:
+    name = node.id
+    
+    # Variáveis de uma letra (exceto convenções como i, j, k)
+    if len(name) == 1 and name not in ['i', 'j', 'k', '_']:
+        return SmellRecord('bad_variable_name', node.lineno, filename, SINGLE_LETTER_NAME, name)
+    
+    # Nomes genéricos não descritivos
+    if name.lower() in BAD_NAMES:
+        return SmellRecord('bad_variable_name', node.lineno, filename, GENERIC_NAME, name)
+    return None
+
+# ordem em que os tipos de smell são reportados por detect_code_smells
+SMELL_TYPES = ['magic_number', 'long_parameter_list', 'large_class', 'dead_code', 'bad_variable_name']
+
+# tipo de nó da AST -> detectores (tipo do smell, função) que se aplicam a ele
+_NODE_DETECTORS = {
+    ast.Constant: [('magic_number', _magic_number_smell)],
+    ast.FunctionDef: [('long_parameter_list', _long_parameter_list_smell)],
+    ast.AsyncFunctionDef: [('long_parameter_list', _long_parameter_list_smell)],
+    ast.ClassDef: [('large_class', _large_class_smell)],
+    ast.Name: [('bad_variable_name', _bad_variable_name_smell)],
+}
+
+class SmellCollector:
+    """
+    Acumula os code smells de uma travessia da AST feita por quem o usa:
+    cada nó é passado uma única vez para visit(), que despacha apenas
+    para os detectores que se aplicam ao tipo do nó.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self._smells_by_type: Dict[str, List[SmellRecord]] = {smell_type: [] for smell_type in SMELL_TYPES}
 
-def detect_magic_numbers(tree: ast.AST, source_code: str, filename: str) -> List[Dict]:
+    def visit(self, node: ast.AST):
+        for smell_type, detector in _NODE_DETECTORS.get(type(node), ()):
+            smell = detector(node, self.filename)
+            if smell:
+                self._smells_by_type[smell_type].append(smell)
+
+    def smells(self, source_code: str) -> List[SmellRecord]:
+        """Retorna os smells coletados (mais os de texto) na mesma ordem de sempre."""
+        self._smells_by_type['dead_code'] = detect_dead_code_comments(source_code, self.filename)
+        smells = []
+        for smell_type in SMELL_TYPES:
+            smells.extend(self._smells_by_type[smell_type])
+        return smells
+
+class _TimedSmellCollector(SmellCollector):
+    """SmellCollector que soma o tempo de cada detector em detector.<tipo do smell>."""
+
+    def __init__(self, filename: str, timings: Dict[str, StageTime]):
+        super().__init__(filename)
+        self.timings = timings
+
+    def visit(self, node: ast.AST):
+        for smell_type, detector in _NODE_DETECTORS.get(type(node), ()):
+            wall, cpu = time.perf_counter(), time.process_time()
+            smell = detector(node, self.filename)
+            measured = self.timings.setdefault(f"detector.{smell_type}", StageTime())
+            measured.wall += time.perf_counter() - wall
+            measured.cpu += time.process_time() - cpu
+            measured.calls += 1
+            if smell:
+                self._smells_by_type[smell_type].append(smell)
+
+    def smells(self, source_code: str) -> List[SmellRecord]:
+        with timed(self.timings, "detector.dead_code"):
+            return super().smells(source_code)
+
+def profile_code_smells(source_code: str, filename: str) -> Tuple[List[SmellRecord], Dict[str, StageTime]]:
+    """
+    Mesmo que detect_code_smells, medindo o ast.parse, a travessia da árvore
+    e cada detector (usado com --profile; roda também nos processos do pool).
+
+    Returns:
+        Uma tupla (smells, tempo por etapa). A etapa ast_walk não inclui o
+        tempo dos detectores chamados durante a travessia.
+    """
+    timings: Dict[str, StageTime] = {}
+    with timed(timings, "ast_parse"):
+        try:
+            tree = ast.parse(source_code)
+        except SyntaxError:
+            tree = None
+    if tree is None:
+        return [], timings
+
+    collector = _TimedSmellCollector(filename, timings)
+    with timed(timings, "ast_walk"):
+        for node in ast.walk(tree):
+            collector.visit(node)
+    walk = timings["ast_walk"]
+    for name, measured in timings.items():
+        if name.startswith("detector."):
+            walk.wall -= measured.wall
+            walk.cpu -= measured.cpu
+
+    return collector.smells(source_code), timings
+
+def detect_magic_numbers(tree: ast.AST, source_code: str, filename: str) -> List[SmellRecord]:
     """Detecta números mágicos no código"""
     smells = []
     
     for node in ast.walk(tree):
-        # Compatibilidade com Python 3.8+ (ast.Constant) e versões anteriores (ast.Num)
         if isinstance(node, (ast.Constant, ast.Num)):
-            value = getattr(node, 'value', getattr(node, 'n', None))
-            
-            # Ignorar valores comuns que não são considerados magic numbers
-            if isinstance(value, (int, float)) and value not in [0, 1, -1, 0.0, 1.0]:
-                smells.append({
-                    'smell_type': 'magic_number',
-                    'line_number': node.lineno,
-                    'description': f"Magic number {value}",
-                    'file_path': filename
-                })
+            smell = _magic_number_smell(node, filename)
+            if smell:
+                smells.append(smell)
     
     return smells
 
-def detect_long_parameter_lists(tree: ast.AST, filename: str) -> List[Dict]:
+def detect_long_parameter_lists(tree: ast.AST, filename: str) -> List[SmellRecord]:
     """Detecta funções com muitos parâmetros (>6)"""
     smells = []
     
     for node in ast.walk(tree):
         if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-            # Contar parâmetros (excluindo *args e **kwargs)
-            param_count = len(node.args.args) + len(getattr(node.args, 'posonlyargs', []))
-            param_count += len(getattr(node.args, 'kwonlyargs', []))
-            
-            if param_count > 6:  # Mais restritivo que o comando params (que usa 5)
-                smells.append({
-                    'smell_type': 'long_parameter_list',
-                    'line_number': node.lineno,
-                    'description': f"Função '{node.name}' tem {param_count} parâmetros (recomendado: ≤6)",
-                    'file_path': filename
-                })
+            smell = _long_parameter_list_smell(node, filename)
+            if smell:
+                smells.append(smell)
     
     return smells
 
-def detect_large_classes(tree: ast.AST, filename: str) -> List[Dict]:
+def detect_large_classes(tree: ast.AST, filename: str) -> List[SmellRecord]:
     """Detecta classes grandes (God Classes) com muitos métodos"""
     smells = []
     
     for node in ast.walk(tree):
         if isinstance(node, ast.ClassDef):
-            # Contar métodos na classe
-            method_count = 0
-            for child in node.body:
-                if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                    method_count += 1
-            
-            if method_count > 10:  # Limite para God Class
-                smells.append({
-                    'smell_type': 'large_class',
-                    'line_number': node.lineno,
-                    'description': f"Classe '{node.name}' tem {method_count} métodos (recomendado: ≤10) - possível God Class",
-                    'file_path': filename
-                })
+            smell = _large_class_smell(node, filename)
+            if smell:
+                smells.append(smell)
     
     return smells
 
-def detect_dead_code_comments(source_code: str, filename: str) -> List[Dict]:
+# comentário que parece uma linha de código Python (ver detect_dead_code_comments)
+_COMMENTED_CODE = re.compile(r"def |class |import |if |for |while |return ")
+
+def detect_dead_code_comments(source_code: str, filename: str) -> List[SmellRecord]:
     """Detecta possível código morto comentado"""
     smells = []
-    lines = source_code.split('\n')
-    
-    for i, line in enumerate(lines, 1):
-        stripped_line = line.strip()
-        
-        # Procurar por código comentado (linhas que começam com # seguido de código Python)
-        if (stripped_line.startswith('#') and 
-            len(stripped_line) > 2 and 
-            not stripped_line.startswith('##') and  # Ignorar comentários de documentação
-            any(keyword in stripped_line for keyword in ['def ', 'class ', 'import ', 'if ', 'for ', 'while ', 'return '])):
-            
-            smells.append({
-                'smell_type': 'dead_code',
-                'line_number': i,
-                'description': f"Possível código morto comentado: {stripped_line[:50]}...",
-                'file_path': filename
-            })
-    
+    for comment in iter_comments(source_code):
+        # só comentários sozinhos na linha; '##' são comentários de documentação
+        if (comment.full_line and
+            len(comment.text) > 2 and
+            not comment.text.startswith('##') and
+            _COMMENTED_CODE.search(comment.text)):
+            smells.append(SmellRecord('dead_code', comment.line_number, filename, DEAD_CODE, comment.text[:50]))
     return smells
 
-def detect_bad_variable_names(tree: ast.AST, filename: str) -> List[Dict]:
+def detect_bad_variable_names(tree: ast.AST, filename: str) -> List[SmellRecord]:
     """Detecta nomes de variáveis não descritivos"""
     smells = []
     
-    # Nomes ruins comuns
-    bad_names = ['data', 'info', 'temp', 'tmp', 'var', 'obj', 'item', 'thing', 'stuff']
-    
     for node in ast.walk(tree):
         if isinstance(node, ast.Name):
-            name = node.id
-            
-            # Variáveis de uma letra (exceto convenções como i, j, k)
-            if len(name) == 1 and name not in ['i', 'j', 'k', '_']:
-                smells.append({
-                    'smell_type': 'bad_variable_name',
-                    'line_number': node.lineno,
-                    'description': f"Variável de uma letra: '{name}' (não descritiva)",
-                    'file_path': filename
-                })
-            
-            # Nomes genéricos não descritivos
-            elif name.lower() in bad_names:
-                smells.append({
-                    'smell_type': 'bad_variable_name',
-                    'line_number': node.lineno,
-                    'description': f"Nome não descritivo: '{name}' (considere um nome mais específico)",
-                    'file_path': filename
-                })
+            smell = _bad_variable_name_smell(node, filename)
+            if smell:
+                smells.append(smell)
     
-    return smells
\ No newline at end of file
+    return smells
@@ -1,14 +1,23 @@
 from __future__ import annotations
 
-from typing import Optional, List
+from typing import Callable, Optional, List, Tuple, Union
 import ast
-from dataclasses import dataclass
+import sys
+from dataclasses import dataclass, replace
 
-from pydriller import Repository
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 
+from .cache import analysis_cache
+from .parallel import iter_analyze_files, worker_pool
+from .options import AnalysisOptions
+from .commit_selection import describe_selection, has_commit_selection, select_commits
+from .history_chunks import AnalyzedCommit, iter_history_chunks
+from .repository import mirrored_repository
+from .ndjson_output import function_record, is_ndjson, write_record
+from .top_k import TopK
+
 console = Console()
 
 CONTROL_NODES = (
@@ -28,7 +37,7 @@ FLOW_NODES = (
 	ast.Raise,
 )
 
-@dataclass
+@dataclass(slots=True)
 class FunctionComplexity:
     file_path: str
     function_name: str
@@ -37,6 +46,10 @@ class FunctionComplexity:
     end_lineno: Optional[int] = None
     param_count: Optional[int] = None
 
+    def __post_init__(self):
+        # todas as funções de um arquivo compartilham a mesma string do caminho
+        self.file_path = sys.intern(self.file_path)
+
 class CognitiveComplexityVisitor(ast.NodeVisitor):
     """
     Visitor que calcula uma métrica de complexidade cognitiva para uma subárvore AST.
@@ -89,8 +102,13 @@ class CognitiveComplexityVisitor(ast.NodeVisitor):
 
     def visit_While(self, node: ast.While):
         self._enter_control()
+        # como no if, a condição não é visitada: os operadores booleanos dela são contados uma única vez aqui
         self._count_boolops_in_node(node.test)
-        self.generic_visit(node)
+
+        for child in node.body:
+            self.visit(child)
+        for child in node.orelse:
+            self.visit(child)
         self._exit_control()
 
     def visit_With(self, node: ast.With):
@@ -109,13 +127,7 @@ class CognitiveComplexityVisitor(ast.NodeVisitor):
         # pois eles estão no mesmo nível visual do try, não "dentro" dele.
 
         for h in node.handlers:
-            # conta 'except' como uma estrutura de controle também
-            self._enter_control()
-            if h.type:
-                self._count_boolops_in_node(h.type)
-            for child in h.body:
-                self.visit(child)
-            self._exit_control()
+            self._visit_handler(h)
         
         self._nesting += 1
 
@@ -125,6 +137,15 @@ class CognitiveComplexityVisitor(ast.NodeVisitor):
             self.visit(child)
         self._exit_control()
 
+    def _visit_handler(self, handler: ast.ExceptHandler):
+        # conta 'except' como uma estrutura de controle também
+        self._enter_control()
+        if handler.type:
+            self._count_boolops_in_node(handler.type)
+        for child in handler.body:
+            self.visit(child)
+        self._exit_control()
+
     if hasattr(ast, "Match"):
         def visit_Match(self, node: ast.Match):
             self._enter_control()
@@ -161,6 +182,80 @@ class CognitiveComplexityVisitor(ast.NodeVisitor):
                 self.complexity += num_ops
 
 
+class FunctionComplexityCollector(CognitiveComplexityVisitor):
+    """
+    Calcula a complexidade de todas as funções de uma árvore em uma única
+    travessia, com o mesmo resultado de um CognitiveComplexityVisitor novo
+    em cada FunctionDef, sem percorrer de novo as funções aninhadas.
+
+    Cada nó é visitado uma vez e contado na função mais interna que o
+    contém. Quando uma função aninhada termina, o total dela é somado ao
+    da função de fora: vista de fora, cada estrutura de controle da função
+    interna fica `nesting` níveis mais funda (o aninhamento no ponto do
+    def), o que acrescenta `nesting` × (estruturas de controle da função
+    interna). O custo é O(nós), e não O(nós × profundidade das funções
+    aninhadas), como em closures e decoradores.
+    """
+
+    def __init__(self):
+        super().__init__()
+        # estruturas de controle da função atual, incluindo as das funções aninhadas nela
+        self._controls = 0
+        # profundidade do nó atual na árvore, para devolver as funções na ordem de ast.walk
+        self._depth = 0
+        self._functions: List[Tuple[int, int, ast.AST, int]] = []
+
+    def visit(self, node: ast.AST):
+        self._depth += 1
+        getattr(self, "visit_" + node.__class__.__name__, self.generic_visit)(node)
+        self._depth -= 1
+
+    def _enter_control(self):
+        super()._enter_control()
+        self._controls += 1
+
+    def _visit_handler(self, handler: ast.ExceptHandler):
+        # o ExceptHandler é um nó entre o try e o corpo do except
+        self._depth += 1
+        super()._visit_handler(handler)
+        self._depth -= 1
+
+    def visit_FunctionDef(self, node: ast.AST):
+        # a posição é reservada na entrada (pré-ordem), antes das funções aninhadas
+        index = len(self._functions)
+        self._functions.append(None)
+        outer = (self.complexity, self._nesting, self._controls)
+        self.complexity = self._nesting = self._controls = 0
+
+        self.generic_visit(node)
+
+        complexity, controls = self.complexity, self._controls
+        self._functions[index] = (self._depth, index, node, complexity)
+        self.complexity, self._nesting, self._controls = outer
+        self.complexity += complexity + self._nesting * controls
+        self._controls += controls
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def functions(self) -> List[Tuple[ast.AST, int]]:
+        """Tuplas (nó, complexidade) das funções visitadas, na ordem de ast.walk (em largura)."""
+        # em largura: por profundidade e, na mesma profundidade, na pré-ordem
+        ordered = sorted(self._functions, key=lambda entry: (entry[0], entry[1]))
+        return [(node, complexity) for _, _, node, complexity in ordered]
+
+def function_complexities(tree: ast.AST) -> List[Tuple[ast.AST, int]]:
+    """
+    Args:
+        tree: árvore (ou subárvore) já parseada.
+    Returns:
+        Tuplas (nó da função, complexidade cognitiva) de todas as funções da
+        árvore, aninhadas ou não, na ordem de ast.walk.
+    """
+    collector = FunctionComplexityCollector()
+    collector.visit(tree)
+    return collector.functions()
+
+
 # ---- funções auxiliares ----
 
 def analyze_functions_in_source(source_code: str, filename: str) -> List[FunctionComplexity]:
@@ -169,78 +264,163 @@ def analyze_functions_in_source(source_code: str, filename: str) -> List[Functio
         source_code: string com o código fonte python a ser analisado
         filename: nome do arquivo analisado
     Returns:
-        Uma lista com a complexidade por função.
+        Uma lista com a complexidade por função (vazia se o código não puder ser parseado).
+    """
+    results = safe_analyze_functions(source_code, filename)
+    return [] if isinstance(results, Exception) else results
+
+def safe_analyze_functions(source_code: str, filename: str) -> Union[List[FunctionComplexity], Exception]:
+    """
+    Como analyze_functions_in_source, mas devolve o erro de parse como
+    resultado: ele passa pelo pool e pelo cache como qualquer outro, e quem
+    chama decide como mostrá-lo (sem escrever nada no meio da saída).
     """
     try:
         tree = ast.parse(source_code)
     except Exception as e:
-        console.print(f"[red]Erro ao parsear {filename}: {e}[/red]")
-        return []
+        return e
 
     results: List[FunctionComplexity] = []
 
-    for node in ast.walk(tree):
-        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-            visitor = CognitiveComplexityVisitor()
-            # visita apenas a subárvore da função
-            visitor.visit(node)
-
-            results.append(
-                FunctionComplexity(
-                    file_path=filename,
-                    function_name=node.name,
-                    complexity=visitor.complexity,
-                )
+    for node, complexity in function_complexities(tree):
+        results.append(
+            FunctionComplexity(
+                file_path=filename,
+                function_name=node.name,
+                complexity=complexity,
+                lineno=node.lineno,
+                end_lineno=node.end_lineno,
             )
+        )
 
     return results
 
 
 # ---- função principal ----
 
-def show_cognitive_analysis(repo_url: str, commit_hash: Optional[str] = None, complexity_level_threshold: int = 12) -> None:
+def show_cognitive_analysis(repo_url: str, commit_hash: Optional[str] = None, complexity_level_threshold: int = 12,
+                            options: Optional[AnalysisOptions] = None) -> None:
     """
     Args:
         source_code: string com o código fonte python a ser analisado
         commit_hash: Hash do commit a ser analisado.
         complexity_level_threshold: nível de complexidade máximo aceitável antes de emitir um alerta.
+        options: opções de execução (cache, paralelismo, intervalo de commits, etc.).
     Returns:
-        A complexidade cognitiva das funções Python no commit especificado ou nos últimos 5 commits.
+        A complexidade cognitiva das funções Python no commit especificado ou nos últimos 5 commits (ou --last N).
     """
 
+    options = options or AnalysisOptions()
     complexity_threshold = complexity_level_threshold if isinstance(complexity_level_threshold, int) else 12 # nível de complexidade para alerta
 
+    if not has_commit_selection(commit_hash, options):
+        # caso nada seja fornecido, pegar os últimos 5 commits
+        options = replace(options, last=5)
+
     header = f"Analisando complexidade cognitiva do repositório: {repo_url}"
-    if commit_hash:
-        header += f" (commit: {commit_hash})"
+    header += f" (commit: {describe_selection(commit_hash, options)})"
+
+    if not is_ndjson(options):
+        console.print(Panel.fit(header, style="blue"))
+
+    commits = select_commits(repo_url, commit_hash, options)
+
+    if options.changed_only:
+        # o resultado depende das duas versões do arquivo e do diff: não passa pelo cache
+        from .delta_analysis import report_function_deltas  # local: delta_analysis importa este módulo
+        with worker_pool(options.jobs) as pool:
+            report_function_deltas(commits, pool, options)
+        return
 
-    console.print(Panel.fit(header, style="blue"))
+    with analysis_cache(options.use_cache) as cache, worker_pool(options.jobs) as pool:
+        if pool is not None and not commit_hash and not (options.snapshot or options.staged or options.worktree):
+            # intervalo ou --last com -j: cada processo percorre um trecho do histórico, diff incluído
+            commits = iter_history_chunks(mirrored_repository(repo_url), (c.hash for c in commits), safe_analyze_functions,
+                                          cache=cache, pool=pool, skip_empty=True)
+        if is_ndjson(options):
+            _write_complexities(commits, complexity_threshold, cache, pool, options)
+        else:
+            _report_complexities(commits, complexity_threshold, cache, pool, options)
 
-    # caso commit seja fornecido, analisa só ele
-    if commit_hash:
-        commits = list(Repository(repo_url, single=commit_hash).traverse_commits())
+ParseErrorHandler = Callable[[str, str, Exception], None]
+
+def _function_results(commit_obj, cache, pool, on_parse_error: ParseErrorHandler):
+    """
+    Funções de cada arquivo .py do commit: já calculadas no pool (AnalyzedCommit)
+    ou analisadas agora. Arquivos que não parseiam vão para on_parse_error(hash, arquivo, erro).
+    """
+    if isinstance(commit_obj, AnalyzedCommit):
+        results = commit_obj.results
     else:
-        # caso contrario, pegar os últimos 5 commits
-        all_commits = list(Repository(repo_url).traverse_commits())
-        commits = all_commits[:5]
+        python_files = [mf for mf in commit_obj.modified_files if mf.filename.endswith(".py")]
+        results = ((mf.filename, file_results) for mf, file_results in
+                   iter_analyze_files(python_files, safe_analyze_functions, cache=cache, pool=pool, skip_empty=True))
+    for filename, file_results in results:
+        if isinstance(file_results, Exception):
+            on_parse_error(commit_obj.hash, filename, file_results)
+            continue
+        yield file_results
 
-    for commit_obj in commits:
-        console.print(Panel.fit(f"Commit: [green]{commit_obj.hash}[/green] - {commit_obj.msg[:80]}", style="cyan"))
+def _write_parse_error(commit_hash: str, filename: str, error: Exception) -> None:
+    write_record({"kind": "parse_error", "commit_hash": commit_hash, "file_path": filename, "error": str(error)})
 
-        all_results: List[FunctionComplexity] = []
+def _print_parse_error(commit_hash: str, filename: str, error: Exception) -> None:
+    console.print(f"[red]Erro ao parsear {filename}: {error}[/red]")
 
-        for mf in commit_obj.modified_files:
-            if not mf.filename.endswith(".py"):
-                continue
-            if not mf.source_code:
+def _ranked_complexities(commit_obj, complexity_threshold, cache, pool, options,
+                         on_parse_error: ParseErrorHandler) -> Tuple[TopK[FunctionComplexity], int]:
+    """
+    Passa as funções do commit por um TopK de tamanho --top (todas, sem
+    --top), descartando as que não passam do limite com --only-violations.
+
+    Returns:
+        Uma tupla (ranking, quantidade de funções encontradas no commit).
+    """
+    ranking: TopK[FunctionComplexity] = TopK(options.top, key=lambda r: r.complexity)
+    found = 0
+
+    for file_results in _function_results(commit_obj, cache, pool, on_parse_error):
+        for r in file_results or ():
+            found += 1
+            if options.only_violations and r.complexity <= complexity_threshold:
                 continue
+            ranking.push(r)
+    return ranking, found
 
-            file_results = analyze_functions_in_source(mf.source_code, mf.filename)
-            all_results.extend(file_results)
+def _write_complexities(commits, complexity_threshold, cache, pool, options):
+    """
+    Um registro NDJSON por função, na ordem dos arquivos (sem ordenar o
+    commit inteiro em memória). Com --top, as K funções mais complexas de
+    cada commit, da maior para a menor. Arquivos que não parseiam viram
+    registros {"kind": "parse_error"}.
+    """
+    for commit_obj in commits:
+        if options.top:
+            ranking, _ = _ranked_complexities(commit_obj, complexity_threshold, cache, pool, options, _write_parse_error)
+            results = ranking.items()
+        else:
+            results = (
+                r
+                for file_results in _function_results(commit_obj, cache, pool, _write_parse_error)
+                for r in file_results or ()
+                if not options.only_violations or r.complexity > complexity_threshold
+            )
+        for r in results:
+            write_record(function_record(commit_obj.hash, r, complexity=r.complexity,
+                                         alert=r.complexity > complexity_threshold))
+
+def _report_complexities(commits, complexity_threshold, cache, pool, options):
+    for commit_obj in commits:
+        console.print(Panel.fit(f"Commit: [green]{commit_obj.hash}[/green] - {commit_obj.msg[:80]}", style="cyan"))
 
-        if not all_results:
+        ranking, found = _ranked_complexities(commit_obj, complexity_threshold, cache, pool, options, _print_parse_error)
+
+        if not found:
             console.print("Nenhuma função Python encontrada neste commit.")
             continue
+        if not len(ranking):
+            console.print("[green]Nenhuma função acima do limite de complexidade neste commit.[/green]")
+            continue
 
         table = Table(show_header=True, header_style="bold magenta")
         table.add_column("Arquivo", overflow="fold")
@@ -248,11 +428,10 @@ def show_cognitive_analysis(repo_url: str, commit_hash: Optional[str] = None, co
         table.add_column("Complexidade")
         table.add_column("Status")
 
-        all_results.sort(key=lambda x: x.complexity, reverse=True)
-
-        for r in all_results:
-            print("r.complexity", r.complexity)
+        for r in ranking.items():
             status = "[green]OK[/green]" if int(r.complexity) <= complexity_threshold else "[red]ALERTA[/red]"
             table.add_row(r.file_path, r.function_name, str(r.complexity), status)
 
-        console.print(table)
\ No newline at end of file
+        console.print(table)
+        if ranking.truncated:
+            console.print(f"Mostrando {len(ranking)} de {ranking.seen} funções.")
@@ -0,0 +1,9 @@
+from array import array
+
+# tipo dos valores guardados nas colunas de métricas (séries do trend e
+# agregados do summary): inteiros sem sinal de 4 bytes
+TYPECODE = "I"
+
+def metric_column() -> array:
+    """Coluna vazia de métricas, usada como default_factory nos dataclasses em colunas."""
+    return array(TYPECODE)
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from typing import Iterator, NamedTuple
+import re
+
+# tudo o que vem antes do próximo comentário e o comentário em si. As
+# strings são consumidas inteiras, então um '#' dentro delas nunca é visto
+# como comentário; o prefixo (r, b, f...) não muda onde a string termina, e
+# uma aspa sem par conta como código. O lookahead com referência deixa o
+# trecho de código atômico: sem retrocesso, a busca é linear e uma falha
+# quer dizer que não há mais comentários.
+_NEXT_COMMENT = re.compile(
+    r"(?=(?P<code>(?:[^'\"#]+"
+    r"|'''[^'\\]*(?:(?:\\.|'(?!''))[^'\\]*)*(?:'''|\Z)"
+    r'|"""[^"\\]*(?:(?:\\.|"(?!""))[^"\\]*)*(?:"""|\Z)'
+    r"|'[^'\\\n]*(?:\\.[^'\\\n]*)*'"
+    r'|"[^"\\\n]*(?:\\.[^"\\\n]*)*"'
+    r"|['\"])*))(?P=code)"
+    r"(?P<comment>#[^\r\n]*)",
+    re.DOTALL,
+)
+
+class Comment(NamedTuple):
+    """
+    Um comentário do código-fonte.
+
+    Attributes:
+        line_number: linha do comentário (a partir de 1).
+        text: o comentário, a partir do '#', sem a quebra de linha.
+        full_line: True se o comentário ocupa a linha sozinho (só espaços antes do '#').
+    """
+    line_number: int
+    text: str
+    full_line: bool
+
+def iter_comments(source_code: str) -> Iterator[Comment]:
+    """
+    Percorre os comentários reais de um código-fonte, em uma única passada:
+    um '#' dentro de uma string (inclusive docstrings de várias linhas) não
+    é comentário. Equivale a filtrar os tokens COMMENT do tokenize, sem
+    montar os demais tokens e sem falhar em código com erro de sintaxe.
+
+    A varredura inteira acontece dentro do módulo re; o Python só trabalha
+    a cada comentário encontrado. É a base dos detectores que olham o texto
+    do arquivo em vez da AST.
+
+    Args:
+        source_code: O código-fonte.
+    Returns:
+        Um gerador de Comment, na ordem do arquivo.
+    """
+    if "#" not in source_code:
+        return
+    line_number = 1
+    counted = 0
+    match = _NEXT_COMMENT.match(source_code)
+    while match:
+        start = match.start("comment")
+        line_number += source_code.count("\n", counted, start)
+        counted = start
+        line_start = source_code.rfind("\n", 0, start) + 1
+        yield Comment(line_number, match.group("comment").rstrip(), not source_code[line_start:start].strip())
+        match = _NEXT_COMMENT.match(source_code, match.end())
@@ -0,0 +1,96 @@
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from pydriller import Commit, Repository
+
+from .options import AnalysisOptions
+from .repository import git_repository, local_repository, mirrored_repository
+from .snapshot import snapshot_commits
+from .working_tree import working_tree_commits
+
+def has_commit_selection(commit_hash: Optional[str], options: AnalysisOptions) -> bool:
+    """Indica se o usuário escolheu um commit, um intervalo ou os últimos N commits."""
+    return bool(commit_hash or options.from_rev or options.to_rev or options.last or options.snapshot
+                or options.staged or options.worktree)
+
+def repository_kwargs(commit_hash: Optional[str], options: AnalysisOptions) -> Dict[str, Any]:
+    """
+    Monta os argumentos do Repository do PyDriller para o commit ou para o
+    intervalo --from/--to escolhido. O intervalo é percorrido em uma única
+    passada de traverse_commits(), do commit mais antigo para o mais novo,
+    e inclui os dois extremos.
+
+    Args:
+        commit_hash: Hash de um único commit, ou None.
+        options: opções de execução com o intervalo (from_rev/to_rev).
+    Returns:
+        Um dicionário com os argumentos nomeados para o Repository.
+    """
+    if commit_hash:
+        return {"single": commit_hash}
+
+    kwargs = {}
+    if options.from_rev:
+        kwargs["from_commit"] = options.from_rev
+    if options.to_rev:
+        kwargs["to_commit"] = options.to_rev
+    return kwargs
+
+def describe_selection(commit_hash: Optional[str], options: AnalysisOptions) -> str:
+    """Texto usado nos cabeçalhos para o commit ou intervalo analisado."""
+    if options.staged:
+        return "alterações no índice (--staged)"
+    if options.worktree:
+        return "alterações no diretório de trabalho (--worktree)"
+    if options.snapshot:
+        return f"{commit_hash or 'HEAD'} (árvore completa)"
+    if commit_hash:
+        return commit_hash
+    if options.last:
+        return f"últimos {options.last} commits"
+    return f"{options.from_rev or 'início'}..{options.to_rev or 'HEAD'}"
+
+def last_commits(repo_url: str, count: int) -> Iterator[Commit]:
+    """
+    Percorre os `count` commits mais recentes a partir de HEAD, do mais novo
+    para o mais antigo.
+
+    Diferente de Repository(...).traverse_commits(), que monta a lista de
+    todo o histórico antes de devolver o primeiro commit, aqui o git
+    rev-list recebe --max-count e para sozinho: tempo e memória crescem
+    com `count`, não com o tamanho do histórico.
+
+    Args:
+        repo_url: O caminho (ou URL) do repositorio.
+        count: quantidade de commits.
+    Returns:
+        Um gerador de commits do PyDriller.
+    """
+    with local_repository(repo_url) as path, git_repository(path) as git:
+        yield from git.get_list_commits("HEAD", max_count=count, reverse=False)
+
+def select_commits(repo_url: str, commit_hash: Optional[str], options: AnalysisOptions) -> Iterable[Any]:
+    """
+    Commits a analisar conforme a seleção do usuário, na mesma ordem de
+    prioridade em todos os comandos: --staged/--worktree, --snapshot,
+    --last N e, por fim, o commit ou o intervalo --from/--to.
+
+    Args:
+        repo_url: O caminho (ou URL) do repositorio.
+        commit_hash: Hash de um único commit (ou a revisão do --snapshot), ou None.
+        options: opções de execução com a seleção de commits.
+    Returns:
+        Um iterável de commits do PyDriller, ou de SnapshotCommit para
+        --snapshot, --staged e --worktree. Com --last, do mais novo para o
+        mais antigo; nos outros casos, do mais antigo para o mais novo.
+    """
+    if options.staged or options.worktree:
+        # só os arquivos ainda não commitados, sem percorrer nenhum commit
+        return working_tree_commits(repo_url, staged=options.staged)
+    if options.snapshot:
+        # todos os arquivos da árvore do commit, lidos direto do banco de objetos
+        return snapshot_commits(repo_url, commit_hash)
+    if options.last:
+        # percorre do mais novo para o mais antigo e para após N commits
+        return last_commits(repo_url, options.last)
+    # um commit ou intervalo, percorrido um commit por vez
+    return Repository(mirrored_repository(repo_url), **repository_kwargs(commit_hash, options)).traverse_commits()
@@ -1,54 +1,72 @@
-from pydriller import Repository
+from typing import Optional
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
-from itertools import islice
+
+from .cache import analysis_cache
+from .options import AnalysisOptions
+from .repository import local_repository, repository_id
+from .repository_stats import collect_repository_stats, first_commits
+from .ndjson_output import is_ndjson, write_record
 
 console = Console()
 
-def show_commits_info(repo_url: str):
-    console.print(Panel.fit(f"[bold cyan] Analisando repositório:[/bold cyan] {repo_url}", style="blue"))
+def show_commits_info(repo_url: str, options: Optional[AnalysisOptions] = None):
+    options = options or AnalysisOptions()
+    if not is_ndjson(options):
+        console.print(Panel.fit(f"[bold cyan] Analisando repositório:[/bold cyan] {repo_url}", style="blue"))
+
+    with analysis_cache(options.use_cache) as cache, local_repository(repo_url) as repo_path:
+        records = first_commits(repo_path, 10, cache, repository_id(repo_url))
+
+    if is_ndjson(options):
+        for commit in records:
+            write_record({"kind": "commit", "commit_hash": commit.hash, "msg": commit.msg,
+                          "author": commit.author, "files": commit.files})
+        return
 
-    for commit in islice(Repository(repo_url).traverse_commits(), 10):
+    for commit in records:
         table = Table(show_header=True, header_style="bold magenta")
         table.add_column("Arquivo Modificado", style="yellow")
 
-        for file in commit.modified_files:
-            table.add_row(file.filename)
+        for filename in commit.files:
+            table.add_row(filename)
 
         console.print()
         console.print(f"[bold green]Commit:[/bold green] {commit.hash[:10]}")
         console.print(f"[bold]Título:[/bold] {commit.msg}")
-        console.print(f"[bold]Autor:[/bold] {commit.author.name}")
+        console.print(f"[bold]Autor:[/bold] {commit.author}")
         console.print(table)
 
-def show_repository_generic_info(repo_url: str):
-    console.print(Panel.fit(f"[bold cyan] Analisando repositório:[/bold cyan] {repo_url}", style="blue"))
-
-    repo = Repository(repo_url)
-    total_authors = set()
-    total_files = set()
-    total_branches = set()
-    authors_commit_number = {}
-    total_commits = 0
-
-    for commit in repo.traverse_commits():
-        total_commits += 1
-        total_branches.update(commit.branches)
-        total_authors.add(commit.author.name)
-        authors_commit_number[commit.author.name] = authors_commit_number.get(commit.author.name, 0) + 1
-        for file in commit.modified_files:
-            total_files.add(file.filename)
-    
-
-    console.print(f"[bold green]Total de Commits:[/bold green] {total_commits}")
-    console.print(f"[bold green]Total de Arquivos Modificados:[/bold green] {len(total_files)}")
-    console.print(f"[bold green]Total de Autores:[/bold green] {len(total_authors)}")
-    console.print(f"[bold green]Total de Branches:[/bold green] {len(total_branches)}")
+def show_repository_generic_info(repo_url: str, options: Optional[AnalysisOptions] = None):
+    options = options or AnalysisOptions()
+    if not is_ndjson(options):
+        console.print(Panel.fit(f"[bold cyan] Analisando repositório:[/bold cyan] {repo_url}", style="blue"))
+
+    # uma única passada pelo log (git log --name-only), sem gerar diffs por commit;
+    # com cache, apenas os commits novos desde a última execução são lidos
+    with analysis_cache(options.use_cache) as cache, local_repository(repo_url) as repo_path:
+        stats = collect_repository_stats(repo_path, cache, repository_id(repo_url))
+
+    if is_ndjson(options):
+        write_record({
+            "kind": "repository",
+            "total_commits": stats.total_commits,
+            "total_files": len(stats.total_files),
+            "total_authors": len(stats.total_authors),
+            "total_branches": len(stats.total_branches),
+            "authors_commit_number": stats.authors_commit_number,
+        })
+        return
+
+    console.print(f"[bold green]Total de Commits:[/bold green] {stats.total_commits}")
+    console.print(f"[bold green]Total de Arquivos Modificados:[/bold green] {len(stats.total_files)}")
+    console.print(f"[bold green]Total de Autores:[/bold green] {len(stats.total_authors)}")
+    console.print(f"[bold green]Total de Branches:[/bold green] {len(stats.total_branches)}")
     console.print("\n[bold underline cyan]→ Número de commits por autor:[/bold underline cyan]")
     table_authors = Table(show_header=True, header_style="bold magenta")
     table_authors.add_column("Autor", style="yellow")
     table_authors.add_column("Número de Commits", style="green")
-    for author, count in authors_commit_number.items():
+    for author, count in stats.authors_commit_number.items():
         table_authors.add_row(author, str(count))
     console.print(table_authors)
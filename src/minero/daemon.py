@@ -0,0 +1,304 @@
+from __future__ import annotations
+
+from contextlib import ExitStack, contextmanager, redirect_stderr, redirect_stdout, suppress
+from pathlib import Path
+from typing import IO, Any, Dict, Iterator, List, Optional
+import json
+import os
+import signal
+import socket
+import sys
+import traceback
+
+# Este módulo é também o ponto de entrada do comando `minero`: só importa a
+# biblioteca padrão, para que o cliente encaminhe o comando ao servidor sem
+# pagar a importação do typer, do PyDriller ou do Rich.
+
+def _cache_dir() -> Path:
+    # a mesma regra de cache.default_cache_dir, sem importar o sqlite3 no cliente
+    if os.environ.get("MINERO_CACHE_DIR"):
+        return Path(os.environ["MINERO_CACHE_DIR"])
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "minero"
+
+def socket_path() -> Path:
+    """
+    Socket Unix do servidor: $MINERO_SOCKET, ou serve.sock no diretório do
+    cache ($MINERO_CACHE_DIR, $XDG_CACHE_HOME/minero ou ~/.cache/minero).
+    """
+    if os.environ.get("MINERO_SOCKET"):
+        return Path(os.environ["MINERO_SOCKET"])
+    return _cache_dir() / "serve.sock"
+
+# variáveis de ambiente do cliente que mudam a saída (cores e largura do Rich,
+# do click e do typer) e as do próprio minero, aplicadas durante o comando
+TERMINAL_VARIABLES = ("COLUMNS", "LINES", "NO_COLOR", "FORCE_COLOR", "TERM", "COLORTERM", "TTY_COMPATIBLE", "TTY_INTERACTIVE")
+
+def _terminal_environment() -> Dict[str, str]:
+    return {name: value for name, value in os.environ.items() if name in TERMINAL_VARIABLES or name.startswith("MINERO_")}
+
+def _terminal_size() -> os.terminal_size:
+    # mesma ordem do Rich: o primeiro de stdin, stdout e stderr que for um terminal
+    for fd in (0, 1, 2):
+        with suppress(OSError):
+            return os.get_terminal_size(fd)
+    return os.terminal_size((80, 25))
+
+def _stream_isatty(stream: Optional[IO[str]]) -> bool:
+    with suppress(AttributeError, ValueError):
+        return stream.isatty()
+    return False
+
+def _send(stream: IO[bytes], message: Dict[str, Any]) -> None:
+    stream.write(json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n")
+    stream.flush()
+
+class _SocketStream:
+    """
+    Arquivo de texto que repassa cada escrita ao cliente como uma mensagem
+    {"stdout"|"stderr": texto}. isatty() responde pelo arquivo do cliente.
+    """
+
+    def __init__(self, stream: IO[bytes], name: str, tty: bool = False):
+        self._stream = stream
+        self._name = name
+        self._tty = tty
+
+    def write(self, text: str) -> int:
+        if not isinstance(text, str):
+            # o click testa write(b"") para saber se o arquivo é binário
+            raise TypeError("_SocketStream só aceita texto")
+        if text:
+            _send(self._stream, {self._name: text})
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+    def isatty(self) -> bool:
+        return self._tty
+
+    @property
+    def encoding(self) -> str:
+        return "utf-8"
+
+def forward(argv: List[str], path: Optional[Path] = None) -> Optional[int]:
+    """
+    Envia o comando ao servidor (`minero serve`), se houver um em execução,
+    e repassa a saída dele para este processo à medida que é produzida.
+
+    Args:
+        argv: argumentos do comando, sem o nome do programa.
+        path: socket do servidor (padrão: socket_path()).
+    Returns:
+        O código de saída do comando, ou None se não há servidor (o comando
+        deve então rodar localmente).
+    """
+    if os.environ.get("MINERO_NO_DAEMON") or (argv and argv[0] == "serve"):
+        return None
+    path = path or socket_path()
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(str(path))
+    except OSError:
+        client.close()
+        return None
+
+    with client, client.makefile("rwb") as stream:
+        size = _terminal_size()
+        _send(stream, {
+            "argv": argv,
+            "cwd": os.getcwd(),
+            "terminal": {"stdout": _stream_isatty(sys.stdout), "stderr": _stream_isatty(sys.stderr),
+                         "columns": size.columns, "lines": size.lines},
+            # o diretório do cache do cliente, mesmo que venha de $XDG_CACHE_HOME ou do
+            # HOME: o comando usa um só diretório para os espelhos e para o cache de análises
+            "env": dict(_terminal_environment(), MINERO_CACHE_DIR=str(_cache_dir())),
+        })
+        try:
+            for line in stream:
+                message = json.loads(line)
+                if "exit" in message:
+                    return message["exit"]
+                for name, output in (("stdout", sys.stdout), ("stderr", sys.stderr)):
+                    if name in message:
+                        output.write(message[name])
+                        output.flush()
+        except BrokenPipeError:
+            # quem lia a saída fechou o pipe (ex.: `minero commits . | head -1`):
+            # sai em silêncio, e o fechamento da conexão interrompe o comando no servidor
+            _silence_stdout()
+            return 1
+    print("minero: o servidor encerrou a conexão antes do fim do comando.", file=sys.stderr)
+    return 1
+
+def _silence_stdout() -> None:
+    # sem isso, o flush do stdout na saída do interpretador mostraria outro BrokenPipeError
+    with suppress(OSError, ValueError):
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+
+def run_command(argv: List[str]) -> int:
+    """Executa um comando do minero neste processo e devolve o código de saída."""
+    from .main import app
+
+    try:
+        app(args=argv, prog_name="minero")
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        print(e.code, file=sys.stderr)
+        return 1
+    except Exception:
+        traceback.print_exc()
+        return 1
+    return 0
+
+@contextmanager
+def _client_environment(env: Dict[str, str]) -> Iterator[None]:
+    """Troca, durante o bloco, as variáveis de terminal e do minero pelas do cliente."""
+    names = set(env) | set(_terminal_environment())
+    previous = {name: os.environ.get(name) for name in names}
+    try:
+        for name in names:
+            if name in env:
+                os.environ[name] = env[name]
+            else:
+                os.environ.pop(name, None)
+        yield
+    finally:
+        for name, value in previous.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+@contextmanager
+def _client_consoles(terminal: Dict[str, Any]) -> Iterator[None]:
+    """
+    Recria, durante o bloco, os consoles do Rich dos módulos do minero (criados
+    uma vez na importação, com o terminal do servidor): com o stdout já
+    redirecionado e o ambiente do cliente aplicado, eles detectam as cores
+    do cliente, e a largura vem do terminal dele (ou de $COLUMNS).
+    """
+    from rich.console import Console
+
+    package = __name__.rpartition(".")[0] + "."
+    replaced = []
+    for name, module in list(sys.modules.items()):
+        console = getattr(module, "console", None) if name.startswith(package) else None
+        if isinstance(console, Console):
+            replaced.append((module, console))
+    width = None if "COLUMNS" in os.environ else terminal.get("columns")
+    height = None if "LINES" in os.environ else terminal.get("lines")
+    try:
+        for module, console in replaced:
+            module.console = Console(stderr=console.stderr, width=width, height=height)
+        yield
+    finally:
+        for module, console in replaced:
+            module.console = console
+
+def handle_request(stream: IO[bytes]) -> None:
+    """
+    Atende uma conexão: lê o pedido {"argv": [...], "cwd": ..., "terminal":
+    {...}, "env": {...}}, executa o comando com stdout e stderr enviados ao
+    cliente, como se escrevesse no terminal dele, e termina com {"exit": código}.
+    """
+    from .repository import forget_mirror_updates
+
+    request = json.loads(stream.readline())
+    terminal = request.get("terminal", {})
+    previous_cwd = os.getcwd()
+    # cada comando busca as novidades dos espelhos, como uma execução isolada faria
+    forget_mirror_updates()
+    try:
+        os.chdir(request["cwd"])
+        with redirect_stdout(_SocketStream(stream, "stdout", terminal.get("stdout", False))), \
+             redirect_stderr(_SocketStream(stream, "stderr", terminal.get("stderr", False))), \
+             _client_environment(request.get("env", {})), _client_consoles(terminal):
+            code = run_command(request["argv"])
+        _send(stream, {"exit": code})
+    finally:
+        os.chdir(previous_cwd)
+
+def server_running(path: Path) -> bool:
+    """Diz se há um servidor aceitando conexões no socket."""
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(str(path))
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+def serve(path: Optional[Path] = None) -> None:
+    """
+    Mantém o minero carregado e atende os comandos enviados pelo cliente
+    (ver forward) por um socket Unix, um de cada vez. Entre os comandos
+    continuam aquecidos: os módulos importados, a conexão com o cache de
+    análises, os pools de processos (um por valor de -j), os repositórios
+    abertos pelo PyDriller e os espelhos dos repositórios remotos.
+
+    Args:
+        path: socket onde escutar (padrão: socket_path()).
+    """
+    from rich.console import Console
+
+    from .cache import keep_analysis_cache
+    from .parallel import keep_worker_pools
+    from .repository import keep_git_repositories
+
+    console = Console()
+    path = path or socket_path()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if server_running(path):
+        raise RuntimeError(f"Já existe um servidor do minero em {path}.")
+    if path.exists():
+        # socket de um servidor que terminou sem removê-lo
+        path.unlink()
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    with ExitStack() as stack:
+        stack.enter_context(server)
+        # criado já sem permissão para o grupo e os outros: com o umask padrão,
+        # outros usuários poderiam conectar entre o bind e o chmod
+        previous_umask = os.umask(0o077)
+        try:
+            server.bind(str(path))
+        finally:
+            os.umask(previous_umask)
+        stack.callback(path.unlink)
+        os.chmod(path, 0o600)
+        stack.enter_context(keep_analysis_cache())
+        stack.enter_context(keep_worker_pools())
+        stack.enter_context(keep_git_repositories())
+        # kill (SIGTERM) encerra como Ctrl+C, removendo o socket e os processos do pool
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+        console.print(f"Servidor do minero escutando em [yellow]{path}[/yellow] (Ctrl+C para encerrar).")
+        try:
+            server.listen()
+            while True:
+                connection, _ = server.accept()
+                with connection:
+                    stream = connection.makefile("rwb")
+                    try:
+                        handle_request(stream)
+                    except (OSError, ValueError):
+                        # cliente interrompido (ex.: Ctrl+C) ou pedido inválido: segue para o próximo
+                        pass
+                    finally:
+                        # com o cliente já desconectado, o flush do fechamento falharia
+                        # e esconderia um Ctrl+C recebido no meio do envio
+                        with suppress(OSError):
+                            stream.close()
+        except KeyboardInterrupt:
+            console.print("Servidor encerrado.")
+
+def main() -> None:
+    """Ponto de entrada do comando `minero`: usa o servidor, se houver, ou roda o comando localmente."""
+    code = forward(sys.argv[1:])
+    if code is not None:
+        sys.exit(code)
+    from .main import app
+    app(prog_name="minero")
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+import ast
+
+from rich.console import Console
+from rich.table import Table
+
+from .cognitive_analysis import CognitiveComplexityVisitor, FunctionComplexity
+from .param_analysis import count_function_params
+from .ndjson_output import is_ndjson, write_record
+from .options import AnalysisOptions
+from .parallel import batch_size
+
+console = Console()
+
+FUNCTION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef)
+SCOPE_NODES = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+# nós que podem conter instruções: as próprias instruções, os except e os case do match
+STATEMENT_NODES = (ast.stmt, ast.excepthandler) + ((ast.match_case,) if hasattr(ast, "match_case") else ())
+
+@dataclass
+class FunctionDelta:
+    """
+    Métricas de uma função tocada por um commit, antes e depois dele.
+    `before` é None para funções novas e `after` para funções removidas.
+    """
+    file_path: str
+    function_name: str
+    before: Optional[FunctionComplexity]
+    after: Optional[FunctionComplexity]
+
+    def values(self, metric: str) -> Tuple[Optional[int], Optional[int]]:
+        """Valores (antes, depois) de uma métrica: "complexity", "loc" ou "param_count"."""
+        return _metric(self.before, metric), _metric(self.after, metric)
+
+    def delta(self, metric: str) -> int:
+        before, after = self.values(metric)
+        return (after or 0) - (before or 0)
+
+def _metric(function: Optional[FunctionComplexity], metric: str) -> Optional[int]:
+    if function is None:
+        return None
+    if metric == "loc":
+        return function.end_lineno - function.lineno + 1
+    return getattr(function, metric)
+
+def index_functions(tree: ast.AST) -> Dict[str, ast.AST]:
+    """Funções da árvore pelo nome qualificado (ex.: "Classe.metodo", "externa.interna")."""
+    functions: Dict[str, ast.AST] = {}
+    stack = [(tree, "")]
+    while stack:
+        node, prefix = stack.pop()
+        for child in ast.iter_child_nodes(node):
+            if not isinstance(child, STATEMENT_NODES):
+                # definições só aparecem como instruções: expressões não precisam ser percorridas
+                continue
+            if isinstance(child, SCOPE_NODES):
+                name = f"{prefix}{child.name}"
+                if isinstance(child, FUNCTION_NODES):
+                    functions[name] = child
+                stack.append((child, f"{name}."))
+            else:
+                stack.append((child, prefix))
+    return functions
+
+def _touches(node: ast.AST, lines: Sequence[int]) -> bool:
+    """Diz se alguma das linhas (ordenadas) cai dentro da função, incluindo decoradores."""
+    start = min([node.lineno] + [d.lineno for d in node.decorator_list])
+    index = bisect_left(lines, start)
+    return index < len(lines) and lines[index] <= node.end_lineno
+
+def measure_function(node: ast.AST, name: str, filename: str, complexity: Optional[int] = None) -> FunctionComplexity:
+    """Métricas de uma função; a complexidade é calculada aqui se não for informada (ver function_complexities)."""
+    if complexity is None:
+        visitor = CognitiveComplexityVisitor()
+        visitor.visit(node)
+        complexity = visitor.complexity
+    return FunctionComplexity(
+        file_path=filename,
+        function_name=name,
+        complexity=complexity,
+        lineno=node.lineno,
+        end_lineno=node.end_lineno,
+        param_count=count_function_params(node),
+    )
+
+def analyze_changes(source_before: Optional[str], source_after: Optional[str], filename: str,
+                    deleted_lines: Sequence[int], added_lines: Sequence[int]) -> List[FunctionDelta]:
+    """
+    Analisa apenas as funções cujas linhas foram tocadas pelo diff, nas duas
+    versões do arquivo.
+
+    Uma função é tocada se alguma linha removida cai no seu intervalo na
+    versão anterior ou alguma linha adicionada cai no seu intervalo na
+    versão nova. As funções são casadas entre as versões pelo nome
+    qualificado, e as métricas (complexidade cognitiva, LOC e parâmetros)
+    são calculadas somente para as funções tocadas.
+
+    Args:
+        source_before: código antes do commit (None se o arquivo foi criado).
+        source_after: código depois do commit (None se o arquivo foi removido).
+        filename: nome do arquivo analisado.
+        deleted_lines: linhas removidas, numeradas na versão anterior.
+        added_lines: linhas adicionadas, numeradas na versão nova.
+    Returns:
+        Uma lista de FunctionDelta, na ordem em que as funções aparecem.
+
+    Raises:
+        SyntaxError: se alguma das versões não puder ser parseada.
+    """
+    before = index_functions(ast.parse(source_before)) if source_before else {}
+    after = index_functions(ast.parse(source_after)) if source_after else {}
+    deleted_lines = sorted(deleted_lines)
+    added_lines = sorted(added_lines)
+
+    touched = [name for name, node in after.items() if _touches(node, added_lines)]
+    touched += [name for name, node in before.items() if _touches(node, deleted_lines) and name not in touched]
+
+    deltas = [
+        FunctionDelta(
+            file_path=filename,
+            function_name=name,
+            before=measure_function(before[name], name, filename) if name in before else None,
+            after=measure_function(after[name], name, filename) if name in after else None,
+        )
+        for name in touched
+    ]
+    deltas.sort(key=lambda d: (d.after or d.before).lineno)
+    return deltas
+
+def _safe_analyze_changes(*args: Any) -> Any:
+    try:
+        return analyze_changes(*args)
+    except (SyntaxError, ValueError) as e:
+        return e
+
+def _changes_arguments(modified_file: Any) -> tuple:
+    diff = modified_file.diff_parsed
+    return (
+        modified_file.source_code_before,
+        modified_file.source_code,
+        modified_file.filename,
+        [line for line, _ in diff["deleted"]],
+        [line for line, _ in diff["added"]],
+    )
+
+def iter_file_deltas(files: Sequence[Any], pool=None) -> Iterator[Tuple[Any, Any]]:
+    """
+    Executa analyze_changes em cada arquivo modificado, em lotes no pool
+    quando houver.
+
+    Returns:
+        Um gerador de tuplas (arquivo, lista de FunctionDelta ou a exceção de parse).
+    """
+    if pool is None:
+        for modified_file in files:
+            yield modified_file, _safe_analyze_changes(*_changes_arguments(modified_file))
+        return
+
+    size = batch_size(pool)
+    for start in range(0, len(files), size):
+        batch = files[start:start + size]
+        arguments = [_changes_arguments(modified_file) for modified_file in batch]
+        yield from zip(batch, pool.map(_safe_analyze_changes, *zip(*arguments)))
+
+def _format_change(delta: FunctionDelta, metric: str) -> str:
+    before, after = delta.values(metric)
+    change = delta.delta(metric)
+    color = "red" if change > 0 else "green" if change < 0 else "white"
+    before_text = "-" if before is None else str(before)
+    after_text = "-" if after is None else str(after)
+    return f"{before_text} → {after_text} ([{color}]{change:+d}[/{color}])"
+
+def report_function_deltas(commits, pool, options: Optional[AnalysisOptions] = None) -> None:
+    """
+    Mostra, commit a commit, as funções tocadas em cada arquivo .py com os
+    valores antes, depois e a variação de complexidade, LOC e parâmetros.
+    """
+    ndjson = is_ndjson(options)
+    for commit in commits:
+        python_files = [mf for mf in commit.modified_files if mf.filename.endswith(".py")]
+
+        if not ndjson:
+            console.print(f"[bold green]Commit:[/bold green] {commit.hash}")
+            table = Table(show_header=True, header_style="bold magenta")
+            table.add_column("Arquivo", overflow="fold")
+            table.add_column("Função")
+            table.add_column("Complexidade")
+            table.add_column("LOC")
+            table.add_column("Parâmetros")
+
+        for modified_file, deltas in iter_file_deltas(python_files, pool):
+            if isinstance(deltas, Exception):
+                if ndjson:
+                    write_record({"kind": "parse_error", "commit_hash": commit.hash,
+                                  "file_path": modified_file.filename, "error": str(deltas)})
+                else:
+                    console.print(f"[red]Erro ao parsear {modified_file.filename}: {deltas}[/red]")
+                continue
+            for delta in deltas:
+                if ndjson:
+                    write_record(_delta_record(commit.hash, delta))
+                else:
+                    table.add_row(delta.file_path, delta.function_name, _format_change(delta, "complexity"),
+                                  _format_change(delta, "loc"), _format_change(delta, "param_count"))
+
+        if not ndjson:
+            if table.row_count:
+                console.print(table)
+            else:
+                console.print("Nenhuma função Python alterada neste commit.")
+
+def _delta_record(commit_hash: str, delta: FunctionDelta) -> Dict[str, Any]:
+    function = delta.after or delta.before
+    record = {
+        "kind": "function_delta",
+        "commit_hash": commit_hash,
+        "file_path": delta.file_path,
+        "function_name": delta.function_name,
+        "start_line": function.lineno,
+        "end_line": function.end_lineno,
+    }
+    for metric in ("complexity", "loc", "param_count"):
+        before, after = delta.values(metric)
+        record[f"{metric}_before"] = before
+        record[f"{metric}_after"] = after
+        record[f"{metric}_delta"] = delta.delta(metric)
+    return record
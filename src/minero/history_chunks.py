@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+from concurrent.futures import Executor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import os
+
+from pydriller import Git
+
+from .cache import AnalysisCache, MISS, lookup
+from .parallel import pool_size
+from .repository import repository_lock
+
+# trechos por processo: mais de um por processo equilibra a carga quando
+# alguns trechos do histórico têm commits bem maiores que outros
+CHUNKS_PER_WORKER = 4
+
+@dataclass
+class AnalyzedCommit:
+    """
+    Commit já percorrido e analisado em um processo do pool.
+
+    Attributes:
+        hash: hash do commit.
+        msg: mensagem do commit.
+        results: tuplas (nome do arquivo, resultado do analisador) dos arquivos .py modificados, na ordem do commit.
+    """
+    hash: str
+    msg: str
+    results: List[Tuple[str, Any]]
+
+# repositório aberto por cada processo do pool, reaproveitado entre os trechos,
+# pelo caminho absoluto: os processos mantidos pelo `minero serve` continuam
+# no diretório de trabalho em que foram criados
+_worker_repositories: Dict[str, Git] = {}
+
+def _worker_repository(repo_path: str) -> Git:
+    git = _worker_repositories.get(repo_path)
+    if git is None:
+        # o Git do PyDriller grava no .git/config ao abrir o repositório, e a
+        # trava do GitPython falha (em vez de esperar) se outro processo a segura
+        with repository_lock(repo_path):
+            git = _worker_repositories[repo_path] = Git(repo_path)
+    return git
+
+def split_in_chunks(items: List[Any], chunks: int) -> List[List[Any]]:
+    """Divide a lista em até `chunks` trechos contíguos, de tamanhos que diferem em no máximo 1."""
+    chunks = max(1, min(chunks, len(items)))
+    size, extra = divmod(len(items), chunks)
+    result = []
+    start = 0
+    for index in range(chunks):
+        end = start + size + (1 if index < extra else 0)
+        result.append(items[start:end])
+        start = end
+    return [chunk for chunk in result if chunk]
+
+def _analyze_chunk(repo_path: str, hashes: List[str], analyzer: Callable, args: tuple,
+                   cache_path: Optional[str], skip_empty: bool) -> Tuple[List[AnalyzedCommit], List[Tuple[str, Any]]]:
+    """
+    Executado em um processo do pool: percorre um trecho do histórico com
+    o próprio repositório (diff e leitura dos arquivos incluídos) e analisa
+    os arquivos .py de cada commit.
+
+    O cache só é lido aqui; os resultados novos voltam junto com os commits
+    e são gravados pelo processo principal, o único que escreve no banco.
+
+    Returns:
+        Uma tupla (commits analisados, novas entradas (chave, resultado) para o cache).
+    """
+    git = _worker_repository(repo_path)
+    cache = AnalysisCache(cache_path) if cache_path else None
+    analyzed: List[AnalyzedCommit] = []
+    new_entries: List[Tuple[str, Any]] = []
+    try:
+        for commit_hash in hashes:
+            commit = git.get_commit(commit_hash)
+            results = []
+            for modified_file in commit.modified_files:
+                if not modified_file.filename.endswith(".py"):
+                    continue
+                key, result = lookup(modified_file, analyzer, args, cache, skip_empty)
+                if result is MISS:
+                    source_code = modified_file.source_code
+                    result = None if skip_empty and not source_code else analyzer(source_code, modified_file.filename, *args)
+                    if key is not None:
+                        new_entries.append((key, result))
+                results.append((modified_file.filename, result))
+            analyzed.append(AnalyzedCommit(commit.hash, commit.msg, results))
+    finally:
+        # encerra os processos `git cat-file` do GitPython até o próximo trecho
+        git.clear()
+        if cache is not None:
+            cache.close()
+    return analyzed, new_entries
+
+def iter_history_chunks(repo_path: str, commit_hashes: Iterable[str], analyzer: Callable, *args: Any,
+                        cache: Optional[AnalysisCache] = None, pool: Executor,
+                        skip_empty: bool = False) -> Iterator[AnalyzedCommit]:
+    """
+    Analisa um histórico longo em paralelo: os commits são divididos em
+    trechos contíguos e cada trecho é percorrido por um processo do pool,
+    com o seu próprio repositório. Assim o diff de cada commit, que o
+    PyDriller calcula em série em um único traverse_commits(), também é
+    distribuído, e não só o parse e a análise dos arquivos.
+
+    Os commits voltam na mesma ordem de `commit_hashes`, qualquer que seja
+    o número de processos.
+
+    Args:
+        repo_path: caminho local do repositório (o espelho, para repositórios remotos).
+        commit_hashes: hashes dos commits, na ordem em que devem ser entregues.
+        analyzer: função de análise por arquivo, definida no nível do módulo.
+        args: parâmetros extras do analisador.
+        cache: cache a ser usado, ou None.
+        pool: pool criado por worker_pool.
+        skip_empty: se True, arquivos sem conteúdo recebem resultado None.
+    Returns:
+        Um gerador de AnalyzedCommit.
+    """
+    # caminhos relativos (ex.: ".") seriam resolvidos no diretório dos processos do pool
+    repo_path = os.path.realpath(repo_path)
+    chunks = split_in_chunks(list(commit_hashes), CHUNKS_PER_WORKER * pool_size(pool))
+    cache_path = str(cache.path) if cache is not None else None
+    computed = pool.map(
+        _analyze_chunk,
+        [repo_path] * len(chunks),
+        chunks,
+        [analyzer] * len(chunks),
+        [args] * len(chunks),
+        [cache_path] * len(chunks),
+        [skip_empty] * len(chunks),
+    )
+    for analyzed, new_entries in computed:
+        for key, result in new_entries:
+            cache.put(key, result)
+        yield from analyzed
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+import re
+
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
+from .cache import AnalysisCache, analysis_cache
+from .cognitive_analysis import safe_analyze_functions
+from .ndjson_output import is_ndjson, write_record
+from .options import AnalysisOptions
+from .parallel import iter_analyze_files, worker_pool
+from .repository import RECORD_SEPARATOR, git_lines, local_repository, repository_id
+from .repository_stats import head_commit, incremental_checkpoint
+from .snapshot import BlobReader, SnapshotFile, tree_files
+from .top_k import TopK
+
+console = Console()
+
+# deve ser incrementada sempre que o formato de FileChurn mudar,
+# descartando os checkpoints já guardados
+HOTSPOTS_VERSION = "1"
+
+# arquivos mais alterados que têm a complexidade calculada, e hotspots mostrados, se nada for informado
+CANDIDATES = 50
+TOP_HOTSPOTS = 20
+
+# renomeação no --numstat: "dir/{antigo => novo}/arquivo.py" ou "antigo.py => novo.py"
+_BRACE_RENAME = re.compile(r"^(.*)\{(.*) => (.*)\}(.*)$")
+
+@dataclass(slots=True)
+class FileChurn:
+    """Linhas alteradas (adicionadas + removidas) e commits que tocaram um arquivo."""
+    lines: int = 0
+    commits: int = 0
+
+@dataclass(slots=True)
+class Hotspot:
+    """
+    Um arquivo muito alterado e complexo.
+
+    Attributes:
+        file_path: caminho do arquivo em HEAD.
+        churn: linhas alteradas ao longo do histórico (adicionadas + removidas).
+        commits: commits que alteraram o arquivo.
+        complexity: soma da complexidade cognitiva das funções em HEAD.
+        functions: quantidade de funções em HEAD.
+        max_complexity: maior complexidade de uma função do arquivo.
+    """
+    file_path: str
+    churn: int
+    commits: int
+    complexity: int
+    functions: int
+    max_complexity: int
+
+    @property
+    def score(self) -> int:
+        """Churn × complexidade: a ordem em que os arquivos são mostrados."""
+        return self.churn * self.complexity
+
+def split_rename(path: str) -> Tuple[Optional[str], str]:
+    """
+    Separa o caminho de uma linha do `git log --numstat -M`.
+
+    Returns:
+        Uma tupla (caminho antigo, caminho novo); o antigo é None se o arquivo não foi renomeado.
+    """
+    match = _BRACE_RENAME.match(path)
+    if match:
+        prefix, old, new, suffix = match.groups()
+        # "{ => sub}/a.py" deixa uma barra sobrando de um dos lados
+        return (prefix + old + suffix).replace("//", "/").lstrip("/"), (prefix + new + suffix).replace("//", "/").lstrip("/")
+    if " => " in path:
+        old, new = path.split(" => ", 1)
+        return old, new
+    return None, path
+
+def collect_churn(repo_path: str, rev: str, suffix: str = ".py") -> Tuple[Dict[str, FileChurn], Dict[str, str]]:
+    """
+    Conta as linhas alteradas de cada arquivo em uma única passada pelo
+    `git log --numstat`, à medida que a saída chega, sem montar nenhum
+    commit do PyDriller e sem gerar o diff textual.
+
+    O log é lido do mais novo para o mais antigo: ao encontrar uma
+    renomeação, os commits mais antigos do nome anterior passam a contar
+    para o nome atual. Arquivos binários e commits de merge não contam,
+    como em modified_files do PyDriller.
+
+    Args:
+        repo_path: caminho local do repositório.
+        rev: revisão ou intervalo de revisões (ex.: "HEAD", "abc..HEAD").
+        suffix: só arquivos cujo nome atual termina com ele são contados.
+    Returns:
+        Uma tupla (churn por caminho atual, nomes antigos -> nome atual).
+    """
+    churn: Dict[str, FileChurn] = {}
+    renamed: Dict[str, str] = {}
+    for line in git_lines(repo_path, "log", "-M", "--numstat", f"--format={RECORD_SEPARATOR}%H", rev, "--"):
+        if not line or line.startswith(RECORD_SEPARATOR):
+            continue
+        added, deleted, path = line.split("\t", 2)
+        old, new = split_rename(path)
+        current = renamed.get(new, new)
+        if old is not None:
+            renamed[old] = current
+        if added == "-" or not current.endswith(suffix):
+            continue
+        entry = churn.get(current)
+        if entry is None:
+            entry = churn[current] = FileChurn()
+        entry.lines += int(added) + int(deleted)
+        entry.commits += 1
+    return churn, renamed
+
+def merge_churn(newer: Dict[str, FileChurn], renamed: Dict[str, str], older: Dict[str, FileChurn],
+                suffix: str = ".py") -> Dict[str, FileChurn]:
+    """Soma ao churn dos commits novos o churn já guardado, seguindo as renomeações feitas nos commits novos."""
+    for path, entry in older.items():
+        current = renamed.get(path, path)
+        if not current.endswith(suffix):
+            continue
+        target = newer.get(current)
+        if target is None:
+            target = newer[current] = FileChurn()
+        target.lines += entry.lines
+        target.commits += entry.commits
+    return newer
+
+def history_churn(repo_path: str, head: str, cache: Optional[AnalysisCache] = None,
+                  repo_key: Optional[str] = None) -> Dict[str, FileChurn]:
+    """Churn de cada arquivo .py do histórico de HEAD, incremental com cache (ver incremental_checkpoint)."""
+    return incremental_checkpoint(
+        cache, f"hotspots|{HOTSPOTS_VERSION}|{repo_key or repo_path}", repo_path, head,
+        lambda rev: collect_churn(repo_path, rev)[0],
+        lambda churn, rev: merge_churn(*collect_churn(repo_path, rev), churn),
+    )
+
+def rank_hotspots(repo_path: str, head: str, churn: Dict[str, FileChurn], candidates: int = CANDIDATES,
+                  top: Optional[int] = TOP_HOTSPOTS, cache: Optional[AnalysisCache] = None, pool=None) -> List[Hotspot]:
+    """
+    Calcula a complexidade só dos `candidates` arquivos mais alterados que
+    ainda existem em HEAD, lidos direto do banco de objetos, e ordena esses
+    arquivos por churn × complexidade.
+
+    Returns:
+        Os `top` maiores hotspots (todos, com top None), do maior para o menor.
+    """
+    blobs = dict(tree_files(repo_path, head))
+    most_changed: TopK[Tuple[str, FileChurn]] = TopK(candidates, key=lambda item: item[1].lines)
+    for path, entry in churn.items():
+        if path in blobs:
+            most_changed.push((path, entry))
+
+    ranking: TopK[Hotspot] = TopK(top, key=lambda hotspot: hotspot.score)
+    reader = BlobReader(repo_path)
+    try:
+        selected = most_changed.items()
+        files = [SnapshotFile(path, blobs[path], reader) for path, _ in selected]
+        results = iter_analyze_files(files, safe_analyze_functions, cache=cache, pool=pool, skip_empty=True)
+        for (path, entry), (_, functions) in zip(selected, results):
+            if isinstance(functions, Exception):
+                # arquivo que não parseia: entra no ranking só pelo churn
+                functions = ()
+            complexities = [function.complexity for function in functions or ()]
+            ranking.push(Hotspot(path, entry.lines, entry.commits, sum(complexities), len(complexities), max(complexities, default=0)))
+    finally:
+        reader.close()
+    return ranking.items()
+
+def show_hotspots(repo_url: str, candidates: int = CANDIDATES, options: Optional[AnalysisOptions] = None) -> None:
+    """
+    Mostra os arquivos que mais mudam e são mais complexos: o churn vem de
+    uma única passada pelo log e a complexidade cognitiva só é calculada
+    na versão atual (HEAD) dos arquivos mais alterados.
+
+    Args:
+        repo_url: O caminho (ou URL) do repositorio.
+        candidates: quantos dos arquivos mais alterados têm a complexidade calculada.
+        options: opções de execução (cache, paralelismo, --top e formato de saída).
+    """
+    options = options or AnalysisOptions()
+    top = options.top or TOP_HOTSPOTS
+    ndjson = is_ndjson(options)
+    if not ndjson:
+        console.print(Panel.fit(f"Hotspots (churn × complexidade) do repositório: {repo_url}", style="blue"))
+
+    with analysis_cache(options.use_cache) as cache, worker_pool(options.jobs) as pool, \
+            local_repository(repo_url) as repo_path:
+        head = head_commit(repo_path)
+        if head is None:
+            churn, hotspots = {}, []
+        else:
+            churn = history_churn(repo_path, head, cache, repository_id(repo_url))
+            hotspots = rank_hotspots(repo_path, head, churn, candidates, top, cache, pool)
+
+    if ndjson:
+        for hotspot in hotspots:
+            write_record({
+                "kind": "hotspot",
+                "file_path": hotspot.file_path,
+                "churn": hotspot.churn,
+                "commits": hotspot.commits,
+                "complexity": hotspot.complexity,
+                "functions": hotspot.functions,
+                "max_complexity": hotspot.max_complexity,
+                "score": hotspot.score,
+            })
+        return
+
+    if not hotspots:
+        console.print("Nenhum arquivo Python alterado no histórico.")
+        return
+
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Arquivo", overflow="fold")
+    table.add_column("Churn (linhas)", justify="right")
+    table.add_column("Commits", justify="right")
+    table.add_column("Complexidade", justify="right")
+    table.add_column("Funções", justify="right")
+    table.add_column("Máxima", justify="right")
+    table.add_column("Churn × complexidade", justify="right")
+
+    for hotspot in hotspots:
+        table.add_row(hotspot.file_path, str(hotspot.churn), str(hotspot.commits), str(hotspot.complexity),
+                      str(hotspot.functions), str(hotspot.max_complexity), str(hotspot.score))
+    console.print(f"{len(churn)} arquivos .py alterados no histórico; complexidade calculada para até {candidates} dos mais alterados.")
+    console.print(table)
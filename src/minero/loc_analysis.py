@@ -1,46 +1,73 @@
-from pydriller.metrics.process.lines_count import LinesCount
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 
-from pydriller import Repository
-
 import ast
-from typing import List, Dict
+from typing import List, Optional
+
+from .cache import analysis_cache
+from .parallel import iter_analyze_files, worker_pool
+from .options import AnalysisOptions
+from .commit_selection import describe_selection, select_commits
+from .delta_analysis import report_function_deltas
+from .ndjson_output import is_ndjson, write_record
+from .records import LongFunctionRecord
 
 console = Console()
 
-def check_function_exceed_limit_size(repo_url, commit_hash):
+def check_function_exceed_limit_size(repo_url, commit_hash, options: Optional[AnalysisOptions] = None):
     """
     Analisa os arquivos python de um commit de um repositório
     e verifica se alguma função tem mais de 200 linhas.
 
     Args:
         repo_url: O caminho para o repositorio.
-        commit_hash: Hash do commit a ser analisado.
+        commit_hash: Hash do commit a ser analisado (ou None para usar --from/--to ou --last).
+        options: opções de execução (cache, paralelismo, intervalo de commits, etc.).
     """
-    console.print(Panel.fit(
-        f"[bold cyan] Analisando evolução de LOC[/bold cyan]\n"
-        f"Repositório: [yellow]{repo_url}[/yellow]\n"
-        f"Commit: [green]{commit_hash}[/green]",
-        style="blue"
-    ))
+    options = options or AnalysisOptions()
 
-    commits = Repository(repo_url, single=commit_hash).traverse_commits()
+    if not is_ndjson(options):
+        console.print(Panel.fit(
+            f"[bold cyan] Analisando evolução de LOC[/bold cyan]\n"
+            f"Repositório: [yellow]{repo_url}[/yellow]\n"
+            f"Commit: [green]{describe_selection(commit_hash, options)}[/green]",
+            style="blue"
+        ))
+
+    commits = select_commits(repo_url, commit_hash, options)
     
+    if options.changed_only:
+        # o resultado depende das duas versões do arquivo e do diff: não passa pelo cache
+        with worker_pool(options.jobs) as pool:
+            report_function_deltas(commits, pool, options)
+        return
+
+    with analysis_cache(options.use_cache) as cache, worker_pool(options.jobs) as pool:
+        if is_ndjson(options):
+            _write_long_functions(commits, cache, pool)
+        else:
+            _report_long_functions(commits, cache, pool)
+
+def _write_long_functions(commits, cache, pool):
+    """Um registro NDJSON por função que excede 200 linhas."""
     for commit in commits:
-        for modified_file in commit.modified_files:
+        python_files = [mf for mf in commit.modified_files if mf.filename.endswith('.py')]
+
+        for _, long_functions in iter_analyze_files(python_files, check_function_sizes, cache=cache, pool=pool):
+            for func in long_functions:
+                write_record({"kind": "function", "commit_hash": commit.hash, **func})
 
-            if not modified_file.filename.endswith('.py'):
-                continue
+def _report_long_functions(commits, cache, pool):
+    for commit in commits:
+        python_files = [mf for mf in commit.modified_files if mf.filename.endswith('.py')]
 
+        for modified_file, long_functions in iter_analyze_files(python_files, check_function_sizes, cache=cache, pool=pool):
             print(f"Arquivo: {modified_file.filename}")
             print(f"Hash do Commit: {commit.hash}")
             
             print("-" * 40)
 
-            long_functions = check_function_sizes(modified_file.source_code, modified_file.filename)
-
             if long_functions:
                 print(f"As seguintes funções em '{modified_file.filename}' excedem 200 linhas:")
                 for func in long_functions:
@@ -48,13 +75,13 @@ def check_function_exceed_limit_size(repo_url, commit_hash):
             else:
                 print(f"Nenhuma função em '{modified_file.filename}' excede 200 linhas.")
 
-def check_function_sizes(source_code: str, filename: str) -> List[Dict]:
+def check_function_sizes(source_code: str, filename: str) -> List[LongFunctionRecord]:
     """
     Args:
         source_code: string com o codigo python completo a ser analisado.
         filename: nome do arquivo analisado, somente para clareza nos logs.
     Returns:
-        Uma lista de dicionários com os resultados para funções que excedem 200 linhas.
+        Uma lista de registros (LongFunctionRecord) para as funções que excedem 200 linhas.
     """
     # constroi a AST
     tree = ast.parse(source_code)
@@ -73,12 +100,6 @@ def check_function_sizes(source_code: str, filename: str) -> List[Dict]:
                 line_count = node.end_lineno - node.lineno + 1
 
             if line_count > 200:
-                results.append({
-                    'function_name': function_name,
-                    'line_count': line_count,
-                    'start_line': node.lineno,
-                    'end_line': node.end_lineno,
-                    'file_path': filename
-                })
+                results.append(LongFunctionRecord(function_name, line_count, node.lineno, node.end_lineno, filename))
                 
     return results 
\ No newline at end of file
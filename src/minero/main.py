@@ -1,81 +1,347 @@
 from typing import Optional
 import typer
-from .commits_info import show_commits_info, show_repository_generic_info
-from .loc_analysis import check_function_exceed_limit_size
-from .param_analysis import check_functions_exceed_param_limit
-from .cognitive_analysis import show_cognitive_analysis
-from .code_smells_analysis import check_code_smells
+from pathlib import Path
+from .options import AnalysisOptions, BatchAnalysis, OutputFormat
 
 from typing_extensions import Annotated
 
+# Os módulos de análise (e com eles pydriller, GitPython, lizard e rich) são
+# importados dentro de cada comando, só quando ele roda: `minero --help` e
+# erros de argumentos não pagam o custo dessas importações.
+
+NoCacheOption = Annotated[bool, typer.Option("--no-cache", help="Não usa o cache de análises em disco.")]
+JobsOption = Annotated[int, typer.Option("--jobs", "-j", min=1, help="Número de processos usados para analisar os arquivos.")]
+FromOption = Annotated[Optional[str], typer.Option("--from", help="Primeiro commit do intervalo a ser analisado (inclusive).")]
+ToOption = Annotated[Optional[str], typer.Option("--to", help="Último commit do intervalo a ser analisado (inclusive).")]
+LastOption = Annotated[Optional[int], typer.Option("--last", min=1, help="Analisa apenas os N commits mais recentes.")]
+SnapshotOption = Annotated[bool, typer.Option("--snapshot", help="Analisa todos os arquivos .py da árvore do commit (padrão: HEAD), não só os modificados.")]
+ChangedOnlyOption = Annotated[bool, typer.Option("--changed-only", help="Analisa só as funções tocadas pelo diff, com valores antes, depois e a variação.")]
+StagedOption = Annotated[bool, typer.Option("--staged", help="Analisa os arquivos .py alterados no índice (git add), ainda não commitados. Ideal para hooks de pre-commit.")]
+WorktreeOption = Annotated[bool, typer.Option("--worktree", help="Analisa os arquivos .py alterados ou novos no diretório de trabalho, ainda não commitados.")]
+TopOption = Annotated[Optional[int], typer.Option("--top", min=1, help="Mostra apenas os K piores resultados, guardando só eles em memória.")]
+OnlyViolationsOption = Annotated[bool, typer.Option("--only-violations", help="Mostra apenas os resultados acima dos limites.")]
+ProfileOption = Annotated[bool, typer.Option("--profile", help="Mede o tempo (relógio e CPU) de cada etapa e detector e mostra os arquivos mais lentos. Não usa o cache.")]
+ProfileFilesOption = Annotated[int, typer.Option("--profile-files", min=1, help="Quantos dos arquivos mais lentos mostrar com --profile.")]
+ProfileDumpOption = Annotated[Optional[Path], typer.Option("--profile-dump", help="Grava as estatísticas do cProfile (formato pstats) neste arquivo; implica --profile.")]
+FormatOption = Annotated[OutputFormat, typer.Option("--format", help="Formato da saída: tabelas (table) ou um JSON por linha (ndjson).")]
+OptionalCommitArgument = Annotated[Optional[str], typer.Argument(help="Hash do commit a ser analisado (ou use --from/--to ou --last).")]
+ParamLimitOption = Annotated[int, typer.Option("--param-limit", help="Limite do número de parâmetros a ser utilizado.")]
+ComplexityThresholdOption = Annotated[int, typer.Option("--complexity-threshold", help="Limite de complexidade a ser considerado.")]
+# os limites eram argumentos posicionais depois do COMMIT_HASH, o que impedia
+# usá-los com --from/--to, --last, --snapshot, --staged e --worktree: continuam
+# aceitos (sem aparecer na ajuda) para não quebrar scripts existentes
+DeprecatedLimitArgument = Annotated[Optional[int], typer.Argument(hidden=True, show_default=False, metavar="")]
+
 app = typer.Typer(
     help="Ferramenta CLI para mineração de repositórios de software.",
     add_completion=False
 )
 
+def _echo(message: str, output_format: OutputFormat):
+    """Mensagem inicial dos comandos, omitida na saída NDJSON para não misturar texto aos registros."""
+    if output_format == OutputFormat.table:
+        typer.echo(message)
+
+def _limit(option: int, positional: Optional[int], option_name: str) -> int:
+    """Limite de --param-limit/--complexity-threshold ou, obsoleto, do argumento posicional."""
+    if positional is None:
+        return option
+    typer.echo(f"Aviso: o limite como argumento posicional está obsoleto; use {option_name} {positional}.", err=True)
+    return positional
+
+def _check_commit_selection(commit_hash: Optional[str], from_rev: Optional[str], to_rev: Optional[str],
+                            last: Optional[int], required: bool = True, snapshot: bool = False,
+                            changed_only: bool = False, staged: bool = False, worktree: bool = False,
+                            repo_url: Optional[str] = None):
+    """Valida a escolha entre um commit único, um intervalo --from/--to, --last e as alterações não commitadas."""
+    chosen = [bool(commit_hash), bool(from_rev or to_rev), bool(last)]
+    if staged or worktree:
+        from .repository import is_remote
+        if staged and worktree:
+            raise typer.BadParameter("Use apenas um entre --staged e --worktree.")
+        if any(chosen) or snapshot or changed_only:
+            raise typer.BadParameter("--staged e --worktree analisam as alterações ainda não commitadas: não informe commits, --snapshot ou --changed-only.")
+        if repo_url and is_remote(repo_url):
+            raise typer.BadParameter("--staged e --worktree precisam de um repositório local.")
+        return
+    if snapshot and changed_only:
+        raise typer.BadParameter("--changed-only depende do diff de cada commit e não pode ser usado com --snapshot.")
+    if snapshot:
+        if from_rev or to_rev or last:
+            raise typer.BadParameter("--snapshot analisa um único commit: não use --from/--to ou --last.")
+        return
+    if sum(chosen) > 1:
+        raise typer.BadParameter("Informe apenas um entre COMMIT_HASH, o intervalo --from/--to e --last.")
+    if required and not any(chosen):
+        raise typer.BadParameter("Informe COMMIT_HASH, um intervalo com --from/--to ou --last N.")
+
 @app.command()
 def generic(
-    repo_url: Annotated[str, typer.Argument(help="URL do repositório a ser analisado.")]
+    repo_url: Annotated[str, typer.Argument(help="URL do repositório a ser analisado.")],
+    no_cache: NoCacheOption = False,
+    output_format: FormatOption = OutputFormat.table
 ):
     """
     Mostra informações genéricas de um repositório.
     """
-    typer.echo(f"Analisando informações do repositório: {repo_url}")
-    show_repository_generic_info(repo_url)
+    _echo(f"Analisando informações do repositório: {repo_url}", output_format)
+    from .commits_info import show_repository_generic_info
+    show_repository_generic_info(repo_url, AnalysisOptions(use_cache=not no_cache, output_format=output_format))
 
 @app.command()
-def commits(repo_url: Annotated[str, typer.Argument(help="URL do repositório a ser analisado.")]):
+def commits(
+    repo_url: Annotated[str, typer.Argument(help="URL do repositório a ser analisado.")],
+    no_cache: NoCacheOption = False,
+    output_format: FormatOption = OutputFormat.table
+):
     """
     Mostra informações dos commits de um repositório.
     """
-    typer.echo(f"Analisando commits do repositório: {repo_url}")
-    show_commits_info(repo_url)
+    _echo(f"Analisando commits do repositório: {repo_url}", output_format)
+    from .commits_info import show_commits_info
+    show_commits_info(repo_url, AnalysisOptions(use_cache=not no_cache, output_format=output_format))
 
 @app.command()
 def loc(
     repo_url: Annotated[str, typer.Argument(help="URL do repositório a ser analisado.")],
-    commit_hash: Annotated[str, typer.Argument(help="Hash do commit a ser analisado.")]
+    commit_hash: OptionalCommitArgument = None,
+    no_cache: NoCacheOption = False,
+    output_format: FormatOption = OutputFormat.table,
+    jobs: JobsOption = 1,
+    from_rev: FromOption = None,
+    to_rev: ToOption = None,
+    last: LastOption = None,
+    snapshot: SnapshotOption = False,
+    staged: StagedOption = False,
+    worktree: WorktreeOption = False,
+    changed_only: ChangedOnlyOption = False
 ):
     """
     Emite um alerta caso um arquivo .py de um commit tenha funções que excedam 200 linhas
     """
-    typer.echo(f"Analisando LOC do repositório: {repo_url}")
-    check_function_exceed_limit_size(repo_url, commit_hash)
+    _check_commit_selection(commit_hash, from_rev, to_rev, last, snapshot=snapshot, changed_only=changed_only,
+                            staged=staged, worktree=worktree, repo_url=repo_url)
+    _echo(f"Analisando LOC do repositório: {repo_url}", output_format)
+    from .loc_analysis import check_function_exceed_limit_size
+    check_function_exceed_limit_size(repo_url, commit_hash, AnalysisOptions(use_cache=not no_cache, jobs=jobs, from_rev=from_rev, to_rev=to_rev, last=last, output_format=output_format, snapshot=snapshot, changed_only=changed_only,
+                                                                                    staged=staged, worktree=worktree))
 
 @app.command()
 def params(
     repo_url: Annotated[str, typer.Argument(help="URL do repositório a ser analisado.")],
-    commit_hash: Annotated[str, typer.Argument(help="Hash do commit a ser analisado.")],
-    param_limit: Annotated[int, typer.Argument(help="Limite do número de parâmetros a ser utilizado.")] = 5
+    commit_hash: OptionalCommitArgument = None,
+    legacy_param_limit: DeprecatedLimitArgument = None,
+    param_limit: ParamLimitOption = 5,
+    no_cache: NoCacheOption = False,
+    output_format: FormatOption = OutputFormat.table,
+    jobs: JobsOption = 1,
+    from_rev: FromOption = None,
+    to_rev: ToOption = None,
+    last: LastOption = None,
+    snapshot: SnapshotOption = False,
+    staged: StagedOption = False,
+    worktree: WorktreeOption = False
 ):
     """
     Analisa a quantidade de parâmetros das funções em um commit
     """
-    typer.echo(f"Analisando quantidade de parâmetros do repositório: {repo_url}")
-    check_functions_exceed_param_limit(repo_url, commit_hash, param_limit)
+    param_limit = _limit(param_limit, legacy_param_limit, "--param-limit")
+    _check_commit_selection(commit_hash, from_rev, to_rev, last, snapshot=snapshot, staged=staged, worktree=worktree, repo_url=repo_url)
+    _echo(f"Analisando quantidade de parâmetros do repositório: {repo_url}", output_format)
+    from .param_analysis import check_functions_exceed_param_limit
+    check_functions_exceed_param_limit(repo_url, commit_hash, param_limit, AnalysisOptions(use_cache=not no_cache, jobs=jobs, from_rev=from_rev, to_rev=to_rev, last=last, output_format=output_format, snapshot=snapshot,
+                                                                                                     staged=staged, worktree=worktree))
 
 @app.command()
 def cog_analysis(
     repo_url: Annotated[str, typer.Argument(help="URL do repositório a ser analisado.")],
     commit_hash: Annotated[Optional[str], typer.Argument(help="Hash do commit a ser analisado, opcionalmente.")] = None,
-    complexity_level_threshold: Annotated[int, typer.Argument(help="Limite de complexidade a ser considerado.")] = 12
+    legacy_complexity_threshold: DeprecatedLimitArgument = None,
+    complexity_level_threshold: ComplexityThresholdOption = 12,
+    no_cache: NoCacheOption = False,
+    output_format: FormatOption = OutputFormat.table,
+    jobs: JobsOption = 1,
+    from_rev: FromOption = None,
+    to_rev: ToOption = None,
+    last: LastOption = None,
+    snapshot: SnapshotOption = False,
+    staged: StagedOption = False,
+    worktree: WorktreeOption = False,
+    changed_only: ChangedOnlyOption = False,
+    top: TopOption = None,
+    only_violations: OnlyViolationsOption = False
 ):
     """
-    Mostra a complexidade cognitiva das funções Python em um commit específico ou nos últimos 10 commits.
+    Mostra a complexidade cognitiva das funções Python em um commit específico ou nos últimos 5 commits.
     """
-    typer.echo(f"Analisando complexidade cognitiva do repositório: {repo_url} no commit: {commit_hash if commit_hash else 'últimos 10 commits'}")
-    show_cognitive_analysis(repo_url, commit_hash, complexity_level_threshold)
+    complexity_level_threshold = _limit(complexity_level_threshold, legacy_complexity_threshold, "--complexity-threshold")
+    _check_commit_selection(commit_hash, from_rev, to_rev, last, required=False, snapshot=snapshot, changed_only=changed_only,
+                            staged=staged, worktree=worktree, repo_url=repo_url)
+    from .commit_selection import describe_selection, has_commit_selection
+    options = AnalysisOptions(use_cache=not no_cache, jobs=jobs, from_rev=from_rev, to_rev=to_rev, last=last, output_format=output_format, snapshot=snapshot, changed_only=changed_only,
+                              staged=staged, worktree=worktree, top=top, only_violations=only_violations)
+    selection = describe_selection(commit_hash, options) if has_commit_selection(commit_hash, options) else 'últimos 5 commits'
+    _echo(f"Analisando complexidade cognitiva do repositório: {repo_url} no commit: {selection}", output_format)
+    from .cognitive_analysis import show_cognitive_analysis
+    show_cognitive_analysis(repo_url, commit_hash, complexity_level_threshold, options)
     
 @app.command()
 def code_smells(
     repo_url: Annotated[str, typer.Argument(help="URL do repositório a ser analisado.")],
-    commit_hash: Annotated[str, typer.Argument(help="Hash do commit a ser analisado.")]
+    commit_hash: OptionalCommitArgument = None,
+    no_cache: NoCacheOption = False,
+    output_format: FormatOption = OutputFormat.table,
+    jobs: JobsOption = 1,
+    from_rev: FromOption = None,
+    to_rev: ToOption = None,
+    last: LastOption = None,
+    snapshot: SnapshotOption = False,
+    staged: StagedOption = False,
+    worktree: WorktreeOption = False,
+    top: TopOption = None,
+    only_violations: OnlyViolationsOption = False,
+    profile: ProfileOption = False,
+    profile_files: ProfileFilesOption = 10,
+    profile_dump: ProfileDumpOption = None
 ):
     """
     Detecta code smells relacionados à manutenção de software em um commit
     """
-    typer.echo(f"Analisando code smells do repositório: {repo_url}")
-    check_code_smells(repo_url, commit_hash)
+    _check_commit_selection(commit_hash, from_rev, to_rev, last, snapshot=snapshot, staged=staged, worktree=worktree, repo_url=repo_url)
+    _echo(f"Analisando code smells do repositório: {repo_url}", output_format)
+    from .code_smells_analysis import check_code_smells
+    check_code_smells(repo_url, commit_hash, AnalysisOptions(use_cache=not no_cache, jobs=jobs, from_rev=from_rev, to_rev=to_rev, last=last, output_format=output_format, snapshot=snapshot,
+                                                             staged=staged, worktree=worktree, top=top, only_violations=only_violations,
+                                                             profile=profile or profile_dump is not None,
+                                                             profile_files=profile_files, profile_dump=profile_dump))
+
+@app.command(name="all")
+def all_analysis(
+    repo_url: Annotated[str, typer.Argument(help="URL do repositório a ser analisado.")],
+    commit_hash: OptionalCommitArgument = None,
+    legacy_param_limit: DeprecatedLimitArgument = None,
+    legacy_complexity_threshold: DeprecatedLimitArgument = None,
+    param_limit: ParamLimitOption = 5,
+    complexity_level_threshold: ComplexityThresholdOption = 12,
+    no_cache: NoCacheOption = False,
+    output_format: FormatOption = OutputFormat.table,
+    jobs: JobsOption = 1,
+    from_rev: FromOption = None,
+    to_rev: ToOption = None,
+    last: LastOption = None,
+    snapshot: SnapshotOption = False,
+    staged: StagedOption = False,
+    worktree: WorktreeOption = False
+):
+    """
+    Executa todas as análises (LOC, parâmetros, complexidade cognitiva e code smells) lendo cada arquivo uma única vez
+    """
+    param_limit = _limit(param_limit, legacy_param_limit, "--param-limit")
+    complexity_level_threshold = _limit(complexity_level_threshold, legacy_complexity_threshold, "--complexity-threshold")
+    _check_commit_selection(commit_hash, from_rev, to_rev, last, snapshot=snapshot, staged=staged, worktree=worktree, repo_url=repo_url)
+    _echo(f"Analisando todas as métricas do repositório: {repo_url}", output_format)
+    from .analysis_engine import show_full_analysis
+    show_full_analysis(repo_url, commit_hash, param_limit, complexity_level_threshold, AnalysisOptions(use_cache=not no_cache, jobs=jobs, from_rev=from_rev, to_rev=to_rev, last=last, output_format=output_format, snapshot=snapshot,
+                                                                                                                                          staged=staged, worktree=worktree))
+
+@app.command()
+def trend(
+    repo_url: Annotated[str, typer.Argument(help="URL do repositório a ser analisado.")],
+    function: Annotated[Optional[str], typer.Option("--function", help="Padrão do nome qualificado das funções (ex.: 'Classe.*').")] = None,
+    no_cache: NoCacheOption = False,
+    output_format: FormatOption = OutputFormat.table,
+    jobs: JobsOption = 1
+):
+    """
+    Mostra a evolução da complexidade cognitiva, LOC e parâmetros de cada função ao longo do histórico
+    """
+    _echo(f"Analisando a evolução das funções do repositório: {repo_url}", output_format)
+    from .trend_analysis import show_function_trend
+    show_function_trend(repo_url, function, AnalysisOptions(use_cache=not no_cache, jobs=jobs, output_format=output_format))
+
+@app.command()
+def hotspots(
+    repo_url: Annotated[str, typer.Argument(help="URL do repositório a ser analisado.")],
+    candidates: Annotated[int, typer.Option("--candidates", min=1, help="Quantos dos arquivos mais alterados têm a complexidade calculada.")] = 50,
+    top: Annotated[int, typer.Option("--top", min=1, help="Quantos hotspots mostrar.")] = 20,
+    no_cache: NoCacheOption = False,
+    output_format: FormatOption = OutputFormat.table,
+    jobs: JobsOption = 1
+):
+    """
+    Ordena os arquivos pelo churn (linhas alteradas no histórico) vezes a complexidade cognitiva atual
+    """
+    _echo(f"Analisando os hotspots do repositório: {repo_url}", output_format)
+    from .hotspots import show_hotspots
+    show_hotspots(repo_url, candidates, AnalysisOptions(use_cache=not no_cache, jobs=jobs, top=top, output_format=output_format))
+
+@app.command()
+def summary(
+    repo_url: Annotated[str, typer.Argument(help="URL do repositório a ser analisado.")],
+    commit_hash: Annotated[Optional[str], typer.Argument(help="Hash do commit a ser analisado (padrão: a árvore inteira de HEAD).")] = None,
+    percentile: Annotated[Optional[float], typer.Option("--percentile", min=0, max=100, help="Usa esse percentil de cada métrica como limite, em vez dos limites fixos (12, 200 e 5).")] = None,
+    depth: Annotated[int, typer.Option("--depth", min=1, help="Níveis de diretório usados no resumo por diretório.")] = 1,
+    top: Annotated[Optional[int], typer.Option("--top", min=1, help="Mostra apenas os K diretórios de maior complexidade (P90).")] = None,
+    no_cache: NoCacheOption = False,
+    output_format: FormatOption = OutputFormat.table,
+    jobs: JobsOption = 1,
+    from_rev: FromOption = None,
+    to_rev: ToOption = None,
+    last: LastOption = None,
+    snapshot: SnapshotOption = False,
+    staged: StagedOption = False,
+    worktree: WorktreeOption = False
+):
+    """
+    Mostra percentis, histogramas e a distribuição por diretório da complexidade cognitiva, LOC e parâmetros das funções
+    """
+    _check_commit_selection(commit_hash, from_rev, to_rev, last, required=False, snapshot=snapshot,
+                            staged=staged, worktree=worktree, repo_url=repo_url)
+    from .commit_selection import has_commit_selection
+    options = AnalysisOptions(use_cache=not no_cache, jobs=jobs, from_rev=from_rev, to_rev=to_rev, last=last, output_format=output_format, snapshot=snapshot,
+                              staged=staged, worktree=worktree, top=top)
+    if not has_commit_selection(commit_hash, options):
+        # sem seleção, o repositório inteiro
+        options.snapshot = True
+    _echo(f"Analisando a distribuição das métricas do repositório: {repo_url}", output_format)
+    from .summary_analysis import show_summary
+    show_summary(repo_url, commit_hash, percentile, depth, options)
+
+@app.command()
+def batch(
+    manifest: Annotated[Path, typer.Argument(exists=True, dir_okay=False, help="Arquivo com um repositório (caminho ou URL) por linha.")],
+    analysis: Annotated[BatchAnalysis, typer.Option("--analysis", "-a", help="Análise executada em cada repositório.")] = BatchAnalysis.all,
+    param_limit: ParamLimitOption = 5,
+    complexity_level_threshold: ComplexityThresholdOption = 12,
+    no_cache: NoCacheOption = False,
+    output_format: FormatOption = OutputFormat.table,
+    jobs: JobsOption = 1,
+    io_jobs: Annotated[int, typer.Option("--io-jobs", min=1, help="Repositórios acessados ao mesmo tempo (threads de I/O do git).")] = 4,
+    last: Annotated[Optional[int], typer.Option("--last", min=1, help="Analisa os N commits mais recentes de cada repositório, em vez da árvore de HEAD.")] = None
+):
+    """
+    Executa uma análise em vários repositórios ao mesmo tempo, listados em um manifesto
+    """
+    _echo(f"Analisando os repositórios do manifesto: {manifest}", output_format)
+    from .batch_analysis import show_batch_analysis
+    summary = show_batch_analysis(manifest, analysis, AnalysisOptions(use_cache=not no_cache, jobs=jobs, last=last, output_format=output_format),
+                                  io_jobs, param_limit, complexity_level_threshold)
+    if summary.failed:
+        raise typer.Exit(code=1)
+
+@app.command()
+def serve(
+    socket_file: Annotated[Optional[Path], typer.Option("--socket", help="Socket Unix onde escutar (padrão: serve.sock no diretório do cache).")] = None
+):
+    """
+    Mantém o minero carregado e atende os demais comandos, que passam a ser enviados a ele
+    """
+    from .daemon import serve as run_server
+    try:
+        run_server(socket_file)
+    except RuntimeError as e:
+        typer.echo(str(e), err=True)
+        raise typer.Exit(code=1)
 
 if __name__ == "__main__":
     app()
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from typing import IO, Any, Dict, Optional
+import json
+import sys
+
+from .options import AnalysisOptions, OutputFormat
+
+def is_ndjson(options: Optional[AnalysisOptions]) -> bool:
+    """Diz se a saída deve ser NDJSON em vez das tabelas do Rich."""
+    return options is not None and options.output_format == OutputFormat.ndjson
+
+def write_record(record: Dict[str, Any], stream: Optional[IO[str]] = None) -> None:
+    """
+    Escreve um registro como uma linha JSON, assim que ele é produzido.
+
+    Nada é acumulado: cada achado vira uma linha na saída, então a memória
+    usada não depende da quantidade de achados. A saída é descarregada a
+    cada registro para que quem lê pelo pipe receba os resultados sem esperar
+    o fim da análise.
+
+    Args:
+        record: dicionário com valores serializáveis em JSON.
+        stream: destino da saída (padrão: sys.stdout).
+    """
+    stream = stream or sys.stdout
+    stream.write(json.dumps(record, ensure_ascii=False))
+    stream.write("\n")
+    stream.flush()
+
+def function_record(commit_hash: str, function: Any, **metrics: Any) -> Dict[str, Any]:
+    """Registro de uma função (FunctionComplexity) com as métricas informadas."""
+    return {
+        "kind": "function",
+        "commit_hash": commit_hash,
+        "file_path": function.file_path,
+        "function_name": function.function_name,
+        "start_line": function.lineno,
+        "end_line": function.end_lineno,
+        **metrics,
+    }
+
+def smell_record(commit_hash: str, smell: Dict[str, Any]) -> Dict[str, Any]:
+    """Registro de um code smell (dicionário produzido pelos detectores)."""
+    return {
+        "kind": "smell",
+        "commit_hash": commit_hash,
+        "file_path": smell["file_path"],
+        "smell_type": smell["smell_type"],
+        "line_number": smell["line_number"],
+        "description": smell["description"],
+    }
@@ -0,0 +1,55 @@
+from dataclasses import dataclass
+from enum import Enum
+from pathlib import Path
+from typing import Optional
+
+class OutputFormat(str, Enum):
+    """Formatos de saída dos comandos."""
+    table = "table"
+    ndjson = "ndjson"
+
+class BatchAnalysis(str, Enum):
+    """Análises que o comando batch executa em cada repositório."""
+    loc = "loc"
+    params = "params"
+    cog_analysis = "cog-analysis"
+    code_smells = "code-smells"
+    all = "all"
+
+@dataclass
+class AnalysisOptions:
+    """
+    Opções de execução compartilhadas pelos comandos de análise.
+
+    Attributes:
+        use_cache: reaproveita resultados do cache em disco (ver cache.py).
+        jobs: número de processos usados para analisar os arquivos (ver parallel.py).
+        from_rev: primeiro commit do intervalo analisado (inclusive).
+        to_rev: último commit do intervalo analisado (inclusive).
+        last: analisa apenas os N commits mais recentes.
+        output_format: tabelas do Rich ("table") ou um JSON por linha ("ndjson", ver ndjson_output.py).
+        snapshot: analisa todos os arquivos da árvore do commit, não só os modificados (ver snapshot.py).
+        changed_only: analisa só as funções tocadas pelo diff, antes e depois (ver delta_analysis.py).
+        staged: analisa os arquivos alterados no índice, ainda não commitados (ver working_tree.py).
+        worktree: analisa os arquivos alterados no diretório de trabalho, ainda não commitados (ver working_tree.py).
+        top: mostra apenas os K piores resultados, guardando só eles em memória (ver top_k.py).
+        only_violations: mostra apenas os resultados acima dos limites.
+        profile: mede o tempo de cada etapa e os arquivos mais lentos (ver profiling.py).
+        profile_files: quantos dos arquivos mais lentos mostrar com --profile.
+        profile_dump: arquivo onde gravar as estatísticas do cProfile (formato pstats), ou None.
+    """
+    use_cache: bool = True
+    jobs: int = 1
+    from_rev: Optional[str] = None
+    to_rev: Optional[str] = None
+    last: Optional[int] = None
+    output_format: OutputFormat = OutputFormat.table
+    snapshot: bool = False
+    changed_only: bool = False
+    staged: bool = False
+    worktree: bool = False
+    top: Optional[int] = None
+    only_violations: bool = False
+    profile: bool = False
+    profile_files: int = 10
+    profile_dump: Optional[Path] = None
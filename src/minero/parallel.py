@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .cache import AnalysisCache, MISS, cached_analysis, lookup
+
+# pools mantidos entre comandos pelo servidor, por número de processos (ver keep_worker_pools)
+_kept_pools: Optional[Dict[int, ProcessPoolExecutor]] = None
+
+@contextmanager
+def keep_worker_pools() -> Iterator[None]:
+    """
+    Durante o bloco, worker_pool reaproveita os pools já criados em vez de
+    criar e encerrar processos a cada comando (usado por `minero serve`).
+    """
+    global _kept_pools
+    _kept_pools = {}
+    try:
+        yield
+    finally:
+        pools, _kept_pools = _kept_pools, None
+        for pool in pools.values():
+            pool.shutdown()
+
+@contextmanager
+def worker_pool(jobs: int = 1) -> Iterator[Optional[Executor]]:
+    """
+    Cria o pool de processos usado para analisar arquivos em paralelo.
+    Com jobs <= 1 não cria pool nenhum e a análise roda no processo atual.
+    """
+    if jobs <= 1:
+        yield None
+        return
+    if _kept_pools is not None:
+        pool = _kept_pools.get(jobs)
+        # um pool quebrado (processo morto) não aceita mais tarefas: é trocado por outro
+        if pool is None or getattr(pool, "_broken", False):
+            pool = _kept_pools[jobs] = ProcessPoolExecutor(max_workers=jobs)
+        yield pool
+        return
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        yield pool
+
+def _run_analyzer(analyzer: Callable, source_code: str, filename: str, args: tuple) -> Any:
+    return analyzer(source_code, filename, *args)
+
+# arquivos enviados ao pool de cada vez, por processo: limita quantos
+# conteúdos ficam em memória ao mesmo tempo (ex.: snapshot de uma árvore inteira)
+BATCH_PER_WORKER = 64
+
+def iter_analyze_files(files: Sequence[Any], analyzer: Callable, *args: Any,
+                       cache: Optional[AnalysisCache] = None, pool: Optional[Executor] = None,
+                       skip_empty: bool = False) -> Iterator[Tuple[Any, Any]]:
+    """
+    Executa `analyzer(source_code, filename, *args)` em cada arquivo,
+    consultando o cache antes e distribuindo o parse e a análise entre os
+    processos do pool, quando houver.
+
+    A leitura do conteúdo continua no processo principal (os objetos do
+    PyDriller não podem ser enviados aos workers) e os resultados voltam
+    sempre na mesma ordem dos arquivos recebidos, então a saída é
+    reprodutível qualquer que seja o número de processos. Os arquivos são
+    lidos e analisados em lotes, e os resultados de cada lote são entregues
+    antes do próximo ser lido.
+
+    Args:
+        files: arquivos a serem analisados (ModifiedFile do PyDriller ou similar).
+        analyzer: função de análise por arquivo, definida no nível do módulo.
+        args: parâmetros extras do analisador.
+        cache: cache a ser usado, ou None.
+        pool: pool criado por worker_pool, ou None para analisar em série.
+        skip_empty: se True, arquivos sem conteúdo recebem resultado None.
+    Returns:
+        Um gerador de tuplas (arquivo, resultado) na ordem de `files`.
+    """
+    if pool is None:
+        for f in files:
+            yield f, cached_analysis(f, analyzer, *args, cache=cache, skip_empty=skip_empty)
+        return
+
+    size = batch_size(pool)
+    for start in range(0, len(files), size):
+        yield from _analyze_batch(files[start:start + size], analyzer, args, cache, pool, skip_empty)
+
+def analyze_files(files: Sequence[Any], analyzer: Callable, *args: Any,
+                  cache: Optional[AnalysisCache] = None, pool: Optional[Executor] = None,
+                  skip_empty: bool = False) -> List[Tuple[Any, Any]]:
+    """Mesmo que iter_analyze_files, devolvendo uma lista."""
+    return list(iter_analyze_files(files, analyzer, *args, cache=cache, pool=pool, skip_empty=skip_empty))
+
+def _analyze_batch(files: Sequence[Any], analyzer: Callable, args: tuple, cache: Optional[AnalysisCache],
+                   pool: Executor, skip_empty: bool) -> List[Tuple[Any, Any]]:
+    results: List[Any] = [None] * len(files)
+    pending: List[Tuple[int, Optional[str], str, str]] = []
+
+    for index, modified_file in enumerate(files):
+        key, result = lookup(modified_file, analyzer, args, cache, skip_empty)
+        if result is not MISS:
+            results[index] = result
+            continue
+
+        source_code = modified_file.source_code
+        if skip_empty and not source_code:
+            continue
+        pending.append((index, key, source_code, modified_file.filename))
+
+    if pending:
+        computed = pool.map(
+            _run_analyzer,
+            [analyzer] * len(pending),
+            [source_code for _, _, source_code, _ in pending],
+            [filename for _, _, _, filename in pending],
+            [args] * len(pending),
+            chunksize=max(1, len(pending) // (4 * pool_size(pool))),
+        )
+        for (index, key, _, _), result in zip(pending, computed):
+            results[index] = result
+            if key is not None:
+                cache.put(key, result)
+
+    return list(zip(files, results))
+
+def start_workers(pool: Optional[Executor]) -> None:
+    """
+    Cria os processos do pool imediatamente. Deve ser chamada antes de
+    iniciar outras threads: um fork feito enquanto outra thread segura um
+    lock pode deixar o processo filho travado para sempre.
+    """
+    if pool is not None:
+        pool.submit(int).result()
+
+def batch_size(pool: Executor) -> int:
+    """Quantos arquivos são lidos e enviados ao pool de cada vez."""
+    return BATCH_PER_WORKER * pool_size(pool)
+
+def pool_size(pool: Executor) -> int:
+    """Número de processos do pool."""
+    return getattr(pool, "_max_workers", 1) or 1
@@ -1,45 +1,64 @@
-from pydriller.metrics.process.lines_count import LinesCount
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
 
-from pydriller import Repository
-
 import ast
-from typing import List, Dict
+from typing import List, Optional
+
+from .cache import analysis_cache
+from .parallel import iter_analyze_files, worker_pool
+from .options import AnalysisOptions
+from .commit_selection import describe_selection, select_commits
+from .ndjson_output import is_ndjson, write_record
+from .records import ParamViolationRecord
 
 console = Console()
 
-def check_functions_exceed_param_limit(repo_url: str, commit_hash: str, param_limit = 5):
+def check_functions_exceed_param_limit(repo_url: str, commit_hash: Optional[str], param_limit = 5, options: Optional[AnalysisOptions] = None):
     """
     Analisa os arquivos Python de um commit de um repositório e verifica se
     alguma função tem muitos parâmetros.
 
     Args:
     repo_url: O caminho para o repositorio.
-    commit_hash: Hash do commit a ser analisado.
+    commit_hash: Hash do commit a ser analisado (ou None para usar --from/--to ou --last).
     param_limit: o limite de parâmetros a ser considerado
+    options: opções de execução (cache, paralelismo, intervalo de commits, etc.).
     """
+    options = options or AnalysisOptions()
 
-    console.print(Panel.fit(
-        f"[bold cyan] Analisando quantidade de parâmetros das funções[/bold cyan]\n"
-        f"Repositório: [yellow]{repo_url}[/yellow]\n"
-        f"Commit: [green]{commit_hash}[/green]",
-        style="blue"
-    ))
+    if not is_ndjson(options):
+        console.print(Panel.fit(
+            f"[bold cyan] Analisando quantidade de parâmetros das funções[/bold cyan]\n"
+            f"Repositório: [yellow]{repo_url}[/yellow]\n"
+            f"Commit: [green]{describe_selection(commit_hash, options)}[/green]",
+            style="blue"
+        ))
 
-    commits = Repository(repo_url, single=commit_hash).traverse_commits()
+    commits = select_commits(repo_url, commit_hash, options)
     
+    with analysis_cache(options.use_cache) as cache, worker_pool(options.jobs) as pool:
+        if is_ndjson(options):
+            _write_param_violations(commits, param_limit, cache, pool)
+        else:
+            _report_param_violations(commits, param_limit, cache, pool)
+
+def _write_param_violations(commits, param_limit, cache, pool):
+    """Um registro NDJSON por função com mais parâmetros que o limite."""
     for commit in commits:
-        for modified_file in commit.modified_files:
+        python_files = [mf for mf in commit.modified_files if mf.filename.endswith('.py')]
 
-            if not modified_file.filename.endswith('.py'):
-                continue
+        for _, accused in iter_analyze_files(python_files, check_functions_num_params, param_limit, cache=cache, pool=pool):
+            for func in accused:
+                write_record({"kind": "function", "commit_hash": commit.hash, **func, "param_limit": param_limit})
+
+def _report_param_violations(commits, param_limit, cache, pool):
+    for commit in commits:
+        python_files = [mf for mf in commit.modified_files if mf.filename.endswith('.py')]
 
+        for modified_file, accused in iter_analyze_files(python_files, check_functions_num_params, param_limit, cache=cache, pool=pool):
             print(f"Arquivo: {modified_file.filename}")
             print(f"Hash do Commit: {commit.hash}")
-            
-            accused = check_functions_num_params(modified_file.source_code, modified_file.filename, param_limit)
 
             if accused:
                 print(f"As seguintes funções em '{modified_file.filename}' possuem mais de {param_limit} parâmetros:")
@@ -49,13 +68,13 @@ def check_functions_exceed_param_limit(repo_url: str, commit_hash: str, param_li
                 print(f"Nenhuma função em '{modified_file.filename}' excede {param_limit} parâmetros.")
 
 
-def check_functions_num_params(source_code: str, filename: str, param_limit: int = 5) -> List[Dict]:
+def check_functions_num_params(source_code: str, filename: str, param_limit: int = 5) -> List[ParamViolationRecord]:
     """
     Args:
         source_code: string com o código fonte python a ser analisado
         filename: nome do arquivo analisado
     Returns:
-        Uma lista de dicionários com os resultados para funções que excedem 200 linhas.
+        Uma lista de registros (ParamViolationRecord) para as funções que excedem o limite de parâmetros.
     """
     # constroi a AST
     tree = ast.parse(source_code)
@@ -67,18 +86,18 @@ def check_functions_num_params(source_code: str, filename: str, param_limit: int
 
         if isinstance(node, ast.FunctionDef) or isinstance(node, ast.AsyncFunctionDef):
             function_name = node.name
-
-            # seleciona todos os parâmetros que não são de quantidade variável
-            # (como *args e **kwargs seriam, por ex.)
-            non_variable_params = getattr(node.args, "posonlyargs", []) + getattr(node.args, "args", []) + getattr(node.args, "kwonlyargs", [])
-            param_count = len(non_variable_params)
+            param_count = count_function_params(node)
                 
             if param_count > param_limit:
-                results.append({
-                    "function_name": function_name,
-                    "param_count": param_count,
-                    "file_path": filename
-                })
+                results.append(ParamViolationRecord(function_name, param_count, node.lineno, filename))
                 
-    return results 
+    return results
+
 
+def count_function_params(node: ast.AST) -> int:
+    """
+    Conta os parâmetros de uma função que não são de quantidade variável
+    (como *args e **kwargs seriam, por ex.).
+    """
+    non_variable_params = getattr(node.args, "posonlyargs", []) + getattr(node.args, "args", []) + getattr(node.args, "kwonlyargs", [])
+    return len(non_variable_params)
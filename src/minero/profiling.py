@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, ContextManager, Dict, Iterator, Optional, Tuple
+import cProfile
+import time
+
+from rich.console import Console
+from rich.table import Table
+
+from .ndjson_output import write_record
+from .top_k import TopK
+
+console = Console()
+
+# arquivos mostrados na lista dos mais lentos, se nada for informado
+SLOWEST_FILES = 10
+
+@dataclass
+class StageTime:
+    """Tempo acumulado de uma etapa: relógio (wall), CPU e quantidade de medições."""
+    wall: float = 0.0
+    cpu: float = 0.0
+    calls: int = 0
+
+@contextmanager
+def timed(timings: Dict[str, StageTime], name: str) -> Iterator[None]:
+    """Soma em timings[name] o tempo de relógio e de CPU do bloco."""
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        yield
+    finally:
+        stage = timings.get(name)
+        if stage is None:
+            stage = timings[name] = StageTime()
+        stage.wall += time.perf_counter() - wall
+        stage.cpu += time.process_time() - cpu
+        stage.calls += 1
+
+class Profiler:
+    """
+    Mede onde vai o tempo de uma execução com --profile: cada etapa
+    (travessia dos commits, leitura dos arquivos, ast.parse, cada detector,
+    renderização) e os arquivos mais lentos, guardando só os N piores.
+
+    As etapas medidas nos processos do pool chegam junto com o resultado de
+    cada arquivo e são somadas com add_stages().
+    """
+
+    def __init__(self, slowest_files: int = SLOWEST_FILES):
+        self.stages: Dict[str, StageTime] = {}
+        self.slowest: TopK[Tuple[float, str]] = TopK(slowest_files, key=lambda entry: entry[0])
+        self._start = time.perf_counter()
+
+    def stage(self, name: str) -> ContextManager[None]:
+        return timed(self.stages, name)
+
+    def add_stages(self, timings: Dict[str, StageTime]) -> None:
+        for name, measured in timings.items():
+            stage = self.stages.get(name)
+            if stage is None:
+                stage = self.stages[name] = StageTime()
+            stage.wall += measured.wall
+            stage.cpu += measured.cpu
+            stage.calls += measured.calls
+
+    def add_file(self, label: str, seconds: float) -> None:
+        self.slowest.push((seconds, label))
+
+    def report(self, ndjson: bool = False) -> None:
+        """Mostra o tempo de cada etapa, da mais lenta para a mais rápida, e os arquivos mais lentos."""
+        total = time.perf_counter() - self._start
+        stages = sorted(self.stages.items(), key=lambda item: item[1].wall, reverse=True)
+
+        if ndjson:
+            for name, stage in stages:
+                write_record({"kind": "profile_stage", "stage": name, "wall_seconds": round(stage.wall, 6),
+                              "cpu_seconds": round(stage.cpu, 6), "calls": stage.calls})
+            for seconds, label in self.slowest.items():
+                write_record({"kind": "profile_file", "file": label, "seconds": round(seconds, 6)})
+            write_record({"kind": "profile_total", "wall_seconds": round(total, 6)})
+            return
+
+        table = Table(show_header=True, header_style="bold magenta", title=f"Perfil da execução ({total:.2f}s)")
+        table.add_column("Etapa")
+        table.add_column("Relógio (s)", justify="right")
+        table.add_column("CPU (s)", justify="right")
+        table.add_column("% do total", justify="right")
+        table.add_column("Medições", justify="right")
+        for name, stage in stages:
+            share = 100 * stage.wall / total if total else 0.0
+            table.add_row(name, f"{stage.wall:.3f}", f"{stage.cpu:.3f}", f"{share:.1f}", str(stage.calls))
+        console.print()
+        console.print(table)
+
+        if len(self.slowest):
+            files = Table(show_header=True, header_style="bold magenta", title="Arquivos mais lentos")
+            files.add_column("Arquivo", overflow="fold")
+            files.add_column("Segundos", justify="right")
+            for seconds, label in self.slowest.items():
+                files.add_row(label, f"{seconds:.3f}")
+            console.print(files)
+
+def stage(profiler: Optional[Profiler], name: str) -> ContextManager[None]:
+    """profiler.stage(name), ou um bloco sem medição quando não há profiler."""
+    return nullcontext() if profiler is None else profiler.stage(name)
+
+class TimedSource:
+    """
+    Envolve um arquivo (ModifiedFile ou SnapshotFile) medindo a leitura do
+    conteúdo na etapa "source_read"; os demais atributos são repassados.
+    """
+    __slots__ = ("_file", "_profiler", "read_seconds")
+
+    def __init__(self, modified_file: Any, profiler: Profiler):
+        self._file = modified_file
+        self._profiler = profiler
+        self.read_seconds = 0.0
+
+    @property
+    def source_code(self) -> Optional[str]:
+        start = time.perf_counter()
+        with self._profiler.stage("source_read"):
+            source_code = self._file.source_code
+        self.read_seconds += time.perf_counter() - start
+        return source_code
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._file, name)
+
+@contextmanager
+def cprofile_dump(path: Optional[Path]) -> Iterator[None]:
+    """
+    Com um caminho, executa o bloco sob o cProfile e grava as estatísticas
+    (formato pstats) ao final. Só o processo principal é medido: com -j, o
+    trabalho dos processos do pool aparece apenas como espera.
+    """
+    if path is None:
+        yield
+        return
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        profile.dump_stats(str(path))
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, Tuple
+import sys
+
+class Record:
+    """
+    Base dos registros de resultado: objetos com __slots__ (sem __dict__ por
+    instância) que continuam podendo ser lidos como os dicionários usados
+    antes, com record["campo"], `**record` e comparação com dict.
+
+    `_fields` lista os campos expostos, na ordem dos antigos dicionários;
+    campos calculados (como description) são propriedades.
+    """
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._fields:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def keys(self) -> Tuple[str, ...]:
+        return self._fields
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        return ((name, getattr(self, name)) for name in self._fields)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return dict(self.items())
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, (Record, Mapping)):
+            return self.as_dict() == dict(other.items())
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={value!r}" for name, value in self.items())
+        return f"{type(self).__name__}({values})"
+
+# descrições dos code smells: o texto só é montado quando o smell é mostrado
+MAGIC_NUMBER = "Magic number {}"
+LONG_PARAMETER_LIST = "Função '{}' tem {} parâmetros (recomendado: ≤6)"
+LARGE_CLASS = "Classe '{}' tem {} métodos (recomendado: ≤10) - possível God Class"
+SINGLE_LETTER_NAME = "Variável de uma letra: '{}' (não descritiva)"
+GENERIC_NAME = "Nome não descritivo: '{}' (considere um nome mais específico)"
+DEAD_CODE = "Possível código morto comentado: {}..."
+
+class SmellRecord(Record):
+    """
+    Um code smell encontrado. Guarda o modelo da descrição (uma das
+    constantes acima, compartilhada por todos os registros) e os valores
+    usados nele, em vez do texto já formatado.
+    """
+    __slots__ = ("smell_type", "line_number", "file_path", "_template", "_args")
+    _fields = ("smell_type", "line_number", "description", "file_path")
+
+    def __init__(self, smell_type: str, line_number: int, file_path: str, template: str, *args: Any):
+        self.smell_type = sys.intern(smell_type)
+        self.line_number = line_number
+        self.file_path = sys.intern(file_path)
+        self._template = template
+        self._args = args
+
+    @property
+    def description(self) -> str:
+        return self._template.format(*self._args)
+
+    def __reduce__(self):
+        return (type(self), (self.smell_type, self.line_number, self.file_path, self._template, *self._args))
+
+class LongFunctionRecord(Record):
+    """Uma função que excede o limite de linhas (ver check_function_sizes)."""
+    __slots__ = ("function_name", "line_count", "start_line", "end_line", "file_path")
+    _fields = __slots__
+
+    def __init__(self, function_name: str, line_count: int, start_line: int, end_line: int, file_path: str):
+        self.function_name = function_name
+        self.line_count = line_count
+        self.start_line = start_line
+        self.end_line = end_line
+        self.file_path = sys.intern(file_path)
+
+    def __reduce__(self):
+        return (type(self), tuple(getattr(self, name) for name in self._fields))
+
+class ParamViolationRecord(Record):
+    """Uma função com mais parâmetros que o limite (ver check_functions_num_params)."""
+    __slots__ = ("function_name", "param_count", "start_line", "file_path")
+    _fields = __slots__
+
+    def __init__(self, function_name: str, param_count: int, start_line: int, file_path: str):
+        self.function_name = function_name
+        self.param_count = param_count
+        self.start_line = start_line
+        self.file_path = sys.intern(file_path)
+
+    def __reduce__(self):
+        return (type(self), tuple(getattr(self, name) for name in self._fields))
@@ -0,0 +1,217 @@
+from contextlib import contextmanager
+from pathlib import Path
+from typing import ContextManager, Dict, Iterator, List, Optional, Set, Tuple
+import hashlib
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import os
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem flock, os espelhos ficam sem trava entre processos
+    fcntl = None
+
+from pydriller import Git
+
+from .cache import default_cache_dir
+
+def is_remote(repo_url: str) -> bool:
+    """
+    Diz se o repositório precisa ser clonado: as mesmas regras do PyDriller,
+    mais URLs ssh:// e file:// (que o PyDriller trataria como caminho local).
+    """
+    return repo_url.startswith(("git@", "https://", "http://", "git://", "ssh://", "file://"))
+
+def mirror_dir() -> Path:
+    """Diretório dos espelhos dos repositórios remotos, dentro do diretório do cache."""
+    return default_cache_dir() / "mirrors"
+
+def mirror_path(repo_url: str) -> Path:
+    """Caminho do espelho de uma URL: um nome legível mais o hash da URL completa."""
+    name = re.sub(r"[^A-Za-z0-9._-]+", "-", repo_url.rstrip("/").rsplit("/", 1)[-1]).strip("-") or "repo"
+    if name.endswith(".git"):
+        name = name[:-4]
+    digest = hashlib.sha1(repo_url.encode("utf-8")).hexdigest()[:16]
+    return mirror_dir() / f"{name}-{digest}.git"
+
+# URLs cujos espelhos já foram atualizados neste processo: um comando pode
+# resolver a mesma URL mais de uma vez (ex.: --last e depois a travessia)
+_updated: Set[str] = set()
+_updated_lock = threading.Lock()
+
+def forget_mirror_updates() -> None:
+    """Faz o próximo uso de cada espelho buscar as novidades de novo (a cada comando do servidor)."""
+    with _updated_lock:
+        _updated.clear()
+
+def _is_updated(repo_url: str, path: Path) -> bool:
+    with _updated_lock:
+        return repo_url in _updated and path.exists()
+
+@contextmanager
+def _mirror_lock(path: Path) -> Iterator[None]:
+    """Trava exclusiva (flock) de um espelho (ou outro caminho), compartilhada por processos e threads."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_suffix(".lock"), "w") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def repository_lock(repo_path: str) -> ContextManager[None]:
+    """
+    Trava entre processos de um repositório local, para operações que
+    alteram o seu .git/config (ver history_chunks). O arquivo da trava fica
+    no diretório do cache, não dentro do repositório.
+    """
+    digest = hashlib.sha1(os.path.realpath(repo_path).encode("utf-8")).hexdigest()[:16]
+    return _mirror_lock(default_cache_dir() / "locks" / digest)
+
+def _git(*args: str) -> None:
+    subprocess.run(["git", *args], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+
+def mirrored_repository(repo_url: str) -> str:
+    """
+    Caminho local de um repositório. Repositórios remotos são mantidos como
+    espelhos (clones bare com --mirror) no diretório do cache, um por URL,
+    reaproveitados por todos os comandos: o primeiro uso clona, os
+    seguintes só buscam o que mudou (git fetch). Clone e fetch acontecem
+    sob uma trava, então execuções simultâneas são seguras; o clone é
+    feito em um diretório temporário e renomeado, então um espelho pela
+    metade nunca é visto.
+
+    Args:
+        repo_url: O caminho ou a URL do repositório.
+    Returns:
+        O próprio caminho, para repositórios locais, ou o caminho do espelho.
+    """
+    if not is_remote(repo_url):
+        return repo_url
+
+    path = mirror_path(repo_url)
+    if _is_updated(repo_url, path):
+        return str(path)
+
+    with _mirror_lock(path):
+        if _is_updated(repo_url, path):
+            # outra thread atualizou o espelho enquanto esta esperava a trava
+            return str(path)
+        if path.exists():
+            _git("-C", str(path), "fetch", "--quiet", "--prune")
+        else:
+            tmp_dir = tempfile.mkdtemp(prefix=f"{path.name}-", dir=path.parent)
+            try:
+                _git("clone", "--quiet", "--mirror", repo_url, os.path.join(tmp_dir, "repo.git"))
+                os.rename(os.path.join(tmp_dir, "repo.git"), path)
+            finally:
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+        with _updated_lock:
+            _updated.add(repo_url)
+    return str(path)
+
+@contextmanager
+def local_repository(repo_url: str) -> Iterator[str]:
+    """
+    Fornece um caminho local para o repositório. Repositórios remotos usam
+    o espelho mantido no cache (ver mirrored_repository).
+    """
+    yield mirrored_repository(repo_url)
+
+# repositórios abertos pelo PyDriller e mantidos entre comandos pelo servidor
+# (ver keep_git_repositories), pelo caminho absoluto e pelo inode: um
+# repositório apagado e clonado de novo no mesmo caminho ganha outro Git
+_kept_repositories: Optional[Dict[Tuple[str, int, int], Git]] = None
+# cada Git mantém até dois `git cat-file` abertos: os menos usados são fechados
+KEPT_REPOSITORIES = 8
+
+@contextmanager
+def keep_git_repositories() -> Iterator[None]:
+    """
+    Durante o bloco, git_repository reaproveita o Git do PyDriller de cada
+    repositório, com os processos `git cat-file` que ele mantém abertos, em
+    vez de abrir e fechar um a cada comando (usado por `minero serve`).
+    """
+    global _kept_repositories
+    _kept_repositories = {}
+    try:
+        yield
+    finally:
+        repositories, _kept_repositories = _kept_repositories, None
+        for git in repositories.values():
+            git.clear()
+
+@contextmanager
+def git_repository(repo_path: str) -> Iterator[Git]:
+    """
+    Git do PyDriller para um repositório local, fechado ao fim do bloco (ou
+    mantido para os próximos comandos, dentro de keep_git_repositories).
+    """
+    if _kept_repositories is None:
+        git = Git(repo_path)
+        try:
+            yield git
+        finally:
+            git.clear()
+        return
+
+    # caminhos relativos (ex.: ".") dependem do diretório de cada comando
+    repo_path = os.path.realpath(repo_path)
+    stat = os.stat(repo_path)
+    key = (repo_path, stat.st_dev, stat.st_ino)
+    # reinserido no fim: a ordem do dicionário é a do uso mais recente
+    git = _kept_repositories.pop(key, None) or Git(repo_path)
+    _kept_repositories[key] = git
+    while len(_kept_repositories) > KEPT_REPOSITORIES:
+        _kept_repositories.pop(next(iter(_kept_repositories))).clear()
+    yield git
+
+# separadores dos registros e dos campos no --format do git log: não aparecem
+# em hashes, nomes de autores nem caminhos
+RECORD_SEPARATOR = "\x1e"
+FIELD_SEPARATOR = "\x1f"
+
+def git_lines(repo_path: str, *args: str) -> Iterator[str]:
+    """
+    Executa um comando git no repositório e devolve a saída linha a linha,
+    à medida que é produzida, sem guardar a saída inteira em memória.
+    """
+    command = ["git", "-C", repo_path, "-c", "core.quotePath=false", *args]
+    # stderr vai para um arquivo temporário: um pipe cheio travaria o git
+    # enquanto a saída ainda está sendo lida
+    with tempfile.TemporaryFile() as stderr_file:
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=stderr_file,
+                                   encoding="utf-8", errors="replace")
+        finished = False
+        try:
+            for line in process.stdout:
+                yield line.rstrip("\n")
+            finished = True
+        finally:
+            if not finished:
+                # quem consome parou antes do fim (ex.: islice): o resto da saída não interessa
+                process.kill()
+            process.stdout.close()
+            returncode = process.wait()
+        if returncode != 0:
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode("utf-8", "replace")
+            raise subprocess.CalledProcessError(returncode, command, stderr=stderr)
+
+def git_output(repo_path: str, *args: str) -> List[str]:
+    """Executa um comando git curto e devolve as linhas da saída."""
+    return list(git_lines(repo_path, *args))
+
+def git_succeeds(repo_path: str, *args: str) -> bool:
+    """Executa um comando git de verificação e diz se ele terminou com sucesso."""
+    command = ["git", "-C", repo_path, *args]
+    return subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).returncode == 0
+
+def repository_id(repo_url: str) -> str:
+    """Identifica um repositório entre execuções: a URL, ou o caminho absoluto se for local."""
+    return repo_url if is_remote(repo_url) else os.path.realpath(repo_url)
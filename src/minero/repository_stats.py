@@ -0,0 +1,220 @@
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple, TypeVar
+import posixpath
+
+from .cache import AnalysisCache
+from .repository import FIELD_SEPARATOR, RECORD_SEPARATOR, git_lines, git_output, git_repository, git_succeeds
+
+T = TypeVar("T")
+
+# deve ser incrementada sempre que o formato de RepositoryStats ou
+# CommitRecord mudar, descartando os checkpoints já guardados
+STATS_VERSION = "1"
+
+@dataclass
+class RepositoryStats:
+    """
+    Agregados mostrados pelo comando generic.
+
+    Attributes:
+        total_commits: quantidade de commits alcançáveis a partir de HEAD.
+        total_files: nomes (sem diretório) dos arquivos modificados.
+        total_branches: branches locais que contêm algum desses commits.
+        authors_commit_number: commits por autor, na ordem do primeiro commit de cada um.
+    """
+    total_commits: int = 0
+    total_files: Set[str] = field(default_factory=set)
+    total_branches: Set[str] = field(default_factory=set)
+    authors_commit_number: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def total_authors(self) -> Set[str]:
+        return set(self.authors_commit_number)
+
+@dataclass
+class CommitRecord:
+    """Dados de um commit mostrados pelo comando commits."""
+    hash: str
+    msg: str
+    author: str
+    files: List[str] = field(default_factory=list)
+
+def iter_log(repo_path: str, rev: str = "HEAD") -> Iterator[Tuple[str, str, List[str]]]:
+    """
+    Percorre o histórico com um único `git log --name-only`, do commit mais
+    antigo para o mais novo, sem gerar o diff textual de nenhum commit.
+
+    Commits de merge não listam arquivos, assim como modified_files do
+    PyDriller, e renomeações são detectadas (-M) como no PyDriller.
+
+    Args:
+        repo_path: caminho local do repositório.
+        rev: revisão ou intervalo de revisões (ex.: "HEAD", "abc..HEAD").
+    Returns:
+        Um gerador de tuplas (hash, autor, caminhos modificados).
+    """
+    current: Optional[Tuple[str, str, List[str]]] = None
+    lines = git_lines(repo_path, "log", "--reverse", "-M", "--name-only",
+                      f"--format={RECORD_SEPARATOR}%H{FIELD_SEPARATOR}%an", rev, "--")
+    for line in lines:
+        if line.startswith(RECORD_SEPARATOR):
+            if current is not None:
+                yield current
+            commit_hash, author = line[1:].split(FIELD_SEPARATOR, 1)
+            current = (commit_hash, author, [])
+        elif line and current is not None:
+            current[2].append(line)
+    if current is not None:
+        yield current
+
+def list_branches(repo_path: str) -> Set[str]:
+    """
+    Branches locais que contêm algum commit do histórico de HEAD.
+
+    Em vez de um `git branch --contains` por commit, consulta apenas os
+    commits raiz: uma branch contém algum commit do histórico de HEAD se, e
+    somente se, contém uma das raízes desse histórico.
+    """
+    branches = set()
+    for root in git_output(repo_path, "rev-list", "--max-parents=0", "HEAD"):
+        for branch in git_output(repo_path, "branch", "--contains", root):
+            branches.add(branch.strip().replace("* ", ""))
+    return branches
+
+def update_stats(stats: RepositoryStats, log: Iterator[Tuple[str, str, List[str]]]) -> Optional[str]:
+    """
+    Acumula os commits do log nos agregados.
+
+    Returns:
+        O hash do último commit processado (ou None se o log estava vazio).
+    """
+    last_hash = None
+    for commit_hash, author, paths in log:
+        stats.total_commits += 1
+        stats.authors_commit_number[author] = stats.authors_commit_number.get(author, 0) + 1
+        for path in paths:
+            stats.total_files.add(posixpath.basename(path))
+        last_hash = commit_hash
+    return last_hash
+
+def head_commit(repo_path: str) -> Optional[str]:
+    """Hash do commit apontado por HEAD, ou None em um repositório sem commits."""
+    if not git_succeeds(repo_path, "rev-parse", "--verify", "--quiet", "HEAD^{commit}"):
+        return None
+    return git_output(repo_path, "rev-parse", "HEAD")[0]
+
+def is_fast_forward(repo_path: str, old_head: str, head: str) -> bool:
+    """
+    Diz se o histórico atual apenas estende o histórico até old_head. Se o
+    commit não existe mais ou deixou de ser ancestral de HEAD (rebase,
+    reset, force push), o histórico foi reescrito.
+    """
+    return (git_succeeds(repo_path, "cat-file", "-e", f"{old_head}^{{commit}}")
+            and git_succeeds(repo_path, "merge-base", "--is-ancestor", old_head, head))
+
+def incremental_checkpoint(cache: Optional[AnalysisCache], key: str, repo_path: str, head: str,
+                           build: Callable[[str], T], extend: Callable[[T, str], T]) -> T:
+    """
+    Valor calculado sobre o histórico de HEAD e guardado no cache junto com
+    o último commit processado: as execuções seguintes leem apenas os
+    commits novos (old..HEAD). Se o histórico foi reescrito, tudo é recalculado.
+
+    Args:
+        cache: cache onde fica o checkpoint, ou None para recalcular tudo.
+        key: chave do checkpoint (com a versão do formato do valor).
+        repo_path: caminho local do repositório.
+        head: hash do commit apontado por HEAD.
+        build: calcula o valor a partir do histórico de uma revisão.
+        extend: atualiza o valor guardado com um intervalo ("old..HEAD") e o devolve.
+    Returns:
+        O valor atualizado até HEAD.
+    """
+    checkpoint = cache.get_checkpoint(key) if cache is not None else None
+
+    if checkpoint is not None and is_fast_forward(repo_path, checkpoint[0], head):
+        last_hash, value = checkpoint
+        if last_hash != head:
+            value = extend(value, f"{last_hash}..{head}")
+    else:
+        value = build(head)
+
+    if cache is not None:
+        cache.put_checkpoint(key, head, value)
+    return value
+
+def collect_repository_stats(repo_path: str, cache: Optional[AnalysisCache] = None,
+                             repo_key: Optional[str] = None) -> RepositoryStats:
+    """
+    Calcula as estatísticas do comando generic em uma única passada
+    pelo log do repositório, incremental com cache (ver incremental_checkpoint).
+    As branches são sempre consultadas de novo, pois mudam sem novos commits.
+
+    Args:
+        repo_path: caminho local do repositório.
+        cache: cache onde ficam os checkpoints, ou None para recalcular tudo.
+        repo_key: identificação do repositório no cache (ver repository_id).
+    Returns:
+        Um RepositoryStats com os totais.
+    """
+    head = head_commit(repo_path)
+    if head is None:
+        return RepositoryStats()
+
+    def extend(stats: RepositoryStats, rev: str) -> RepositoryStats:
+        update_stats(stats, iter_log(repo_path, rev))
+        return stats
+
+    stats = incremental_checkpoint(cache, f"generic|{STATS_VERSION}|{repo_key or repo_path}", repo_path, head,
+                                   lambda rev: extend(RepositoryStats(), rev), extend)
+    stats.total_branches = list_branches(repo_path)
+    return stats
+
+def first_commits(repo_path: str, count: int = 10, cache: Optional[AnalysisCache] = None,
+                  repo_key: Optional[str] = None) -> List[CommitRecord]:
+    """
+    Os `count` commits mais antigos do histórico, na ordem do PyDriller.
+
+    Só esses commits são carregados pelo PyDriller (e têm os arquivos
+    modificados calculados); o restante do histórico é percorrido apenas
+    pelo `git rev-list`. Com cache, se HEAD não mudou desde a última
+    execução a lista guardada é reaproveitada sem consultar o git, e
+    commits já conhecidos não são carregados de novo.
+
+    Args:
+        repo_path: caminho local do repositório.
+        count: quantidade de commits.
+        cache: cache onde ficam os checkpoints, ou None.
+        repo_key: identificação do repositório no cache (ver repository_id).
+    Returns:
+        Uma lista de CommitRecord, do mais antigo para o mais novo.
+    """
+    head = head_commit(repo_path)
+    if head is None:
+        return []
+
+    key = f"commits|{STATS_VERSION}|{count}|{repo_key or repo_path}"
+    checkpoint = cache.get_checkpoint(key) if cache is not None else None
+    if checkpoint is not None and checkpoint[0] == head:
+        return checkpoint[1]
+
+    known = {record.hash: record for record in checkpoint[1]} if checkpoint is not None else {}
+    hashes = list(islice(git_lines(repo_path, "rev-list", "--reverse", head), count))
+
+    records = []
+    git = None
+    with ExitStack() as stack:
+        for commit_hash in hashes:
+            record = known.get(commit_hash)
+            if record is None:
+                # o repositório só é aberto se algum commit não estiver no checkpoint
+                git = git or stack.enter_context(git_repository(repo_path))
+                commit = git.get_commit(commit_hash)
+                record = CommitRecord(commit.hash, commit.msg, commit.author.name,
+                                      [file.filename for file in commit.modified_files])
+            records.append(record)
+
+    if cache is not None:
+        cache.put_checkpoint(key, head, records)
+    return records
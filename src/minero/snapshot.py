@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional
+import subprocess
+
+from .repository import git_lines, git_output, local_repository
+
+# modos de arquivos comuns no git (symlinks e submódulos ficam de fora)
+FILE_MODES = ("100644", "100755")
+
+class BlobReader:
+    """
+    Lê o conteúdo de blobs direto do banco de objetos do git com um único
+    processo `git cat-file --batch`, sem checkout e sem diff.
+    """
+
+    def __init__(self, repo_path: str):
+        self._process = subprocess.Popen(
+            ["git", "-C", repo_path, "cat-file", "--batch"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+        )
+
+    def read(self, sha: str) -> bytes:
+        self._process.stdin.write(sha.encode("ascii") + b"\n")
+        self._process.stdin.flush()
+        header = self._process.stdout.readline().split()
+        if len(header) != 3:
+            raise KeyError(f"Blob não encontrado: {sha}")
+        data = self._process.stdout.read(int(header[2]))
+        self._process.stdout.read(1)  # quebra de linha após o conteúdo
+        return data
+
+    def close(self) -> None:
+        self._process.stdin.close()
+        self._process.stdout.close()
+        # processos do pool criados por fork herdam o pipe de entrada, então o
+        # git pode não receber EOF: encerra o processo em vez de esperar por ele
+        self._process.kill()
+        self._process.wait()
+
+class SnapshotFile:
+    """
+    Arquivo da árvore de um commit, com a mesma interface usada dos
+    ModifiedFile do PyDriller (filename, source_code) e o sha do blob para o
+    cache. O conteúdo só é lido quando source_code é acessado, e não fica
+    guardado no objeto.
+
+    Como a análise cobre a árvore inteira, `filename` é o caminho completo
+    do arquivo, para distinguir arquivos de mesmo nome em diretórios diferentes.
+    """
+
+    def __init__(self, path: str, blob_sha: str, reader: BlobReader):
+        self.filename = path
+        self.new_path = path
+        self.blob_sha = blob_sha
+        self._reader = reader
+
+    @property
+    def source_code(self) -> str:
+        # mesma decodificação do PyDriller
+        return self._reader.read(self.blob_sha).decode("utf-8", "ignore")
+
+@dataclass
+class SnapshotCommit:
+    """Pseudo-commit cujos arquivos "modificados" são todos os arquivos da árvore."""
+    hash: str
+    msg: str
+    modified_files: List[SnapshotFile] = field(default_factory=list)
+
+def tree_files(repo_path: str, commit_hash: str, suffix: str = ".py") -> Iterator[tuple]:
+    """
+    Lista os blobs da árvore de um commit com `git ls-tree -r`, sem ler
+    nenhum conteúdo.
+
+    Returns:
+        Um gerador de tuplas (caminho, sha do blob) dos arquivos terminados em `suffix`.
+    """
+    for line in git_lines(repo_path, "ls-tree", "-r", "--full-tree", commit_hash):
+        info, path = line.split("\t", 1)
+        mode, kind, sha = info.split()
+        if kind == "blob" and mode in FILE_MODES and path.endswith(suffix):
+            yield path, sha
+
+def snapshot_commits(repo_url: str, rev: Optional[str] = None) -> Iterator[SnapshotCommit]:
+    """
+    Gera um único pseudo-commit com todos os arquivos .py da árvore de `rev`
+    (padrão: HEAD), para analisar o repositório inteiro em vez de apenas os
+    arquivos modificados.
+
+    Os blobs são lidos sob demanda do banco de objetos, por um único
+    `git cat-file --batch`, enquanto os analisadores consomem o commit.
+
+    Args:
+        repo_url: O caminho (ou URL) do repositorio.
+        rev: commit, tag ou branch (padrão: HEAD).
+    Returns:
+        Um gerador com um SnapshotCommit.
+    """
+    rev = rev or "HEAD"
+    with local_repository(repo_url) as path:
+        commit_hash = git_output(path, "rev-parse", "--verify", f"{rev}^{{commit}}")[0]
+        subject = git_output(path, "show", "-s", "--format=%s", commit_hash)
+        reader = BlobReader(path)
+        try:
+            files = [SnapshotFile(file_path, sha, reader) for file_path, sha in tree_files(path, commit_hash)]
+            yield SnapshotCommit(commit_hash, subject[0] if subject else "", files)
+        finally:
+            reader.close()
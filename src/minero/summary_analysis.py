@@ -0,0 +1,385 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import ast
+import math
+
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
+from .analysis_engine import COMPLEXITY_THRESHOLD, LINE_LIMIT, PARAM_LIMIT
+from .cache import analysis_cache
+from .cognitive_analysis import function_complexities
+from .columns import metric_column
+from .commit_selection import describe_selection, select_commits
+from .ndjson_output import is_ndjson, write_record
+from .options import AnalysisOptions
+from .param_analysis import count_function_params
+from .parallel import iter_analyze_files, worker_pool
+
+console = Console()
+
+METRICS = ("complexity", "loc", "param_count")
+
+METRIC_LABELS = {
+    "complexity": "Complexidade",
+    "loc": "Linhas",
+    "param_count": "Parâmetros",
+}
+
+# limites fixos usados pelos comandos individuais, substituídos por um percentil com --percentile
+FIXED_THRESHOLDS = {
+    "complexity": COMPLEXITY_THRESHOLD,
+    "loc": LINE_LIMIT,
+    "param_count": PARAM_LIMIT,
+}
+
+PERCENTILES = (50, 75, 90, 95, 99)
+
+# início de cada faixa do histograma; a última faixa não tem fim
+HISTOGRAM_EDGES = {
+    "complexity": (0, 1, 2, 5, 10, 15, 25, 50),
+    "loc": (1, 5, 10, 25, 50, 100, 200, 500),
+    "param_count": (0, 1, 2, 3, 4, 5, 7, 10),
+}
+
+_BAR_WIDTH = 30
+
+@dataclass
+class MetricColumns:
+    """
+    Métricas de um conjunto de funções em colunas contíguas: a i-ésima
+    função é formada pelo i-ésimo valor de cada array. Juntar colunas
+    (extend) e agregá-las (sum, max, sorted) roda em C, sem um objeto
+    Python por função.
+    """
+    complexity: array = field(default_factory=metric_column)
+    loc: array = field(default_factory=metric_column)
+    param_count: array = field(default_factory=metric_column)
+
+    def extend(self, other: MetricColumns) -> None:
+        self.complexity.extend(other.complexity)
+        self.loc.extend(other.loc)
+        self.param_count.extend(other.param_count)
+
+    def column(self, metric: str) -> array:
+        return getattr(self, metric)
+
+    def __len__(self) -> int:
+        return len(self.complexity)
+
+@dataclass
+class MetricSummary:
+    """
+    Distribuição de uma métrica.
+
+    Attributes:
+        metric: nome da métrica ("complexity", "loc" ou "param_count").
+        functions: quantidade de funções.
+        mean: média.
+        maximum: maior valor.
+        percentiles: valor de cada percentil de PERCENTILES.
+        histogram: quantidade de funções em cada faixa de HISTOGRAM_EDGES.
+        threshold: limite usado (fixo ou o valor do percentil escolhido).
+        above_threshold: funções acima do limite.
+    """
+    metric: str
+    functions: int
+    mean: float
+    maximum: int
+    percentiles: Dict[int, float]
+    histogram: List[int]
+    threshold: float
+    above_threshold: int
+
+def function_metrics(source_code: str, filename: str) -> Optional[MetricColumns]:
+    """
+    Args:
+        source_code: string com o código fonte python a ser analisado
+        filename: nome do arquivo analisado
+    Returns:
+        As colunas de métricas das funções do arquivo, ou None se o código não puder ser parseado.
+    """
+    try:
+        tree = ast.parse(source_code)
+    except (SyntaxError, ValueError):
+        return None
+
+    columns = MetricColumns()
+    for node, complexity in function_complexities(tree):
+        columns.complexity.append(complexity)
+        columns.loc.append(node.end_lineno - node.lineno + 1)
+        columns.param_count.append(count_function_params(node))
+    return columns
+
+def directory_of(path: str, depth: int = 1) -> str:
+    """Os `depth` primeiros diretórios do caminho, ou "." para arquivos na raiz."""
+    parts = path.split("/")[:-1]
+    return "/".join(parts[:depth]) or "."
+
+def percentile(ordered: Sequence[int], q: float) -> float:
+    """
+    Percentil `q` (0 a 100) de valores já ordenados, com interpolação linear
+    entre os dois valores mais próximos (o método padrão do NumPy).
+    """
+    position = (len(ordered) - 1) * q / 100
+    low = math.floor(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+def histogram(ordered: Sequence[int], edges: Sequence[int]) -> List[int]:
+    """Quantidade de valores em cada faixa [edges[i], edges[i + 1]), com uma busca binária por limite."""
+    bounds = [bisect_left(ordered, edge) for edge in edges] + [len(ordered)]
+    return [end - start for start, end in zip(bounds, bounds[1:])]
+
+def summarize(values: array, metric: str, threshold_percentile: Optional[float] = None) -> MetricSummary:
+    """
+    Agrega uma coluna inteira de uma vez: uma única ordenação serve para
+    os percentis, o histograma e a contagem acima do limite.
+
+    Args:
+        values: coluna com a métrica de cada função (não vazia).
+        metric: nome da métrica.
+        threshold_percentile: se informado, o limite passa a ser esse percentil
+            da própria distribuição, em vez do limite fixo da métrica.
+    Returns:
+        Um MetricSummary.
+    """
+    ordered = sorted(values)
+    if threshold_percentile is None:
+        threshold = FIXED_THRESHOLDS[metric]
+    else:
+        threshold = percentile(ordered, threshold_percentile)
+    return MetricSummary(
+        metric=metric,
+        functions=len(ordered),
+        mean=sum(values) / len(ordered),
+        maximum=ordered[-1],
+        percentiles={q: percentile(ordered, q) for q in PERCENTILES},
+        histogram=histogram(ordered, HISTOGRAM_EDGES[metric]),
+        threshold=threshold,
+        above_threshold=len(ordered) - bisect_right(ordered, threshold),
+    )
+
+def collect_metrics(commits: Iterable, depth: int = 1, cache=None, pool=None,
+                    newest_first: bool = False) -> Tuple[Dict[str, MetricColumns], int]:
+    """
+    Junta as métricas das funções por diretório. Cada arquivo conta uma
+    única vez, na versão mais nova encontrada: num intervalo de commits,
+    as versões anteriores e os arquivos removidos ou renomeados depois não contam.
+
+    Args:
+        commits: commits (ou pseudo-commits) a serem percorridos.
+        depth: quantos níveis de diretório usar no agrupamento.
+        cache: cache a ser usado, ou None.
+        pool: pool criado por worker_pool, ou None para analisar em série.
+        newest_first: os commits vêm do mais novo para o mais antigo (ex.: last_commits);
+            as versões mais antigas de um arquivo já visto nem chegam a ser analisadas.
+    Returns:
+        Uma tupla (colunas de cada diretório, arquivos que não puderam ser parseados).
+    """
+    files: Dict[str, Optional[MetricColumns]] = {}
+    # com newest_first, caminhos cuja versão final já é conhecida
+    decided = set()
+    for commit in commits:
+        python_files = []
+        for modified_file in commit.modified_files:
+            new_path = modified_file.new_path
+            old_path = getattr(modified_file, "old_path", None)
+            if newest_first:
+                if new_path in decided:
+                    continue
+                decided.update(path for path in (new_path, old_path) if path)
+            elif old_path and old_path != new_path:
+                # removido ou renomeado neste commit
+                files.pop(old_path, None)
+            if new_path and new_path.endswith(".py"):
+                python_files.append(modified_file)
+        for modified_file, columns in iter_analyze_files(python_files, function_metrics, cache=cache, pool=pool):
+            files[modified_file.new_path] = columns
+
+    directories: Dict[str, MetricColumns] = {}
+    parse_errors = 0
+    for path, columns in files.items():
+        if columns is None:
+            parse_errors += 1
+            continue
+        directory = directory_of(path, depth)
+        target = directories.get(directory)
+        if target is None:
+            target = directories[directory] = MetricColumns()
+        target.extend(columns)
+    return directories, parse_errors
+
+def _bucket_label(edges: Sequence[int], index: int) -> str:
+    start = edges[index]
+    if index == len(edges) - 1:
+        return f"≥ {start}"
+    end = edges[index + 1] - 1
+    return str(start) if start == end else f"{start}–{end}"
+
+def _format_value(value: float) -> str:
+    return f"{value:.0f}" if float(value).is_integer() else f"{value:.1f}"
+
+def _directory_rows(directories: Dict[str, MetricColumns], thresholds: Dict[str, float]) -> List[Dict[str, object]]:
+    """Mediana, P90 e máximo de cada métrica por diretório, do pior P90 de complexidade para o melhor."""
+    rows = []
+    for directory, columns in directories.items():
+        if not columns:
+            continue
+        row: Dict[str, object] = {"directory": directory, "functions": len(columns)}
+        for metric in METRICS:
+            ordered = sorted(columns.column(metric))
+            row[f"{metric}_p50"] = percentile(ordered, 50)
+            row[f"{metric}_p90"] = percentile(ordered, 90)
+            row[f"{metric}_max"] = ordered[-1]
+            row[f"{metric}_above_threshold"] = len(ordered) - bisect_right(ordered, thresholds[metric])
+        rows.append(row)
+    rows.sort(key=lambda row: (-row["complexity_p90"], row["directory"]))
+    return rows
+
+def show_summary(repo_url: str, commit_hash: Optional[str] = None, threshold_percentile: Optional[float] = None,
+                 depth: int = 1, options: Optional[AnalysisOptions] = None) -> None:
+    """
+    Mostra a distribuição da complexidade cognitiva, das linhas e dos
+    parâmetros das funções: percentis, histogramas e um resumo por diretório.
+
+    As métricas de cada arquivo são guardadas em colunas (array) e juntadas
+    por diretório; os agregados são calculados coluna a coluna, com uma
+    ordenação por coluna, sem percorrer as funções em Python.
+
+    Args:
+        repo_url: O caminho (ou URL) do repositorio.
+        commit_hash: Hash do commit a ser analisado (ou None para usar --from/--to, --last ou a árvore de HEAD).
+        threshold_percentile: se informado, substitui os limites fixos (12, 200 e 5)
+            pelo valor desse percentil de cada métrica.
+        depth: quantos níveis de diretório usar no resumo por diretório.
+        options: opções de execução (cache, paralelismo, seleção de commits, --top e formato de saída).
+    """
+    options = options or AnalysisOptions()
+    ndjson = is_ndjson(options)
+
+    if not ndjson:
+        console.print(Panel.fit(
+            f"[bold cyan] Distribuição das métricas[/bold cyan]\n"
+            f"Repositório: [yellow]{repo_url}[/yellow]\n"
+            f"Commit: [green]{describe_selection(commit_hash, options)}[/green]",
+            style="blue"
+        ))
+
+    commits = select_commits(repo_url, commit_hash, options)
+    # só o --last percorre do mais novo para o mais antigo (ver select_commits)
+    newest_first = bool(options.last) and not (options.staged or options.worktree or options.snapshot)
+
+    with analysis_cache(options.use_cache) as cache, worker_pool(options.jobs) as pool:
+        directories, parse_errors = collect_metrics(commits, depth, cache, pool, newest_first)
+
+    total = MetricColumns()
+    for columns in directories.values():
+        total.extend(columns)
+
+    if not total:
+        if not ndjson:
+            console.print("Nenhuma função Python encontrada.")
+        return
+
+    summaries = [summarize(total.column(metric), metric, threshold_percentile) for metric in METRICS]
+    thresholds = {summary.metric: summary.threshold for summary in summaries}
+    rows = _directory_rows(directories, thresholds)
+    if options.top:
+        rows = rows[:options.top]
+
+    if ndjson:
+        _write_summary(summaries, rows, threshold_percentile)
+        return
+
+    _print_summary(summaries, rows, threshold_percentile, parse_errors)
+
+def _write_summary(summaries: List[MetricSummary], rows: List[Dict[str, object]], threshold_percentile: Optional[float]) -> None:
+    for summary in summaries:
+        record = {
+            "kind": "metric_summary",
+            "metric": summary.metric,
+            "functions": summary.functions,
+            "mean": summary.mean,
+            "max": summary.maximum,
+        }
+        record.update({f"p{q}": value for q, value in summary.percentiles.items()})
+        record.update({
+            "threshold": summary.threshold,
+            "threshold_percentile": threshold_percentile,
+            "above_threshold": summary.above_threshold,
+        })
+        write_record(record)
+    for summary in summaries:
+        edges = HISTOGRAM_EDGES[summary.metric]
+        for index, count in enumerate(summary.histogram):
+            write_record({
+                "kind": "metric_histogram",
+                "metric": summary.metric,
+                "min": edges[index],
+                "max": edges[index + 1] - 1 if index + 1 < len(edges) else None,
+                "functions": count,
+            })
+    for row in rows:
+        write_record({"kind": "directory_summary", **row})
+
+def _print_summary(summaries: List[MetricSummary], rows: List[Dict[str, object]], threshold_percentile: Optional[float],
+                   parse_errors: int) -> None:
+    table = Table(show_header=True, header_style="bold magenta", title="Percentis")
+    table.add_column("Métrica", no_wrap=True)
+    table.add_column("Média", justify="right")
+    for q in PERCENTILES:
+        table.add_column(f"P{q}", justify="right")
+    table.add_column("Máx.", justify="right")
+    table.add_column("Limite", justify="right")
+    table.add_column("Acima", justify="right")
+    for summary in summaries:
+        table.add_row(
+            METRIC_LABELS[summary.metric],
+            f"{summary.mean:.1f}",
+            *(_format_value(summary.percentiles[q]) for q in PERCENTILES),
+            str(summary.maximum),
+            _format_value(summary.threshold),
+            f"{summary.above_threshold} ({summary.above_threshold / summary.functions:.1%})",
+        )
+    console.print(table)
+
+    for summary in summaries:
+        edges = HISTOGRAM_EDGES[summary.metric]
+        largest = max(summary.histogram) or 1
+        histogram_table = Table(show_header=True, header_style="bold magenta", title=f"{METRIC_LABELS[summary.metric]} por função")
+        histogram_table.add_column("Faixa", justify="right")
+        histogram_table.add_column("Funções", justify="right")
+        histogram_table.add_column("")
+        for index, count in enumerate(summary.histogram):
+            histogram_table.add_row(_bucket_label(edges, index), str(count), "█" * round(_BAR_WIDTH * count / largest))
+        console.print(histogram_table)
+
+    directory_table = Table(show_header=True, header_style="bold magenta", title="Por diretório")
+    directory_table.add_column("Diretório", overflow="fold")
+    directory_table.add_column("Funções", justify="right")
+    directory_table.add_column("Compl. P50", justify="right")
+    directory_table.add_column("Compl. P90", justify="right")
+    directory_table.add_column("Compl. máx.", justify="right")
+    directory_table.add_column("Linhas P90", justify="right")
+    directory_table.add_column("Parâm. P90", justify="right")
+    directory_table.add_column("Compl. acima", justify="right")
+    for row in rows:
+        directory_table.add_row(
+            str(row["directory"]), str(row["functions"]),
+            _format_value(row["complexity_p50"]), _format_value(row["complexity_p90"]), str(row["complexity_max"]),
+            _format_value(row["loc_p90"]), _format_value(row["param_count_p90"]), str(row["complexity_above_threshold"]),
+        )
+    console.print(directory_table)
+
+    functions = summaries[0].functions
+    limits = "percentil " + _format_value(threshold_percentile) if threshold_percentile is not None else "limites fixos"
+    message = f"{functions} funções analisadas; limites: {limits}."
+    if parse_errors:
+        message += f" {parse_errors} arquivo(s) não puderam ser parseados."
+    console.print(message)
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from typing import Any, Callable, Generic, List, Optional, Tuple, TypeVar
+import heapq
+
+T = TypeVar("T")
+
+class TopK(Generic[T]):
+    """
+    Guarda os `k` maiores itens de um fluxo, segundo `key`, em um heap
+    mínimo de tamanho k: a memória é O(k) qualquer que seja a quantidade de
+    itens recebidos. Com k None, guarda todos (para ordenar ao final).
+
+    Em caso de empate, fica o item recebido primeiro, como em uma ordenação
+    estável do fluxo inteiro.
+    """
+
+    def __init__(self, k: Optional[int], key: Callable[[T], Any]):
+        self.k = k
+        self.key = key
+        self.seen = 0
+        self._entries: List[Tuple[Any, int, T]] = []
+
+    def push(self, item: T) -> None:
+        # o contador negativo desempata: entre chaves iguais, o mais recente é o menor do heap
+        entry = (self.key(item), -self.seen, item)
+        self.seen += 1
+        if self.k is None:
+            self._entries.append(entry)
+        elif len(self._entries) < self.k:
+            heapq.heappush(self._entries, entry)
+        elif entry[:2] > self._entries[0][:2]:
+            heapq.heapreplace(self._entries, entry)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def truncated(self) -> bool:
+        """Diz se algum item recebido ficou de fora."""
+        return self.seen > len(self._entries)
+
+    def items(self) -> List[T]:
+        """Os itens guardados, do maior para o menor."""
+        return [item for _, _, item in sorted(self._entries, key=lambda entry: (entry[0], entry[1]), reverse=True)]
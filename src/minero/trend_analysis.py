@@ -0,0 +1,255 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+from typing import Dict, Iterator, List, Optional, Tuple
+import ast
+
+from rich.console import Console
+from rich.panel import Panel
+from rich.table import Table
+
+from .cache import ANALYZER_VERSION, AnalysisCache, analysis_cache
+from .cognitive_analysis import function_complexities
+from .delta_analysis import index_functions, measure_function
+from .ndjson_output import is_ndjson, write_record
+from .options import AnalysisOptions
+from .parallel import BATCH_PER_WORKER, batch_size, iter_analyze_files, worker_pool
+from .columns import metric_column
+from .repository import RECORD_SEPARATOR, git_lines, local_repository, repository_id
+from .repository_stats import head_commit, incremental_checkpoint
+from .snapshot import FILE_MODES, BlobReader, SnapshotFile
+
+console = Console()
+
+# deve ser incrementada sempre que o formato de TrendHistory mudar,
+# descartando os históricos já guardados
+TREND_VERSION = "1"
+
+@dataclass
+class FunctionSeries:
+    """
+    Série temporal das métricas de uma função, em colunas: o i-ésimo ponto
+    é formado pelo i-ésimo valor de cada array. `commits` guarda índices em
+    TrendHistory.commits, não os hashes.
+    """
+    commits: array = field(default_factory=metric_column)
+    complexity: array = field(default_factory=metric_column)
+    loc: array = field(default_factory=metric_column)
+    param_count: array = field(default_factory=metric_column)
+
+    def append(self, commit_index: int, complexity: int, loc: int, param_count: int) -> None:
+        self.commits.append(commit_index)
+        self.complexity.append(complexity)
+        self.loc.append(loc)
+        self.param_count.append(param_count)
+
+    def __len__(self) -> int:
+        return len(self.commits)
+
+@dataclass
+class TrendHistory:
+    """
+    Métricas de todas as funções ao longo do histórico.
+
+    Attributes:
+        commits: hashes dos commits que modificaram algum arquivo .py, do mais antigo para o mais novo.
+        series: série de cada função, pela chave (arquivo, nome qualificado).
+    """
+    commits: List[str] = field(default_factory=list)
+    series: Dict[Tuple[str, str], FunctionSeries] = field(default_factory=dict)
+
+def measure_functions(source_code: str, filename: str) -> List[Tuple[str, int, int, int]]:
+    """
+    Args:
+        source_code: string com o código fonte python a ser analisado
+        filename: nome do arquivo analisado
+    Returns:
+        Uma lista de tuplas (nome qualificado, complexidade, LOC, parâmetros),
+        vazia se o código não puder ser parseado.
+    """
+    try:
+        tree = ast.parse(source_code)
+    except (SyntaxError, ValueError):
+        return []
+
+    complexities = dict(function_complexities(tree))
+    results = []
+    for name, node in index_functions(tree).items():
+        function = measure_function(node, name, filename, complexities[node])
+        results.append((name, function.complexity, function.end_lineno - function.lineno + 1, function.param_count))
+    return results
+
+def iter_python_changes(repo_path: str, rev: str) -> Iterator[Tuple[str, List[Tuple[str, str]]]]:
+    """
+    Percorre o histórico com um único `git log --raw`, do commit mais antigo
+    para o mais novo, obtendo o sha do blob novo de cada arquivo .py
+    modificado sem gerar nenhum diff textual. Arquivos removidos e commits
+    de merge não geram entradas, como em modified_files do PyDriller.
+
+    Returns:
+        Um gerador de tuplas (hash, [(caminho, sha do blob)]).
+    """
+    current: Optional[Tuple[str, List[Tuple[str, str]]]] = None
+    lines = git_lines(repo_path, "log", "--reverse", "-M", "--raw", "--no-abbrev",
+                      f"--format={RECORD_SEPARATOR}%H", rev, "--")
+    for line in lines:
+        if line.startswith(RECORD_SEPARATOR):
+            if current is not None:
+                yield current
+            current = (line[1:], [])
+        elif line.startswith(":") and current is not None:
+            info, paths = line.split("\t", 1)
+            _, new_mode, _, new_sha, status = info[1:].split()
+            path = paths.split("\t")[-1]
+            if status != "D" and new_mode in FILE_MODES and path.endswith(".py"):
+                current[1].append((path, new_sha))
+    if current is not None:
+        yield current
+
+def update_history(history: TrendHistory, repo_path: str, rev: str,
+                   cache: Optional[AnalysisCache] = None, pool=None) -> None:
+    """
+    Acrescenta ao histórico os pontos dos commits de `rev`.
+
+    O conteúdo de cada blob é lido do banco de objetos por um único
+    `git cat-file --batch` e os arquivos de vários commits são analisados
+    juntos, em lotes, para manter o pool ocupado mesmo com commits pequenos.
+    """
+    size = batch_size(pool) if pool is not None else BATCH_PER_WORKER
+    reader = BlobReader(repo_path)
+    pending: List[Tuple[int, SnapshotFile]] = []
+
+    def flush() -> None:
+        files = [f for _, f in pending]
+        results = iter_analyze_files(files, measure_functions, cache=cache, pool=pool, skip_empty=True)
+        for (commit_index, f), (_, functions) in zip(pending, results):
+            for name, complexity, loc, param_count in functions or ():
+                key = (f.filename, name)
+                series = history.series.get(key)
+                if series is None:
+                    series = history.series[key] = FunctionSeries()
+                series.append(commit_index, complexity, loc, param_count)
+        pending.clear()
+
+    try:
+        for commit_hash, files in iter_python_changes(repo_path, rev):
+            if not files:
+                continue
+            commit_index = len(history.commits)
+            history.commits.append(commit_hash)
+            pending.extend((commit_index, SnapshotFile(path, sha, reader)) for path, sha in files)
+            if len(pending) >= size:
+                flush()
+        flush()
+    finally:
+        reader.close()
+
+def collect_trend_history(repo_path: str, cache: Optional[AnalysisCache] = None,
+                          repo_key: Optional[str] = None, pool=None) -> TrendHistory:
+    """
+    Calcula as séries de todas as funções do histórico de HEAD, incremental
+    com cache (ver incremental_checkpoint).
+
+    Args:
+        repo_path: caminho local do repositório.
+        cache: cache onde ficam o checkpoint e os resultados por blob, ou None.
+        repo_key: identificação do repositório no cache (ver repository_id).
+        pool: pool criado por worker_pool, ou None para analisar em série.
+    Returns:
+        Um TrendHistory com as séries.
+    """
+    head = head_commit(repo_path)
+    if head is None:
+        return TrendHistory()
+
+    def extend(history: TrendHistory, rev: str) -> TrendHistory:
+        update_history(history, repo_path, rev, cache, pool)
+        return history
+
+    return incremental_checkpoint(cache, f"trend|{TREND_VERSION}|{ANALYZER_VERSION}|{repo_key or repo_path}",
+                                  repo_path, head, lambda rev: extend(TrendHistory(), rev), extend)
+
+def matching_series(history: TrendHistory, pattern: Optional[str] = None) -> List[Tuple[Tuple[str, str], FunctionSeries]]:
+    """Séries cujo nome qualificado casa com o padrão (estilo fnmatch), ordenadas por arquivo e função."""
+    return sorted(
+        (key, series) for key, series in history.series.items()
+        if pattern is None or fnmatchcase(key[1], pattern)
+    )
+
+def show_function_trend(repo_url: str, function_pattern: Optional[str] = None,
+                        options: Optional[AnalysisOptions] = None) -> None:
+    """
+    Args:
+        repo_url: O caminho (ou URL) do repositorio.
+        function_pattern: padrão do nome qualificado das funções (ex.: "Classe.*"), ou None para todas.
+        options: opções de execução (cache, paralelismo e formato de saída).
+    Returns:
+        Sem padrão, um resumo da evolução de cada função; com padrão, a série
+        completa das funções encontradas.
+    """
+    options = options or AnalysisOptions()
+    ndjson = is_ndjson(options)
+    if not ndjson:
+        console.print(Panel.fit(f"Evolução das funções do repositório: {repo_url}", style="blue"))
+
+    with analysis_cache(options.use_cache) as cache, worker_pool(options.jobs) as pool, \
+            local_repository(repo_url) as repo_path:
+        history = collect_trend_history(repo_path, cache, repository_id(repo_url), pool)
+
+    selected = matching_series(history, function_pattern)
+    if ndjson:
+        for key, series in selected:
+            for point in range(len(series)):
+                write_record(_point_record(history, key, series, point))
+        return
+
+    if not selected:
+        console.print("Nenhuma função encontrada no histórico.")
+        return
+    if function_pattern is None:
+        _print_summary(history, selected)
+        return
+    for key, series in selected:
+        _print_series(history, key, series)
+
+def _point_record(history: TrendHistory, key: Tuple[str, str], series: FunctionSeries, point: int) -> dict:
+    return {
+        "kind": "trend_point",
+        "commit_hash": history.commits[series.commits[point]],
+        "file_path": key[0],
+        "function_name": key[1],
+        "complexity": series.complexity[point],
+        "loc": series.loc[point],
+        "param_count": series.param_count[point],
+    }
+
+def _print_summary(history: TrendHistory, selected) -> None:
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Arquivo", overflow="fold")
+    table.add_column("Função")
+    table.add_column("Commits")
+    table.add_column("Complexidade")
+    table.add_column("Máxima")
+    table.add_column("LOC")
+    table.add_column("Parâmetros")
+
+    for (file_path, function_name), series in selected:
+        table.add_row(file_path, function_name, str(len(series)),
+                      f"{series.complexity[0]} → {series.complexity[-1]}", str(max(series.complexity)),
+                      str(series.loc[-1]), str(series.param_count[-1]))
+    console.print(f"{len(history.commits)} commits com arquivos Python analisados.")
+    console.print(table)
+
+def _print_series(history: TrendHistory, key: Tuple[str, str], series: FunctionSeries) -> None:
+    table = Table(title=f"{key[0]}: {key[1]}", show_header=True, header_style="bold magenta")
+    table.add_column("Commit")
+    table.add_column("Complexidade")
+    table.add_column("LOC")
+    table.add_column("Parâmetros")
+
+    for point in range(len(series)):
+        table.add_row(history.commits[series.commits[point]][:10], str(series.complexity[point]),
+                      str(series.loc[point]), str(series.param_count[point]))
+    console.print(table)
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from typing import Iterator, List
+import os
+
+from .repository import git_lines, git_output, git_succeeds
+from .snapshot import FILE_MODES, BlobReader, SnapshotCommit, SnapshotFile
+
+# "hash" dos pseudo-commits, usado nos registros e nas mensagens
+STAGED = "staged"
+WORKTREE = "worktree"
+
+class WorktreeFile:
+    """
+    Arquivo do diretório de trabalho, com a mesma interface de SnapshotFile.
+    O conteúdo é lido do disco quando source_code é acessado; como ainda não
+    há um blob, não há sha e o resultado não passa pelo cache.
+    """
+
+    def __init__(self, path: str, repo_path: str):
+        self.filename = path
+        self.new_path = path
+        self.blob_sha = None
+        self._full_path = os.path.join(repo_path, path)
+
+    @property
+    def source_code(self) -> str:
+        with open(self._full_path, "rb") as f:
+            # mesma decodificação do PyDriller
+            return f.read().decode("utf-8", "ignore")
+
+def staged_files(repo_path: str, suffix: str = ".py") -> Iterator[tuple]:
+    """
+    Lista os arquivos adicionados ou modificados no índice em relação a HEAD
+    (o que o próximo commit vai conter), com `git diff --cached --raw`, sem
+    ler nenhum conteúdo. Funciona também antes do primeiro commit.
+
+    Returns:
+        Um gerador de tuplas (caminho, sha do blob no índice) dos arquivos terminados em `suffix`.
+    """
+    for line in git_lines(repo_path, "diff", "--cached", "--raw", "--no-abbrev", "--no-renames", "--diff-filter=d"):
+        info, path = line.split("\t", 1)
+        _, mode, _, sha, _ = info.split()
+        if mode in FILE_MODES and path.endswith(suffix):
+            yield path, sha
+
+def worktree_paths(repo_path: str, suffix: str = ".py") -> List[str]:
+    """
+    Lista os arquivos do diretório de trabalho diferentes de HEAD (no índice
+    ou não) e os novos ainda não rastreados, respeitando o .gitignore.
+
+    Returns:
+        Os caminhos, relativos à raiz do repositório, dos arquivos terminados em `suffix`.
+    """
+    if git_succeeds(repo_path, "rev-parse", "--verify", "-q", "HEAD"):
+        changed = git_output(repo_path, "diff", "HEAD", "--name-only", "--no-renames", "--diff-filter=d")
+    else:
+        # antes do primeiro commit tudo o que está no índice é novo
+        changed = git_output(repo_path, "ls-files", "--cached")
+    untracked = git_output(repo_path, "ls-files", "--others", "--exclude-standard")
+    paths = dict.fromkeys(changed + untracked)
+    return [path for path in paths if path.endswith(suffix) and os.path.isfile(os.path.join(repo_path, path))]
+
+def working_tree_commits(repo_path: str, staged: bool = False) -> Iterator[SnapshotCommit]:
+    """
+    Gera um único pseudo-commit com os arquivos .py alterados e ainda não
+    commitados, para uso em hooks de pre-commit: sem PyDriller, sem objetos
+    Commit e sem diff, só a lista de arquivos do git e o conteúdo de cada um.
+
+    Args:
+        repo_path: caminho de um repositório local (ou de um diretório dentro dele).
+        staged: analisa o conteúdo do índice (`git add`), lido do banco de
+            objetos e com cache pelo sha do blob; senão, o diretório de
+            trabalho, lido do disco.
+    Returns:
+        Um gerador com um SnapshotCommit cujo hash é "staged" ou "worktree".
+    """
+    if not staged:
+        # o ls-files lista a partir do diretório atual: parte da raiz do repositório
+        root = git_output(repo_path, "rev-parse", "--show-toplevel")[0]
+        files = [WorktreeFile(path, root) for path in worktree_paths(root)]
+        yield SnapshotCommit(WORKTREE, "alterações no diretório de trabalho", files)
+        return
+
+    # os caminhos do diff já são relativos à raiz, de qualquer diretório
+    reader = BlobReader(repo_path)
+    try:
+        files = [SnapshotFile(path, sha, reader) for path, sha in staged_files(repo_path)]
+        yield SnapshotCommit(STAGED, "alterações no índice", files)
+    finally:
+        reader.close()
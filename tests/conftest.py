@@ -0,0 +1,75 @@
+import os
+import subprocess
+from pathlib import Path
+from typing import Dict, Optional
+
+import pytest
+
+
+class GitRepo:
+    """Repositório git temporário usado pelos testes.
+
+    Args:
+        path: Diretório do repositório; é criado se ainda não existir.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.git("init", "-q", "-b", "main")
+        self.git("config", "user.email", "dev@example.com")
+        self.git("config", "user.name", "Dev")
+
+    def __fspath__(self) -> str:
+        return str(self.path)
+
+    def __str__(self) -> str:
+        return str(self.path)
+
+    def __truediv__(self, other) -> Path:
+        return self.path / other
+
+    def git(self, *args: str, author: Optional[str] = None) -> str:
+        """Roda um comando git no repositório e devolve a saída sem espaços nas pontas.
+
+        Args:
+            args: Argumentos do comando git.
+            author: Autor e committer no lugar de "Dev", se informado.
+
+        Returns:
+            A saída padrão do comando.
+        """
+        env = None
+        if author is not None:
+            env = dict(os.environ, GIT_AUTHOR_NAME=author, GIT_AUTHOR_EMAIL=f"{author}@example.com",
+                       GIT_COMMITTER_NAME=author, GIT_COMMITTER_EMAIL=f"{author}@example.com")
+        result = subprocess.run(["git", *args], cwd=self.path, check=True, capture_output=True, text=True, env=env)
+        return result.stdout.strip()
+
+    def commit(self, message: str, files: Optional[Dict[str, Optional[str]]] = None, author: Optional[str] = None) -> str:
+        """Grava os arquivos, adiciona todas as mudanças ao índice e faz um commit.
+
+        Args:
+            message: Mensagem do commit.
+            files: Caminho relativo -> conteúdo; None remove o arquivo.
+            author: Autor do commit no lugar de "Dev", se informado.
+
+        Returns:
+            O hash do novo commit.
+        """
+        for name, content in (files or {}).items():
+            target = self.path / name
+            if content is None:
+                target.unlink()
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_text(content)
+        self.git("add", "-A")
+        self.git("commit", "-q", "--allow-empty", "-m", message, author=author)
+        return self.git("rev-parse", "HEAD")
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    """Cria repositórios git temporários: `git_repo()` em tmp_path, `git_repo(path)` em outro diretório."""
+    return lambda path=None: GitRepo(tmp_path if path is None else path)
@@ -0,0 +1,99 @@
+import textwrap
+import pytest
+from unittest.mock import patch, MagicMock
+
+from src.minero.analysis_engine import analyze_source, show_full_analysis, FileAnalysis
+from src.minero.loc_analysis import check_function_sizes
+from src.minero.param_analysis import check_functions_num_params
+from src.minero.cognitive_analysis import analyze_functions_in_source
+from src.minero.code_smells_analysis import detect_code_smells
+
+SOURCE = textwrap.dedent("""
+    import os
+
+    # def old_function():
+    #     return 1
+
+    class Service:
+        def handle(self, a, b, c, d, e, f, g):
+            if a and b:
+                for x in c:
+                    if x > 42:
+                        return x
+            data = 3.5
+            return data
+
+    async def fetch(url):
+        while url:
+            try:
+                url = url.next
+            except ValueError:
+                break
+
+    def big():
+    """) + "    pass\n" * 201
+
+
+def test_analyze_source_matches_individual_analyzers():
+    """O motor único deve produzir os mesmos resultados que as análises separadas."""
+    analysis = analyze_source(SOURCE, "service.py")
+
+    assert analysis.long_functions() == check_function_sizes(SOURCE, "service.py")
+    assert analysis.param_violations() == check_functions_num_params(SOURCE, "service.py")
+    assert analysis.param_violations(6) == check_functions_num_params(SOURCE, "service.py", 6)
+    assert analysis.smells == detect_code_smells(SOURCE, "service.py")
+
+    expected = {(r.function_name, r.complexity) for r in analyze_functions_in_source(SOURCE, "service.py")}
+    assert {(f.function_name, f.complexity) for f in analysis.functions} == expected
+
+
+def test_analyze_source_fills_function_metrics():
+    analysis = analyze_source("def f(a, b):\n    if a:\n        return b\n", "f.py")
+
+    assert len(analysis.functions) == 1
+    f = analysis.functions[0]
+    assert (f.lineno, f.end_lineno, f.param_count, f.complexity) == (1, 3, 2, 2)
+
+
+def test_analyze_source_syntax_error():
+    analysis = analyze_source("def f(:", "broken.py")
+
+    assert analysis.parse_error
+    assert analysis.functions == []
+    assert analysis.smells == []
+
+
+def test_complex_functions_uses_threshold():
+    analysis = FileAnalysis(file_path="a.py")
+    analysis.functions = analyze_source(SOURCE, "a.py").functions
+
+    assert [f.function_name for f in analysis.complex_functions(6)] == ["handle"]
+    assert analysis.complex_functions(100) == []
+
+
+@patch("src.minero.commit_selection.Repository")
+@patch("src.minero.analysis_engine.console.print")
+def test_show_full_analysis_reads_each_file_once(mock_console_print, mock_repo):
+    mock_file = MagicMock()
+    mock_file.filename = "service.py"
+    mock_file.source_code = SOURCE
+
+    mock_md = MagicMock()
+    mock_md.filename = "README.md"
+
+    mock_commit = MagicMock()
+    mock_commit.modified_files = [mock_file, mock_md]
+    mock_repo.return_value.traverse_commits.return_value = [mock_commit]
+
+    with patch("src.minero.analysis_engine.analyze_source", wraps=analyze_source) as spy:
+        show_full_analysis("fake_repo", "abc123")
+
+    mock_repo.assert_called_once_with("fake_repo", single="abc123")
+    spy.assert_called_once_with(SOURCE, "service.py")
+
+    all_calls = str(mock_console_print.call_args_list)
+    assert "service.py" in all_calls
+    assert "README.md" not in all_calls
+    # handle (parâmetros e complexidade) e big (LOC)
+    summary_panel = mock_console_print.call_args_list[-1].args[0]
+    assert "Funções com alerta:[/bold] 2" in summary_panel.renderable
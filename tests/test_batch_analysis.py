@@ -0,0 +1,98 @@
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.minero.analysis_engine import analyze_source
+from src.minero.batch_analysis import file_records, iter_bounded, read_manifest, show_batch_analysis
+from src.minero.options import AnalysisOptions, BatchAnalysis, OutputFormat
+
+SOURCE = (
+    "def many(a, b, c, d, e, f, g):\n"
+    "    x = 1\n"
+    "    return a\n"
+    "\n"
+    "def ok(a):\n"
+    "    return a\n"
+)
+
+
+@pytest.fixture
+def manifest(tmp_path, git_repo):
+    first = git_repo(tmp_path / "first")
+    first.commit("primeiro", {"app.py": SOURCE})
+    second = git_repo(tmp_path / "second")
+    second.commit("primeiro", {"ok.py": "def ok(a):\n    return a\n", "README.md": "# docs\n"})
+    path = tmp_path / "manifest.txt"
+    path.write_text(f"# repositórios\n{first}\n\n  {second}  \n{tmp_path / 'missing'}\n")
+    return path
+
+
+def test_read_manifest_skips_comments_and_blank_lines(manifest, tmp_path):
+    assert read_manifest(manifest) == [str(tmp_path / "first"), str(tmp_path / "second"), str(tmp_path / "missing")]
+
+
+def test_iter_bounded_limits_pending_tasks():
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def task(item):
+        with lock:
+            running.append(item)
+            peak.append(len(running))
+        time.sleep(0.01)
+        with lock:
+            running.remove(item)
+        return item * 2
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = {item: future.result() for item, future in iter_bounded(executor, task, range(20), 3)}
+
+    assert results == {item: item * 2 for item in range(20)}
+    assert max(peak) <= 3
+
+
+def test_file_records_filters_by_analysis():
+    analysis = analyze_source(SOURCE, "app.py")
+
+    params = file_records("abc", analysis, BatchAnalysis.params)
+    loc = file_records("abc", analysis, BatchAnalysis.loc)
+    smells = file_records("abc", analysis, BatchAnalysis.code_smells)
+
+    assert [(r["kind"], r["function_name"], r["alerts"]) for r in params] == [("function", "many", ["parâmetros"])]
+    assert loc == []
+    assert {r["kind"] for r in smells} == {"smell"}
+    assert any(r["smell_type"] == "long_parameter_list" for r in smells)
+
+
+def test_file_records_reports_parse_errors():
+    records = file_records("abc", analyze_source("def broken(:\n", "bad.py"), BatchAnalysis.all)
+
+    assert [r["kind"] for r in records] == ["parse_error"]
+
+
+def test_batch_isolates_failures_and_streams_ndjson(manifest, tmp_path, capsys):
+    options = AnalysisOptions(use_cache=False, output_format=OutputFormat.ndjson)
+
+    summary = show_batch_analysis(manifest, BatchAnalysis.params, options, io_jobs=2)
+
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    summaries = {r["repository"]: r for r in records if r["kind"] == "repository_summary"}
+    assert summaries[str(tmp_path / "first")]["alerts"] == 1
+    assert summaries[str(tmp_path / "second")]["files_analyzed"] == 1
+    assert summaries[str(tmp_path / "missing")]["error"]
+    assert [r["function_name"] for r in records if r["kind"] == "function"] == ["many"]
+    assert records[-1]["kind"] == "batch_summary"
+    assert (summary.repositories, summary.failed, summary.files_analyzed, summary.alerts) == (3, 1, 2, 1)
+
+
+def test_batch_with_process_pool(manifest):
+    options = AnalysisOptions(use_cache=False, jobs=2)
+
+    summary = show_batch_analysis(manifest, BatchAnalysis.all, options, io_jobs=3)
+
+    assert (summary.repositories, summary.failed, summary.files_analyzed, summary.alerts) == (3, 1, 2, 1)
+    assert summary.smells > 0
@@ -0,0 +1,68 @@
+import ast
+import subprocess
+
+import pytest
+
+from benchmarks.baseline import compare
+from benchmarks.measure import findings_memory, measure_stages
+from benchmarks.nesting import FIXTURES, measure_nesting
+from benchmarks.synthetic_repo import RepoSpec, build_repository, generate_source
+from src.minero.analysis_engine import analyze_source
+
+
+SPEC = RepoSpec(commits=3, files_per_commit=2, functions_per_file=4, nesting_depth=2, lines_per_function=10)
+
+
+def test_generate_source_exercises_detectors():
+    source = generate_source(0, SPEC, version=1)
+    ast.parse(source)
+
+    analysis = analyze_source(source, "module_0.py")
+    assert len(analysis.functions) == SPEC.functions_per_file + 11
+    assert {s["smell_type"] for s in analysis.smells} >= {"magic_number", "large_class", "dead_code", "bad_variable_name"}
+
+
+def test_build_repository(tmp_path):
+    repo = str(tmp_path / "repo")
+    head = build_repository(repo, SPEC)
+
+    log = subprocess.run(["git", "-C", repo, "log", "--format=%H %an"], capture_output=True, text=True).stdout.split("\n")
+    assert log[0].split()[0] == head
+    assert len([line for line in log if line]) == SPEC.commits
+
+    stages, commits, files = measure_stages(repo)
+    assert (commits, files) == (SPEC.commits, SPEC.commits * SPEC.files_per_commit)
+    assert {"traversal", "source_read", "ast_parse", "rendering", "analyzer.engine", "detector.dead_code"} <= set(stages)
+
+
+def test_compare_detects_regressions():
+    baseline = {"spec": SPEC.to_dict(), "commands": {"all": {"seconds": 1.0, "peak_kib": 1000}}, "stages": {"ast_parse": 0.5}}
+    current = {"spec": SPEC.to_dict(), "commands": {"all": {"seconds": 1.5, "peak_kib": 1100}}, "stages": {"ast_parse": 0.505}}
+
+    regressions = compare(current, baseline, tolerance=0.25)
+
+    assert [r.metric for r in regressions] == ["commands.all.seconds"]
+    assert regressions[0].ratio == 1.5
+
+
+def test_compare_rejects_other_spec():
+    with pytest.raises(ValueError):
+        compare({"spec": SPEC.to_dict()}, {"spec": RepoSpec().to_dict()})
+
+
+def test_findings_memory_records_are_smaller_than_dicts(tmp_path):
+    repo = str(tmp_path / "repo")
+    build_repository(repo, SPEC)
+
+    memory = findings_memory(repo)
+
+    assert 0 < memory["records"] < memory["dicts"]
+
+
+@pytest.mark.parametrize("fixture", sorted(FIXTURES))
+def test_nesting_fixtures_agree_with_per_function_visitor(fixture):
+    # measure_nesting falha se as duas abordagens discordarem
+    result = measure_nesting(fixture, depth=6, repeat=1)
+
+    assert result["functions"] >= 6
+    assert result["per_function"] > 0 and result["single_pass"] > 0
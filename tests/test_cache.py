@@ -0,0 +1,146 @@
+import threading
+
+import pytest
+from unittest.mock import MagicMock
+
+from src.minero.cache import (
+    AnalysisCache,
+    analysis_cache,
+    blob_sha,
+    cached_analysis,
+    default_cache_dir,
+    EMPTY_BLOB_SHA,
+    keep_analysis_cache,
+)
+from src.minero.loc_analysis import check_function_sizes
+from src.minero.param_analysis import check_functions_num_params
+
+
+class FakeFile:
+    """Arquivo com sha conhecido que conta quantas vezes o conteúdo foi lido."""
+    def __init__(self, filename, source, sha):
+        self.filename = filename
+        self.blob_sha = sha
+        self._source = source
+        self.reads = 0
+
+    @property
+    def source_code(self):
+        self.reads += 1
+        return self._source
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = AnalysisCache(tmp_path / "analysis.sqlite3")
+    yield cache
+    cache.close()
+
+
+def test_default_cache_dir_env(monkeypatch, tmp_path):
+    monkeypatch.setenv("MINERO_CACHE_DIR", str(tmp_path))
+    assert default_cache_dir() == tmp_path
+
+    monkeypatch.delenv("MINERO_CACHE_DIR")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert default_cache_dir() == tmp_path / "minero"
+
+
+def test_blob_sha_from_pydriller_diff():
+    modified_file = MagicMock(spec=["_c_diff"])
+    modified_file._c_diff.b_blob.hexsha = "a" * 40
+    assert blob_sha(modified_file) == "a" * 40
+
+
+def test_blob_sha_unavailable():
+    # MagicMock sem configuração não tem sha em forma de string
+    assert blob_sha(MagicMock()) is None
+    assert blob_sha(object()) is None
+
+
+def test_cache_hit_skips_reading_source(cache):
+    source = "def f(a, b, c, d, e, f):\n    pass\n"
+    analyzer = MagicMock(wraps=check_functions_num_params, __qualname__="check_functions_num_params")
+
+    first = FakeFile("a.py", source, "1" * 40)
+    result = cached_analysis(first, analyzer, 5, cache=cache)
+
+    second = FakeFile("a.py", source, "1" * 40)
+    cached = cached_analysis(second, analyzer, 5, cache=cache)
+
+    assert cached == result
+    assert analyzer.call_count == 1
+    assert second.reads == 0
+
+
+def test_cache_key_includes_params_and_filename(cache):
+    source = "def f(a, b, c, d, e, f):\n    pass\n"
+
+    assert len(cached_analysis(FakeFile("a.py", source, "2" * 40), check_functions_num_params, 5, cache=cache)) == 1
+    assert cached_analysis(FakeFile("a.py", source, "2" * 40), check_functions_num_params, 6, cache=cache) == []
+
+    renamed = cached_analysis(FakeFile("b.py", source, "2" * 40), check_functions_num_params, 5, cache=cache)
+    assert renamed[0]["file_path"] == "b.py"
+
+
+def test_cache_persists_between_runs(tmp_path, monkeypatch):
+    monkeypatch.setenv("MINERO_CACHE_DIR", str(tmp_path))
+    source = "def f():\n" + "    pass\n" * 201
+
+    with analysis_cache() as cache:
+        cached_analysis(FakeFile("big.py", source, "3" * 40), check_function_sizes, cache=cache)
+
+    reread = FakeFile("big.py", source, "3" * 40)
+    with analysis_cache() as cache:
+        results = cached_analysis(reread, check_function_sizes, cache=cache)
+
+    assert results[0]["line_count"] == 202
+    assert reread.reads == 0
+
+
+def test_analysis_cache_disabled(tmp_path, monkeypatch):
+    monkeypatch.setenv("MINERO_CACHE_DIR", str(tmp_path))
+
+    with analysis_cache(enabled=False) as cache:
+        assert cache is None
+        f = FakeFile("a.py", "def f(): pass", "4" * 40)
+        assert cached_analysis(f, check_function_sizes, cache=cache) == []
+        assert f.reads == 1
+
+    assert not (tmp_path / "analysis.sqlite3").exists()
+
+
+def test_kept_cache_is_shared_on_its_thread(tmp_path, monkeypatch):
+    monkeypatch.setenv("MINERO_CACHE_DIR", str(tmp_path))
+    source = "def f():\n" + "    pass\n" * 201
+
+    with keep_analysis_cache():
+        with analysis_cache() as first:
+            cached_analysis(FakeFile("big.py", source, "5" * 40), check_function_sizes, cache=first)
+        reread = FakeFile("big.py", source, "5" * 40)
+        # continua aberto depois do comando, com os resultados já gravados
+        with analysis_cache() as second:
+            assert second is first
+            assert cached_analysis(reread, check_function_sizes, cache=second)[0]["line_count"] == 202
+        assert reread.reads == 0
+
+        # conexões SQLite não passam de uma thread a outra: lá o cache é próprio
+        other = []
+        def run():
+            with analysis_cache() as cache:
+                other.append(cache)
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join()
+        assert other[0] is not first
+
+    with analysis_cache() as cache:
+        assert cache is not first
+
+def test_skip_empty(cache):
+    empty = FakeFile("empty.py", "", EMPTY_BLOB_SHA)
+    assert cached_analysis(empty, check_function_sizes, cache=cache, skip_empty=True) is None
+    assert empty.reads == 0
+
+    deleted = FakeFile("deleted.py", None, None)
+    assert cached_analysis(deleted, check_function_sizes, cache=cache, skip_empty=True) is None
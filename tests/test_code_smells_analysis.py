@@ -7,9 +7,13 @@ from src.minero.code_smells_analysis import (
     detect_long_parameter_lists,
     detect_large_classes,
     detect_dead_code_comments,
-    detect_bad_variable_names
+    detect_bad_variable_names,
+    profile_code_smells
 )
 import ast
+import json
+import pstats
+from src.minero.options import AnalysisOptions, OutputFormat
 
 # ============ Testes das funções de detecção individuais ============
 
@@ -201,7 +205,7 @@ def bad_function(a, b, c, d, e, f, g, h):  # Too many params
     
     return mock_commit
 
-@patch("src.minero.code_smells_analysis.Repository")
+@patch("src.minero.commit_selection.Repository")
 @patch("src.minero.code_smells_analysis.print")
 @patch("src.minero.code_smells_analysis.console.print")
 def test_check_code_smells_integration(mock_console_print, mock_builtin_print, mock_repo, mock_commit_with_smells):
@@ -221,7 +225,7 @@ def test_check_code_smells_integration(mock_console_print, mock_builtin_print, m
     all_calls = str(mock_console_print.call_args_list)
     assert "smelly_code.py" in all_calls
 
-@patch("src.minero.code_smells_analysis.Repository")
+@patch("src.minero.commit_selection.Repository")
 @patch("src.minero.code_smells_analysis.print")
 @patch("src.minero.code_smells_analysis.console.print")
 def test_check_code_smells_no_smells(mock_console_print, mock_builtin_print, mock_repo):
@@ -250,7 +254,7 @@ def clean_function(parameter_one, parameter_two):
     all_calls = str(mock_console_print.call_args_list)
     assert "Nenhum code smell detectado" in all_calls or "clean_code.py" in all_calls
 
-@patch("src.minero.code_smells_analysis.Repository")
+@patch("src.minero.commit_selection.Repository")
 @patch("src.minero.code_smells_analysis.print")
 @patch("src.minero.code_smells_analysis.console.print")
 def test_check_code_smells_non_python_files(mock_console_print, mock_builtin_print, mock_repo):
@@ -271,4 +275,121 @@ def test_check_code_smells_non_python_files(mock_console_print, mock_builtin_pri
     mock_repo.assert_called_once()
     # Verificar que não há output específico sobre code smells
     printed_texts = " ".join([str(call.args[0]) for call in mock_builtin_print.call_args_list])
-    assert "README.md" not in printed_texts
\ No newline at end of file
+    assert "README.md" not in printed_texts
+
+
+@patch("src.minero.commit_selection.Repository")
+@patch("src.minero.code_smells_analysis.console.print")
+def test_check_code_smells_commit_range(mock_console_print, mock_repo):
+    """Com --from/--to, todos os commits do intervalo são analisados em uma única travessia"""
+    commits = []
+    for i in range(3):
+        mock_file = MagicMock()
+        mock_file.filename = f"file_{i}.py"
+        mock_file.source_code = "x = 42\n"
+        mock_commit = MagicMock()
+        mock_commit.modified_files = [mock_file]
+        commits.append(mock_commit)
+
+    mock_repo.return_value.traverse_commits.return_value = iter(commits)
+
+    check_code_smells("fake_repo", None, AnalysisOptions(from_rev="v1.0", to_rev="v1.1"))
+
+    mock_repo.assert_called_once_with("fake_repo", from_commit="v1.0", to_commit="v1.1")
+    all_calls = str(mock_console_print.call_args_list)
+    assert all(f"file_{i}.py" in all_calls for i in range(3))
+
+
+@patch("src.minero.commit_selection.Repository")
+@patch("src.minero.code_smells_analysis.console.print")
+def test_check_code_smells_ndjson(mock_console_print, mock_repo, mock_commit_with_smells, capsys):
+    """Com --format ndjson, cada smell vira uma linha JSON e nenhuma tabela é montada"""
+    mock_repo.return_value.traverse_commits.return_value = [mock_commit_with_smells]
+
+    check_code_smells("fake_repo", "abc123", AnalysisOptions(use_cache=False, output_format=OutputFormat.ndjson))
+
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert records
+    assert all(r["kind"] == "smell" and r["commit_hash"] == "abc123" for r in records)
+    assert all(r["file_path"] == "smelly_code.py" for r in records)
+    assert {"magic_number", "long_parameter_list", "dead_code"} <= {r["smell_type"] for r in records}
+    mock_console_print.assert_not_called()
+
+
+@patch("src.minero.commit_selection.Repository")
+def test_check_code_smells_top_files(mock_repo, capsys):
+    """Com --top 1, só os smells do arquivo com mais smells são emitidos"""
+    commit = MagicMock(hash="abc123")
+    commit.modified_files = [
+        MagicMock(filename="few.py", source_code="x = 100\n"),
+        MagicMock(filename="many.py", source_code="a = 100\nb = 200\nc = 300\n"),
+        MagicMock(filename="clean.py", source_code="def ok():\n    return 0\n"),
+    ]
+    mock_repo.return_value.traverse_commits.return_value = [commit]
+
+    check_code_smells("fake_repo", "abc123", AnalysisOptions(use_cache=False, top=1, output_format=OutputFormat.ndjson))
+
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert records and {r["file_path"] for r in records} == {"many.py"}
+
+
+@patch("src.minero.commit_selection.Repository")
+@patch("src.minero.code_smells_analysis.console.print")
+def test_check_code_smells_only_violations_hides_clean_files(mock_console_print, mock_repo):
+    commit = MagicMock(hash="abc123")
+    commit.modified_files = [
+        MagicMock(filename="smelly.py", source_code="x = 100\n"),
+        MagicMock(filename="clean.py", source_code="def ok():\n    return 0\n"),
+    ]
+    mock_repo.return_value.traverse_commits.return_value = [commit]
+
+    check_code_smells("fake_repo", "abc123", AnalysisOptions(use_cache=False, only_violations=True))
+
+    all_calls = str(mock_console_print.call_args_list)
+    assert "smelly.py" in all_calls
+    assert "clean.py" not in all_calls
+
+
+def test_detect_dead_code_comments_ignores_strings_and_trailing_comments():
+    source_code = (
+        'query = "# import os"\n'
+        'doc = """\n'
+        '# def inside_docstring():\n'
+        '"""\n'
+        'x = 1  # if x: trailing\n'
+        '    # return x\n'
+    )
+
+    results = detect_dead_code_comments(source_code, "test.py")
+
+    assert [(r["line_number"], r["description"]) for r in results] == \
+           [(6, "Possível código morto comentado: # return x...")]
+
+
+def test_profile_code_smells_matches_detect_code_smells():
+    source_code = "def f(a, b, c, d, e, f, g):\n    x = 100\n    # return x\n    return a\n"
+
+    smells, timings = profile_code_smells(source_code, "app.py")
+
+    assert smells == detect_code_smells(source_code, "app.py")
+    assert {"ast_parse", "ast_walk", "detector.magic_number", "detector.dead_code"} <= set(timings)
+    assert timings["detector.magic_number"].calls == 1
+    assert all(measured.wall >= 0 for measured in timings.values())
+
+
+@patch("src.minero.commit_selection.Repository")
+def test_check_code_smells_profile_ndjson(mock_repo, mock_commit_with_smells, tmp_path, capsys):
+    """Com --profile, o tempo de cada etapa e os arquivos mais lentos vêm depois dos smells"""
+    mock_commit_with_smells.hash = "abc123"
+    mock_repo.return_value.traverse_commits.return_value = [mock_commit_with_smells]
+    dump = tmp_path / "run.pstats"
+
+    check_code_smells("fake_repo", "abc123", AnalysisOptions(output_format=OutputFormat.ndjson, profile=True,
+                                                            profile_files=1, profile_dump=dump))
+
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    stages = {r["stage"] for r in records if r["kind"] == "profile_stage"}
+    assert {"traversal", "source_read", "ast_parse", "rendering", "detector.dead_code"} <= stages
+    assert [r["file"] for r in records if r["kind"] == "profile_file"] == ["abc123 smelly_code.py"]
+    assert records[-1]["kind"] == "profile_total"
+    assert pstats.Stats(str(dump)).total_calls > 0
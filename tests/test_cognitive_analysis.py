@@ -1,13 +1,24 @@
 import ast
+import json
 import pytest
 from unittest.mock import patch
 
 from src.minero.cognitive_analysis import (
     CognitiveComplexityVisitor,
     analyze_functions_in_source,
+    function_complexities,
+    safe_analyze_functions,
     FunctionComplexity,
     show_cognitive_analysis,
 )
+from src.minero.options import AnalysisOptions, OutputFormat
+
+@pytest.fixture(autouse=True)
+def no_mirror():
+    """As URLs dos testes são fictícias: o Repository é mockado e nada deve ser clonado."""
+    with patch("src.minero.cognitive_analysis.mirrored_repository", side_effect=lambda repo_url: repo_url), \
+         patch("src.minero.commit_selection.mirrored_repository", side_effect=lambda repo_url: repo_url):
+        yield
 
 #testando o visitor 
 
@@ -157,11 +168,14 @@ def test_syntax_error_handling(capsys):
     """testa se o código lida com erros de sintaxe sem quebrar."""
     code = "def func( broken code"
     results = analyze_functions_in_source(code, "test.py")
-    
-    # deve retornar lista vazia e imprimir erro no console
+
+    # deve retornar lista vazia; a versão usada pelos comandos devolve o erro,
+    # e nenhuma das duas escreve no console (quebraria a saída ndjson)
     assert results == []
+    assert isinstance(safe_analyze_functions(code, "test.py"), SyntaxError)
     captured = capsys.readouterr()
-    assert "Erro ao parsear test.py" in captured.out
+    assert captured.out == ""
+    assert captured.err == ""
 
 def test_multiple_functions_in_file():
     """Testa se o analisador pega múltiplas funções no mesmo arquivo."""
@@ -203,6 +217,73 @@ def g():
     assert names == {"f", "g"}
 
 
+def test_boolop_in_while_condition_counted_once():
+    results = analyze_functions_in_source("def f():\n while a and b or c: pass", "test.py")
+
+    # While (+1) + 'and' (+1) + 'or' (+1)
+    assert results[0].complexity == 3
+
+
+NESTED_SOURCE = """
+import functools
+
+def retry(times):
+    if times > 1 and times < 10:
+        pass
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args):
+            for attempt in range(times):
+                try:
+                    return function(*args)
+                except (ValueError, KeyError):
+                    def log():
+                        while attempt and args:
+                            break
+                    log()
+            raise RuntimeError
+        return wrapper
+    return decorator
+
+class Service:
+    def method(self, x):
+        if x:
+            class Local:
+                async def run(self):
+                    async for item in self:
+                        if item or x:
+                            continue
+            return Local
+"""
+
+
+def test_function_complexities_match_one_visitor_per_function():
+    tree = ast.parse(NESTED_SOURCE)
+    expected = []
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            visitor = CognitiveComplexityVisitor()
+            visitor.visit(node)
+            expected.append((node.name, visitor.complexity))
+
+    assert [(node.name, complexity) for node, complexity in function_complexities(tree)] == expected
+    assert [name for name, _ in expected] == ["retry", "decorator", "method", "wrapper", "run", "log"]
+
+
+def test_nested_function_counts_in_enclosing_function():
+    source = """
+def outer():
+    if a:
+        def inner():
+            if b:
+                pass
+"""
+    results = {r.function_name: r.complexity for r in analyze_functions_in_source(source, "test.py")}
+
+    # inner: If (+1); outer: If (+1) + o If de inner visto de dentro do if de outer (+2)
+    assert results == {"outer": 3, "inner": 1}
+
+
 def test_analyze_functions_invalid_code():
     broken = "def f(:"
     results = analyze_functions_in_source(broken, "arq.py")
@@ -231,7 +312,7 @@ def fake_commit():
     return FakeCommit()
 
 
-@patch("src.minero.cognitive_analysis.Repository")
+@patch("src.minero.commit_selection.Repository")
 def test_show_cognitive_analysis_runs_without_errors(mock_repo, fake_commit, capsys):
     """Testa se show_cognitive_analysis roda sem erros com um repositório mockado."""
     
@@ -247,3 +328,93 @@ def test_show_cognitive_analysis_runs_without_errors(mock_repo, fake_commit, cap
     # verifica que as duas funções foram listadas
     assert "x" in captured.out
     assert "y" in captured.out
+
+
+@patch("src.minero.commit_selection.Repository")
+@patch("src.minero.commit_selection.last_commits")
+def test_show_cognitive_analysis_defaults_to_last_five(mock_last_commits, mock_repo, fake_commit, capsys):
+    """Sem commit, percorre apenas os 5 commits mais recentes, sem listar todo o histórico."""
+    mock_last_commits.return_value = iter([fake_commit])
+
+    show_cognitive_analysis("http://fake.repo")
+
+    mock_last_commits.assert_called_once_with("http://fake.repo", 5)
+    mock_repo.assert_not_called()
+    assert "abc123" in capsys.readouterr().out
+
+
+@patch("src.minero.commit_selection.Repository")
+def test_show_cognitive_analysis_top_k(mock_repo, fake_commit, capsys):
+    """Com --top 1, só a função mais complexa do commit é mostrada."""
+    mock_repo.return_value.traverse_commits.return_value = [fake_commit]
+
+    show_cognitive_analysis("http://fake.repo", "abc123", 12, AnalysisOptions(use_cache=False, top=1))
+
+    out = capsys.readouterr().out
+    assert "│ y " in out
+    assert "│ x " not in out
+    assert "Mostrando 1 de 2 funções." in out
+
+
+@patch("src.minero.commit_selection.Repository")
+def test_show_cognitive_analysis_only_violations(mock_repo, fake_commit, capsys):
+    mock_repo.return_value.traverse_commits.return_value = [fake_commit]
+
+    show_cognitive_analysis("http://fake.repo", "abc123", 0, AnalysisOptions(use_cache=False, only_violations=True,
+                                                                            output_format=OutputFormat.ndjson))
+
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(r["function_name"], r["alert"]) for r in records] == [("y", True)]
+
+
+@pytest.fixture
+def broken_commit():
+    """Commit com um arquivo que não parseia entre dois válidos, com sha de blob para passar pelo cache."""
+    class FakeModifiedFile:
+        def __init__(self, filename, code, blob_sha):
+            self.filename = filename
+            self.source_code = code
+            self.blob_sha = blob_sha
+
+    class FakeCommit:
+        hash = "abc123"
+        msg = "commit fake"
+        modified_files = [
+            FakeModifiedFile("a.py", "def x():\n    pass", "a" * 40),
+            FakeModifiedFile("broken.py", "def func( broken code", "b" * 40),
+            FakeModifiedFile("c.py", "def y():\n    if True:\n        pass", "c" * 40),
+        ]
+
+    return FakeCommit()
+
+
+@patch("src.minero.commit_selection.Repository")
+def test_show_cognitive_analysis_ndjson_parse_error(mock_repo, broken_commit, capsys, tmp_path, monkeypatch):
+    """Em ndjson, o erro de parse vira um registro, também quando vem do cache."""
+    monkeypatch.setenv("MINERO_CACHE_DIR", str(tmp_path))
+    mock_repo.return_value.traverse_commits.side_effect = lambda: iter([broken_commit])
+    options = AnalysisOptions(output_format=OutputFormat.ndjson)
+
+    show_cognitive_analysis("http://fake.repo", "abc123", 12, options)
+    first = capsys.readouterr().out
+    records = [json.loads(line) for line in first.splitlines()]
+
+    assert [r.get("function_name", r["kind"]) for r in records] == ["x", "parse_error", "y"]
+    error = records[1]
+    assert error["commit_hash"] == "abc123"
+    assert error["file_path"] == "broken.py"
+    assert error["error"]
+
+    show_cognitive_analysis("http://fake.repo", "abc123", 12, options)
+    assert capsys.readouterr().out == first
+
+
+@patch("src.minero.commit_selection.Repository")
+def test_show_cognitive_analysis_table_parse_error(mock_repo, broken_commit, capsys):
+    mock_repo.return_value.traverse_commits.return_value = [broken_commit]
+
+    show_cognitive_analysis("http://fake.repo", "abc123", 12, AnalysisOptions(use_cache=False))
+
+    out = capsys.readouterr().out
+    assert "Erro ao parsear broken.py" in out
+    assert "│ y " in out
@@ -0,0 +1,34 @@
+import io
+import tokenize
+
+from src.minero.comments import Comment, iter_comments
+
+SOURCE = '''# cabeçalho
+x = "# não é comentário"  # comentário no fim da linha
+doc = """
+# dentro da docstring
+"""
+y = f'{x}#' + r"\\"  # depois de escapes
+    # indentado
+s = 'it\\'s # ainda string'
+'''
+
+
+def test_iter_comments_ignores_hashes_inside_strings():
+    assert list(iter_comments(SOURCE)) == [
+        Comment(1, "# cabeçalho", True),
+        Comment(2, "# comentário no fim da linha", False),
+        Comment(6, "# depois de escapes", False),
+        Comment(7, "# indentado", True),
+    ]
+
+
+def test_iter_comments_matches_tokenize():
+    tokens = tokenize.generate_tokens(io.StringIO(SOURCE).readline)
+    expected = [(t.start[0], t.string) for t in tokens if t.type == tokenize.COMMENT]
+
+    assert [(c.line_number, c.text) for c in iter_comments(SOURCE)] == expected
+
+
+def test_iter_comments_tolerates_syntax_errors():
+    assert list(iter_comments("def broken(:\n    # return 1\n")) == [Comment(2, "# return 1", True)]
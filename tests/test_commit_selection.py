@@ -0,0 +1,74 @@
+from unittest.mock import patch
+
+from src.minero.commit_selection import describe_selection, has_commit_selection, last_commits, repository_kwargs, select_commits
+from src.minero.options import AnalysisOptions
+
+
+def test_single_commit():
+    options = AnalysisOptions()
+
+    assert has_commit_selection("abc123", options)
+    assert repository_kwargs("abc123", options) == {"single": "abc123"}
+    assert describe_selection("abc123", options) == "abc123"
+
+
+def test_commit_range():
+    options = AnalysisOptions(from_rev="v1.0", to_rev="v1.1")
+
+    assert has_commit_selection(None, options)
+    assert repository_kwargs(None, options) == {"from_commit": "v1.0", "to_commit": "v1.1"}
+    assert describe_selection(None, options) == "v1.0..v1.1"
+
+
+def test_open_ended_range():
+    assert repository_kwargs(None, AnalysisOptions(from_rev="v1.0")) == {"from_commit": "v1.0"}
+    assert describe_selection(None, AnalysisOptions(to_rev="v1.1")) == "início..v1.1"
+    assert not has_commit_selection(None, AnalysisOptions())
+
+
+def test_last_commits_selection():
+    options = AnalysisOptions(last=3)
+
+    assert has_commit_selection(None, options)
+    assert describe_selection(None, options) == "últimos 3 commits"
+
+
+def make_repo(git_repo, commits):
+    repo = git_repo()
+    for i in range(commits):
+        repo.commit(f"commit {i}", {f"file_{i}.py": f"def f{i}():\n    return {i}\n"})
+
+
+def test_last_commits_newest_first(tmp_path, git_repo):
+    make_repo(git_repo, 4)
+
+    commits = list(last_commits(str(tmp_path), 2))
+
+    assert [c.msg for c in commits] == ["commit 3", "commit 2"]
+    assert [mf.filename for mf in commits[0].modified_files] == ["file_3.py"]
+
+
+def test_last_commits_stops_after_n(tmp_path, git_repo):
+    make_repo(git_repo, 3)
+
+    with patch("src.minero.repository.Git") as mock_git:
+        mock_git.return_value.get_list_commits.return_value = iter([])
+        list(last_commits(str(tmp_path), 2))
+
+    mock_git.return_value.get_list_commits.assert_called_once_with("HEAD", max_count=2, reverse=False)
+
+
+def test_select_commits_follows_the_selection(tmp_path, git_repo):
+    make_repo(git_repo, 3)
+    repo = str(tmp_path)
+    (tmp_path / "file_0.py").write_text("def changed():\n    return 0\n")
+
+    snapshot = list(select_commits(repo, None, AnalysisOptions(snapshot=True, last=1)))
+    worktree = list(select_commits(repo, None, AnalysisOptions(worktree=True, snapshot=True)))
+    last = list(select_commits(repo, None, AnalysisOptions(last=2)))
+    interval = list(select_commits(repo, None, AnalysisOptions(from_rev="HEAD~1")))
+
+    assert sorted(f.filename for f in snapshot[0].modified_files) == ["file_0.py", "file_1.py", "file_2.py"]
+    assert [f.filename for f in worktree[0].modified_files] == ["file_0.py"]
+    assert [c.msg for c in last] == ["commit 2", "commit 1"]
+    assert [c.msg for c in interval] == ["commit 1", "commit 2"]
@@ -1,28 +1,23 @@
+import os
 import pytest
 from unittest.mock import MagicMock, patch
 from src.minero.commits_info import show_repository_generic_info, show_commits_info
-
-# mock de objetos do PyDriller
-class FakeCommit:
-    def __init__(self, author, files, branches):
-        self.hash = "abc123def456"
-        self.msg = "Mensagem de teste"
-        self.author = MagicMock()
-        self.author.name = author
-        self.modified_files = [MagicMock(filename=f) for f in files]
-        self.branches = branches
+from src.minero.options import AnalysisOptions
+from src.minero.repository_stats import CommitRecord, RepositoryStats
 
 @patch("src.minero.commits_info.console.print")
-@patch("src.minero.commits_info.Repository")
-def test_show_repository_generic_info(mock_repo, mock_print):
-    fake_commits = [
-        FakeCommit("Caleb", ["a.py", "b.py"], {"main"}),
-        FakeCommit("Jhonatan", ["c.py"], {"main"}),
-        FakeCommit("Caleb", ["d.py"], {"dev"}),
-    ]
-    mock_repo.return_value.traverse_commits.return_value = fake_commits
+@patch("src.minero.commits_info.collect_repository_stats")
+def test_show_repository_generic_info(mock_stats, mock_print):
+    mock_stats.return_value = RepositoryStats(
+        total_commits=3,
+        total_files={"a.py", "b.py", "c.py", "d.py"},
+        total_branches={"main", "dev"},
+        authors_commit_number={"Caleb": 2, "Jhonatan": 1},
+    )
+
+    show_repository_generic_info("fake_repo_url", AnalysisOptions(use_cache=False))
 
-    show_repository_generic_info("fake_repo_url")
+    mock_stats.assert_called_once_with("fake_repo_url", None, os.path.realpath("fake_repo_url"))
 
     mock_print.assert_any_call("[bold green]Total de Commits:[/bold green] 3")
     mock_print.assert_any_call("[bold green]Total de Autores:[/bold green] 2")
@@ -33,14 +28,14 @@ def test_show_repository_generic_info(mock_repo, mock_print):
 
 
 @patch("src.minero.commits_info.console.print")
-@patch("src.minero.commits_info.Repository")
-def test_show_commits_info(mock_repo, mock_print):
+@patch("src.minero.commits_info.first_commits")
+def test_show_commits_info(mock_first_commits, mock_print):
     fake_commits = [
-        FakeCommit("Caleb", ["main.py", "utils.py"], {"main"}),
+        CommitRecord("abc123def456", "Mensagem de teste", "Caleb", ["main.py", "utils.py"]),
     ]
-    mock_repo.return_value.traverse_commits.return_value = fake_commits
+    mock_first_commits.return_value = fake_commits
 
-    show_commits_info("fake_repo_url")
+    show_commits_info("fake_repo_url", AnalysisOptions(use_cache=False))
 
     mock_print.assert_any_call(f"[bold green]Commit:[/bold green] {fake_commits[0].hash[:10]}")
     mock_print.assert_any_call(f"[bold]Autor:[/bold] Caleb")
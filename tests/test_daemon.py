@@ -0,0 +1,213 @@
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from unittest.mock import patch
+
+from src.minero import cognitive_analysis
+from src.minero.cache import keep_analysis_cache
+from src.minero.daemon import _SocketStream, forward, handle_request, serve, server_running, socket_path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def repo(tmp_path, git_repo):
+    repo = git_repo(tmp_path / "repo")
+    repo.commit("primeiro", {"app.py": "def f(a, b, c, d, e, f):\n    return 1\n"})
+    return repo
+
+
+@pytest.fixture
+def server(tmp_path):
+    """Um `minero serve` em outro processo, com cache próprio; devolve o caminho do socket."""
+    path = tmp_path / "serve.sock"
+    env = dict(os.environ, MINERO_CACHE_DIR=str(tmp_path / "cache"))
+    process = subprocess.Popen(
+        [sys.executable, "-m", "src.minero.main", "serve", "--socket", str(path)],
+        cwd=ROOT, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+    )
+    deadline = time.monotonic() + 30
+    while not server_running(path):
+        assert process.poll() is None, process.stdout.read()
+        assert time.monotonic() < deadline, "servidor não subiu"
+        time.sleep(0.05)
+    yield path
+    process.terminate()
+    output, _ = process.communicate(timeout=30)
+    assert "Servidor encerrado." in output
+    assert not path.exists()
+
+
+def test_socket_path_env(monkeypatch, tmp_path):
+    monkeypatch.delenv("MINERO_SOCKET", raising=False)
+    monkeypatch.setenv("MINERO_CACHE_DIR", str(tmp_path))
+    assert socket_path() == tmp_path / "serve.sock"
+
+    monkeypatch.setenv("MINERO_SOCKET", str(tmp_path / "outro.sock"))
+    assert socket_path() == tmp_path / "outro.sock"
+
+
+def test_forward_without_server_runs_locally(tmp_path):
+    assert forward(["commits", "."], tmp_path / "nenhum.sock") is None
+    assert not server_running(tmp_path / "nenhum.sock")
+
+
+class Sink:
+    """Conexão falsa: um pedido a ser lido e as mensagens escritas pelo servidor."""
+
+    def __init__(self, request=None):
+        self._request = json.dumps(request).encode("utf-8") + b"\n" if request else b""
+        self.data = b""
+
+    def readline(self):
+        return self._request
+
+    def write(self, data):
+        self.data += data
+
+    def flush(self):
+        pass
+
+    def output(self, name):
+        return "".join(message.get(name, "") for message in map(json.loads, self.data.splitlines()))
+
+
+def test_socket_stream_sends_text_and_refuses_bytes(tmp_path):
+    sink = Sink()
+    stream = _SocketStream(sink, "stderr")
+    stream.write("olá\n")
+    stream.write("")
+
+    assert [json.loads(line) for line in sink.data.splitlines()] == [{"stderr": "olá\n"}]
+    with pytest.raises(TypeError):
+        stream.write(b"")
+
+
+def _cognitive_request(repo, tmp_path, tty, columns, **env):
+    terminal = {"stdout": tty, "stderr": tty, "columns": columns, "lines": 25}
+    sink = Sink({"argv": ["cog-analysis", ".", "--last", "1"], "cwd": str(repo), "terminal": terminal,
+                 "env": dict(env, MINERO_CACHE_DIR=str(tmp_path / "cache"))})
+    handle_request(sink)
+    return sink.output("stdout")
+
+
+def _rich_width(output):
+    """Largura das linhas desenhadas pelo Rich (painéis e tabelas)."""
+    return max(len(line) for line in output.splitlines() if line[:1] in "╭│╰┏┃┡└")
+
+
+def test_handle_request_uses_client_terminal(repo, tmp_path, monkeypatch):
+    monkeypatch.setenv("COLUMNS", "300")
+    console = cognitive_analysis.console
+
+    colored = _cognitive_request(repo, tmp_path, tty=True, columns=40)
+    plain = _cognitive_request(repo, tmp_path, tty=False, columns=40)
+    from_env = _cognitive_request(repo, tmp_path, tty=False, columns=200, COLUMNS="50")
+
+    assert "\x1b[" in colored
+    assert "\x1b[" not in plain
+    assert _rich_width(plain) <= 40
+    assert 40 < _rich_width(from_env) <= 50
+    assert re.sub(r"\x1b\[[0-9;]*m", "", colored) == plain
+    # o console do módulo e o ambiente do servidor voltam ao fim do pedido
+    assert cognitive_analysis.console is console
+    assert os.environ["COLUMNS"] == "300"
+    assert "MINERO_CACHE_DIR" not in os.environ or os.environ["MINERO_CACHE_DIR"] != str(tmp_path / "cache")
+
+
+def test_handle_request_uses_client_cache_dir(repo, tmp_path, monkeypatch):
+    server_dir, client_dir = tmp_path / "servidor", tmp_path / "cliente"
+    monkeypatch.setenv("MINERO_CACHE_DIR", str(server_dir))
+
+    def run(cache_dir):
+        sink = Sink({"argv": ["params", ".", "--last", "1"], "cwd": str(repo),
+                     "env": {"MINERO_CACHE_DIR": str(cache_dir)}})
+        handle_request(sink)
+        return sink
+
+    with keep_analysis_cache():
+        # cliente com outro diretório: resultados no cache dele, não no do servidor
+        assert "function" not in run(client_dir).output("stderr")
+        assert (client_dir / "analysis.sqlite3").exists()
+        assert not (server_dir / "analysis.sqlite3").exists()
+        # mesmo diretório: usa a conexão mantida pelo servidor
+        run(server_dir)
+        assert (server_dir / "analysis.sqlite3").exists()
+
+
+def test_forward_runs_commands_on_server(server, repo, capsys, monkeypatch):
+    monkeypatch.delenv("MINERO_NO_DAEMON", raising=False)
+    monkeypatch.chdir(repo)
+
+    # o caminho relativo é resolvido no diretório do cliente
+    for _ in range(2):
+        assert forward(["params", ".", "--last", "1", "--format", "ndjson"], server) == 0
+        records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert any(record.get("function_name") == "f" for record in records)
+
+    assert forward(["params", "."], server) == 2
+    assert "--last" in capsys.readouterr().err
+
+    assert forward(["nope"], server) == 2
+    assert "nope" in capsys.readouterr().err
+
+
+def test_client_exits_quietly_when_output_pipe_closes(server, repo, monkeypatch):
+    repo.commit("muitas funções", {"many.py": "".join(f"def f{i}():\n    return {i}\n" for i in range(2000))})
+    env = dict(os.environ, MINERO_SOCKET=str(server), PYTHONPATH=str(ROOT))
+    env.pop("MINERO_NO_DAEMON", None)
+
+    # como `minero cog-analysis . --last 1 --format ndjson | head -1`
+    client = subprocess.Popen(
+        [sys.executable, "-c", "from src.minero.daemon import main; main()",
+         "cog-analysis", ".", "--last", "1", "--format", "ndjson"],
+        cwd=repo, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+    )
+    assert json.loads(client.stdout.readline())["kind"] == "function"
+    client.stdout.close()
+    _, errors = client.communicate(timeout=60)
+
+    assert client.returncode == 1
+    assert errors == b""
+    # o servidor segue atendendo
+    monkeypatch.delenv("MINERO_NO_DAEMON", raising=False)
+    monkeypatch.chdir(repo)
+    assert forward(["commits", "."], server) == 0
+
+
+def test_socket_is_private(server):
+    assert os.stat(server).st_mode & 0o777 == 0o600
+
+
+def test_socket_is_created_without_access_for_others(tmp_path):
+    path = tmp_path / "serve.sock"
+    modes = []
+    # o modo logo depois do bind, antes do chmod
+    with patch("src.minero.daemon.os.chmod", side_effect=lambda p, mode: modes.append(os.stat(p).st_mode & 0o777)), \
+         patch("src.minero.daemon.signal.signal"), \
+         patch("src.minero.daemon.socket.socket.listen", side_effect=KeyboardInterrupt):
+        serve(path)
+
+    assert modes and modes[0] & 0o077 == 0
+
+
+def test_forward_skips_server_when_disabled(server, monkeypatch):
+    monkeypatch.setenv("MINERO_NO_DAEMON", "1")
+    assert forward(["commits", "."], server) is None
+    monkeypatch.delenv("MINERO_NO_DAEMON")
+    assert forward(["serve"], server) is None
+
+
+def test_second_server_on_same_socket_fails(server):
+    result = subprocess.run(
+        [sys.executable, "-m", "src.minero.main", "serve", "--socket", str(server)],
+        cwd=ROOT, capture_output=True, text=True, timeout=60,
+    )
+    assert result.returncode == 1
+    assert "Já existe um servidor" in result.stderr
@@ -0,0 +1,142 @@
+import json
+
+import pytest
+
+from src.minero.cognitive_analysis import show_cognitive_analysis
+from src.minero.delta_analysis import analyze_changes, iter_file_deltas, report_function_deltas
+from src.minero.options import AnalysisOptions, OutputFormat
+from src.minero.parallel import worker_pool
+
+BEFORE = """\
+def untouched(a):
+    return a
+
+def changed(a, b):
+    if a:
+        return b
+    return a
+
+class Service:
+    def method(self):
+        return 1
+
+def removed():
+    return 0
+"""
+
+AFTER = """\
+def untouched(a):
+    return a
+
+def changed(a, b, c):
+    if a:
+        for item in b:
+            if item:
+                return c
+    return a
+
+class Service:
+    def method(self):
+        return 1
+
+    def added(self):
+        return 2
+"""
+
+
+def _line_numbers(source, predicate):
+    return [number for number, line in enumerate(source.splitlines(), start=1) if predicate(line)]
+
+
+def test_analyze_changes_reports_only_touched_functions():
+    deleted = _line_numbers(BEFORE, lambda line: "def changed" in line or "removed" in line or "return 0" in line)
+    added = _line_numbers(AFTER, lambda line: line.strip().startswith(("def changed", "for", "if item", "return c",
+                                                                        "def added", "return 2")))
+
+    deltas = {d.function_name: d for d in analyze_changes(BEFORE, AFTER, "app.py", deleted, added)}
+
+    assert set(deltas) == {"changed", "Service.added", "removed"}
+    assert deltas["changed"].values("param_count") == (2, 3)
+    assert deltas["changed"].values("loc") == (4, 6)
+    assert deltas["changed"].delta("complexity") > 0
+    assert deltas["Service.added"].before is None
+    assert deltas["Service.added"].values("loc") == (None, 2)
+    assert deltas["removed"].after is None
+    assert deltas["removed"].delta("loc") == -2
+
+
+def test_analyze_changes_new_file_and_decorator():
+    source = "import functools\n\n@functools.cache\ndef cached(x):\n    return x\n"
+
+    assert [d.function_name for d in analyze_changes(None, source, "new.py", [], [3])] == ["cached"]
+    assert analyze_changes(None, source, "new.py", [], [1]) == []
+
+
+def test_analyze_changes_nested_functions_use_qualified_names():
+    source = "def outer():\n    def inner():\n        return 1\n    return inner\n"
+
+    deltas = analyze_changes(source, source.replace("return 1", "return 2"), "m.py", [3], [3])
+
+    assert [d.function_name for d in deltas] == ["outer", "outer.inner"]
+    assert all(d.delta("loc") == 0 for d in deltas)
+
+
+def test_analyze_changes_raises_on_syntax_error():
+    with pytest.raises(SyntaxError):
+        analyze_changes(None, "def broken(:\n", "broken.py", [], [1])
+
+
+class _File:
+    def __init__(self, filename, before, after, deleted, added):
+        self.filename = filename
+        self.source_code_before = before
+        self.source_code = after
+        self.diff_parsed = {"deleted": [(n, "") for n in deleted], "added": [(n, "") for n in added]}
+
+
+def test_iter_file_deltas_pool_matches_serial(monkeypatch):
+    monkeypatch.setattr("src.minero.parallel.BATCH_PER_WORKER", 1)
+    files = [_File(f"m{i}.py", BEFORE, AFTER, [4], [4]) for i in range(3)] + [_File("bad.py", None, "def (", [], [1])]
+
+    serial = list(iter_file_deltas(files))
+    with worker_pool(2) as pool:
+        parallel = list(iter_file_deltas(files, pool))
+
+    assert [f.filename for f, _ in parallel] == [f.filename for f, _ in serial]
+    assert [[d.function_name for d in deltas] for _, deltas in parallel[:3]] == [["changed"]] * 3
+    assert isinstance(parallel[3][1], SyntaxError)
+
+
+@pytest.fixture
+def repo(git_repo):
+    repo = git_repo()
+    repo.commit("primeiro", {"app.py": BEFORE})
+    repo.commit("segundo", {"app.py": AFTER})
+    return str(repo)
+
+
+def test_cognitive_changed_only_ndjson(repo, capsys):
+    options = AnalysisOptions(use_cache=False, last=1, output_format=OutputFormat.ndjson, changed_only=True)
+
+    show_cognitive_analysis(repo, None, 12, options)
+
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert {r["function_name"] for r in records} == {"changed", "Service.added", "removed"}
+    changed = next(r for r in records if r["function_name"] == "changed")
+    assert changed["kind"] == "function_delta"
+    assert (changed["param_count_before"], changed["param_count_after"], changed["param_count_delta"]) == (2, 3, 1)
+    assert changed["loc_delta"] == 2
+
+
+def test_report_function_deltas_ndjson_parse_error(capsys):
+    class Commit:
+        hash = "abc123"
+        modified_files = [_File("bad.py", None, "def (", [], [1]), _File("m.py", BEFORE, AFTER, [4], [4])]
+
+    report_function_deltas([Commit()], None, AnalysisOptions(output_format=OutputFormat.ndjson))
+
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert records[0]["kind"] == "parse_error"
+    assert (records[0]["commit_hash"], records[0]["file_path"]) == ("abc123", "bad.py")
+    assert records[0]["error"]
+    assert [r["function_name"] for r in records[1:]] == ["changed"]
@@ -0,0 +1,77 @@
+import pytest
+
+from src.minero.cache import AnalysisCache
+from src.minero.cognitive_analysis import analyze_functions_in_source, show_cognitive_analysis
+from src.minero.history_chunks import iter_history_chunks, split_in_chunks
+from src.minero.options import AnalysisOptions, OutputFormat
+from src.minero.parallel import worker_pool
+
+
+def _fill_history(repo, label=""):
+    for i in range(7):
+        nested = "\n".join("    " * (d + 1) + f"if x{d}:" for d in range(i % 4 + 1))
+        source = f"def f{i}(x0, x1, x2, x3):\n{nested}\n" + "    " * (i % 4 + 2) + "return 1\n"
+        repo.commit(f"commit {i}{label}", {f"mod_{i % 3}.py": source, "notes.txt": f"{i}\n"})
+    return repo
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch, git_repo):
+    # as travas dos processos do pool ficam no diretório do cache
+    monkeypatch.setenv("MINERO_CACHE_DIR", str(tmp_path / "cache"))
+    return _fill_history(git_repo(tmp_path / "repo"))
+
+
+@pytest.mark.parametrize("count, chunks, sizes", [
+    (10, 3, [4, 3, 3]),
+    (2, 8, [1, 1]),
+    (0, 4, []),
+    (5, 1, [5]),
+])
+def test_split_in_chunks_is_contiguous_and_balanced(count, chunks, sizes):
+    items = list(range(count))
+
+    result = split_in_chunks(items, chunks)
+
+    assert [len(chunk) for chunk in result] == sizes
+    assert [item for chunk in result for item in chunk] == items
+
+
+def test_chunks_keep_commit_order_and_fill_cache(repo, tmp_path):
+    hashes = repo.git("rev-list", "--reverse", "HEAD").split()
+    cache = AnalysisCache(tmp_path / "cache.sqlite3")
+
+    with worker_pool(2) as pool:
+        analyzed = list(iter_history_chunks(str(repo), hashes, analyze_functions_in_source, cache=cache, pool=pool, skip_empty=True))
+        cache.commit()
+        # na segunda vez os resultados vêm do cache, lido pelos processos do pool
+        again = list(iter_history_chunks(str(repo), hashes, analyze_functions_in_source, cache=cache, pool=pool, skip_empty=True))
+    cache.close()
+
+    assert [commit.hash for commit in analyzed] == hashes
+    assert [commit.msg for commit in analyzed] == [f"commit {i}" for i in range(7)]
+    # só os arquivos .py modificados em cada commit
+    assert [[name for name, _ in commit.results] for commit in analyzed][:2] == [["mod_0.py"], ["mod_1.py"]]
+    assert analyzed[3].results[0][1][0].function_name == "f3"
+    assert [commit.results for commit in again] == [commit.results for commit in analyzed]
+
+
+def test_cog_analysis_chunked_matches_serial(repo, capsys):
+    outputs = []
+    for jobs in (1, 2):
+        show_cognitive_analysis(str(repo), None, 2, AnalysisOptions(jobs=jobs, to_rev="HEAD", use_cache=False, output_format=OutputFormat.ndjson))
+        outputs.append(capsys.readouterr().out)
+
+    assert outputs[0] == outputs[1]
+    assert outputs[0].count('"kind": "function"') == 7
+
+
+def test_relative_paths_of_two_repositories_in_the_same_pool(repo, tmp_path, monkeypatch, git_repo):
+    other = _fill_history(git_repo(tmp_path / "other"), label=" (outro)")
+    with worker_pool(2) as pool:
+        for path in (repo, other):
+            # como no `minero serve`: o pool continua no diretório em que foi criado
+            monkeypatch.chdir(path)
+            hashes = path.git("rev-list", "--reverse", "HEAD").split()
+            analyzed = list(iter_history_chunks(".", hashes, analyze_functions_in_source, pool=pool, skip_empty=True))
+            assert [commit.hash for commit in analyzed] == hashes
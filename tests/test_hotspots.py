@@ -0,0 +1,115 @@
+import pytest
+
+from src.minero.cache import AnalysisCache
+from src.minero.hotspots import (
+    collect_churn,
+    history_churn,
+    rank_hotspots,
+    show_hotspots,
+    split_rename,
+)
+from src.minero.options import AnalysisOptions, OutputFormat
+
+
+COMPLEX = "def f(a):\n    if a:\n        for x in a:\n            if x:\n                return x\n"
+
+
+@pytest.fixture
+def repo(tmp_path, git_repo):
+    repo = git_repo(tmp_path / "repo")
+    (repo / "image.bin").write_bytes(b"\x00\x01\x02")
+    repo.commit("primeiro", {
+        "old_name.py": COMPLEX + "".join(f"x{i} = {i}\n" for i in range(20)),
+        "simple.py": "def g():\n    return 1\n",
+        "gone.py": "a = 1\n",
+        "notes.txt": "texto\n",
+    })
+
+    # renomeado (com uma pequena alteração) para um subdiretório
+    (repo / "pkg").mkdir()
+    repo.git("mv", "old_name.py", "pkg/core.py")
+    repo.commit("segundo", {
+        "pkg/core.py": COMPLEX + "".join(f"x{i} = {i}\n" for i in range(21)),
+        "simple.py": "def g():\n    return 2\n",
+    })
+
+    repo.commit("terceiro", {"pkg/core.py": COMPLEX + "y = 1\n", "gone.py": None})
+    return repo
+
+
+@pytest.mark.parametrize("path, expected", [
+    ("a.py", (None, "a.py")),
+    ("a.py => b.py", ("a.py", "b.py")),
+    ("src/{old => new}/a.py", ("src/old/a.py", "src/new/a.py")),
+    ("{ => pkg}/core.py", ("core.py", "pkg/core.py")),
+    ("pkg/{a.py => b.py}", ("pkg/a.py", "pkg/b.py")),
+    ("{pkg => }/a.py", ("pkg/a.py", "a.py")),
+])
+def test_split_rename(path, expected):
+    assert split_rename(path) == expected
+
+
+def test_churn_follows_renames_and_skips_other_files(repo):
+    churn, renamed = collect_churn(str(repo), "HEAD")
+
+    assert set(churn) == {"pkg/core.py", "simple.py", "gone.py"}
+    assert churn["pkg/core.py"].commits == 3
+    # 25 linhas criadas, +1 na renomeação, -21 +1 no último commit
+    assert churn["pkg/core.py"].lines == 25 + 1 + 22
+    assert churn["simple.py"].lines == 2 + 2
+    assert renamed["old_name.py"] == "pkg/core.py"
+
+
+def test_rank_uses_head_content_of_existing_files(repo):
+    head = repo.git("rev-parse", "HEAD")
+    churn, _ = collect_churn(str(repo), head)
+
+    hotspots = rank_hotspots(str(repo), head, churn)
+
+    assert [h.file_path for h in hotspots] == ["pkg/core.py", "simple.py"]
+    core = hotspots[0]
+    assert (core.complexity, core.functions, core.max_complexity) == (7, 1, 7)
+    assert core.score == core.churn * 7
+    assert hotspots[1].score == hotspots[1].churn * hotspots[1].complexity < core.score
+
+
+def test_candidates_limit_complexity_to_most_changed(repo):
+    head = repo.git("rev-parse", "HEAD")
+    churn, _ = collect_churn(str(repo), head)
+
+    assert [h.file_path for h in rank_hotspots(str(repo), head, churn, candidates=1)] == ["pkg/core.py"]
+
+
+def test_incremental_churn_matches_full_pass(repo, tmp_path):
+    cache = AnalysisCache(tmp_path / "cache.sqlite3")
+    first = repo.git("rev-parse", "HEAD")
+    history_churn(str(repo), first, cache, "repo")
+
+    # renomeia de novo depois do checkpoint
+    repo.git("mv", "pkg/core.py", "pkg/engine.py")
+    head = repo.commit("quarto", {"simple.py": "def g():\n    return 3\n"})
+
+    incremental = history_churn(str(repo), head, cache, "repo")
+    full, _ = collect_churn(str(repo), head)
+    cache.close()
+
+    assert incremental == full
+    assert "pkg/core.py" not in incremental
+    assert incremental["pkg/engine.py"].commits == 4
+
+
+def test_show_hotspots_ndjson(repo, capsys):
+    show_hotspots(str(repo), options=AnalysisOptions(use_cache=False, top=1, output_format=OutputFormat.ndjson))
+
+    out = capsys.readouterr().out.splitlines()
+    assert len(out) == 1
+    assert '"kind": "hotspot"' in out[0]
+    assert '"file_path": "pkg/core.py"' in out[0]
+
+
+def test_show_hotspots_empty_repository(tmp_path, capsys, git_repo):
+    git_repo()
+
+    show_hotspots(str(tmp_path), options=AnalysisOptions(use_cache=False))
+
+    assert "Nenhum arquivo Python" in capsys.readouterr().out
@@ -3,6 +3,12 @@ import pytest
 from unittest.mock import patch, MagicMock
 from src.minero.loc_analysis import check_function_sizes, check_function_exceed_limit_size
       
+@pytest.fixture(autouse=True)
+def no_mirror():
+    """As URLs dos testes são fictícias: o Repository é mockado e nada deve ser clonado."""
+    with patch("src.minero.commit_selection.mirrored_repository", side_effect=lambda repo_url: repo_url):
+        yield
+
 #================= Testes unitários da função check_function_sizes =================#
 
 def test_function_exceeds_limit():
@@ -129,7 +135,7 @@ def mock_repo(mock_modified_files):
     mock_commit.hash = "abc12345"
     mock_commit.modified_files = mock_modified_files
     
-    with patch("src.minero.loc_analysis.Repository") as mock_repo_class:
+    with patch("src.minero.commit_selection.Repository") as mock_repo_class:
         mock_repo_instance = MagicMock()
         mock_repo_instance.traverse_commits.return_value = [mock_commit]
         mock_repo_class.return_value = mock_repo_instance
@@ -206,7 +212,7 @@ def test_no_long_function_found(mock_console_print, mock_builtin_print, mock_che
 @patch("src.minero.loc_analysis.check_function_sizes")
 @patch("src.minero.loc_analysis.print")
 @patch("src.minero.loc_analysis.console.print")
-@patch("src.minero.loc_analysis.Repository") # mock separado, sem a fixture 'mock_repo'
+@patch("src.minero.commit_selection.Repository") # mock separado, sem a fixture 'mock_repo'
 def test_no_python_files_in_commit(mock_repo, mock_console_print, mock_builtin_print, mock_check_sizes):
     """
     Verifica se 'check_function_sizes' NÃO é chamada se o commit
@@ -1,13 +1,18 @@
 # tests/test_cli.py
 from typer.testing import CliRunner
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 import pytest
+import subprocess
+import sys
+import time
+from pathlib import Path
 from src.minero.main import app
+from src.minero.options import AnalysisOptions, BatchAnalysis, OutputFormat
 
 runner = CliRunner()
 
 # -------------------- Testa comando commits --------------------
-@patch("src.minero.main.show_commits_info")
+@patch("src.minero.commits_info.show_commits_info")
 def test_commits_command(mock_show_commits):
     repo_url = "https://github.com/user/repo"
     
@@ -16,11 +21,11 @@ def test_commits_command(mock_show_commits):
     # Verifica saída no console
     assert f"Analisando commits do repositório: {repo_url}" in result.output
     # Verifica que a função interna foi chamada
-    mock_show_commits.assert_called_once_with(repo_url)
+    mock_show_commits.assert_called_once_with(repo_url, AnalysisOptions())
     assert result.exit_code == 0
 
 # -------------------- Testa comando loc --------------------
-@patch("src.minero.main.check_function_exceed_limit_size")
+@patch("src.minero.loc_analysis.check_function_exceed_limit_size")
 def test_loc_command(mock_check_loc):
     repo_url = "https://github.com/user/repo"
     commit_hash = "abc123"
@@ -28,11 +33,11 @@ def test_loc_command(mock_check_loc):
     result = runner.invoke(app, ["loc", repo_url, commit_hash])
     
     assert f"Analisando LOC do repositório: {repo_url}" in result.output
-    mock_check_loc.assert_called_once_with(repo_url, commit_hash)
+    mock_check_loc.assert_called_once_with(repo_url, commit_hash, AnalysisOptions())
     assert result.exit_code == 0
 
 # -------------------- Testa comando params --------------------
-@patch("src.minero.main.check_functions_exceed_param_limit")
+@patch("src.minero.param_analysis.check_functions_exceed_param_limit")
 def test_params_command_default(mock_check_params):
     repo_url = "https://github.com/user/repo"
     commit_hash = "abc123"
@@ -41,10 +46,10 @@ def test_params_command_default(mock_check_params):
     result = runner.invoke(app, ["params", repo_url, commit_hash])
     
     assert f"Analisando quantidade de parâmetros do repositório: {repo_url}" in result.output
-    mock_check_params.assert_called_once_with(repo_url, commit_hash, 5)
+    mock_check_params.assert_called_once_with(repo_url, commit_hash, 5, AnalysisOptions())
     assert result.exit_code == 0
 
-@patch("src.minero.main.check_functions_exceed_param_limit")
+@patch("src.minero.param_analysis.check_functions_exceed_param_limit")
 def test_params_command_custom_limit(mock_check_params):
     repo_url = "https://github.com/user/repo"
     commit_hash = "abc123"
@@ -52,16 +57,289 @@ def test_params_command_custom_limit(mock_check_params):
     
     result = runner.invoke(app, ["params", repo_url, commit_hash, str(param_limit)])
     
-    mock_check_params.assert_called_once_with(repo_url, commit_hash, param_limit)
+    mock_check_params.assert_called_once_with(repo_url, commit_hash, param_limit, AnalysisOptions())
     assert result.exit_code == 0
 
 # -------------------- Testa comando generic --------------------
-@patch("src.minero.main.show_repository_generic_info")
+@patch("src.minero.commits_info.show_repository_generic_info")
 def test_generic_command(mock_show_generic):
     repo_url = "https://github.com/user/repo"
     
     result = runner.invoke(app, ["generic", repo_url])
     
     assert f"Analisando informações do repositório: {repo_url}" in result.output
-    mock_show_generic.assert_called_once_with(repo_url)
+    mock_show_generic.assert_called_once_with(repo_url, AnalysisOptions())
+    assert result.exit_code == 0
+
+# -------------------- Testa comando all --------------------
+@patch("src.minero.analysis_engine.show_full_analysis")
+def test_all_command(mock_show_full):
+    repo_url = "https://github.com/user/repo"
+    commit_hash = "abc123"
+
+    result = runner.invoke(app, ["all", repo_url, commit_hash])
+
+    assert f"Analisando todas as métricas do repositório: {repo_url}" in result.output
+    mock_show_full.assert_called_once_with(repo_url, commit_hash, 5, 12, AnalysisOptions())
+    assert result.exit_code == 0
+
+@patch("src.minero.code_smells_analysis.check_code_smells")
+def test_code_smells_command_no_cache(mock_check_smells):
+    repo_url = "https://github.com/user/repo"
+
+    result = runner.invoke(app, ["code-smells", repo_url, "abc123", "--no-cache"])
+
+    mock_check_smells.assert_called_once_with(repo_url, "abc123", AnalysisOptions(use_cache=False))
+    assert result.exit_code == 0
+
+@patch("src.minero.cognitive_analysis.show_cognitive_analysis")
+def test_cog_analysis_command_jobs(mock_show_cog):
+    repo_url = "https://github.com/user/repo"
+
+    result = runner.invoke(app, ["cog-analysis", repo_url, "abc123", "--jobs", "4"])
+
+    mock_show_cog.assert_called_once_with(repo_url, "abc123", 12, AnalysisOptions(jobs=4))
+    assert result.exit_code == 0
+
+def test_jobs_must_be_positive():
+    result = runner.invoke(app, ["loc", "https://github.com/user/repo", "abc123", "--jobs", "0"])
+
+    assert result.exit_code != 0
+
+# -------------------- Testa intervalo --from/--to --------------------
+@patch("src.minero.loc_analysis.check_function_exceed_limit_size")
+def test_loc_command_commit_range(mock_check_loc):
+    repo_url = "https://github.com/user/repo"
+
+    result = runner.invoke(app, ["loc", repo_url, "--from", "v1.0", "--to", "v1.1"])
+
+    mock_check_loc.assert_called_once_with(repo_url, None, AnalysisOptions(from_rev="v1.0", to_rev="v1.1"))
+    assert result.exit_code == 0
+
+@patch("src.minero.code_smells_analysis.check_code_smells")
+def test_commit_hash_and_range_are_exclusive(mock_check_smells):
+    result = runner.invoke(app, ["code-smells", "https://github.com/user/repo", "abc123", "--from", "v1.0"])
+
+    assert result.exit_code != 0
+    mock_check_smells.assert_not_called()
+
+@patch("src.minero.param_analysis.check_functions_exceed_param_limit")
+def test_commit_hash_or_range_required(mock_check_params):
+    result = runner.invoke(app, ["params", "https://github.com/user/repo"])
+
+    assert result.exit_code != 0
+    mock_check_params.assert_not_called()
+
+@patch("src.minero.loc_analysis.check_function_exceed_limit_size")
+def test_loc_command_last(mock_check_loc):
+    repo_url = "https://github.com/user/repo"
+
+    result = runner.invoke(app, ["loc", repo_url, "--last", "3"])
+
+    mock_check_loc.assert_called_once_with(repo_url, None, AnalysisOptions(last=3))
+    assert result.exit_code == 0
+
+@patch("src.minero.loc_analysis.check_function_exceed_limit_size")
+def test_last_and_range_are_exclusive(mock_check_loc):
+    result = runner.invoke(app, ["loc", "https://github.com/user/repo", "--last", "3", "--from", "v1.0"])
+
+    assert result.exit_code != 0
+    mock_check_loc.assert_not_called()
+
+@patch("src.minero.loc_analysis.check_function_exceed_limit_size")
+def test_loc_command_ndjson(mock_check_loc):
+    repo_url = "https://github.com/user/repo"
+
+    result = runner.invoke(app, ["loc", repo_url, "abc123", "--format", "ndjson"])
+
+    # a mensagem inicial não é misturada aos registros NDJSON
+    assert result.output == ""
+    mock_check_loc.assert_called_once_with(repo_url, "abc123", AnalysisOptions(output_format=OutputFormat.ndjson))
+    assert result.exit_code == 0
+
+# -------------------- Testa o tempo de inicialização --------------------
+HELP_STARTUP_BUDGET = 1.0  # segundos, com folga para máquinas de CI lentas
+ROOT = Path(__file__).resolve().parent.parent
+
+HELP_SCRIPT = """
+import sys
+from src.minero.main import app
+try:
+    app(["--help"])
+except SystemExit:
+    pass
+heavy = sorted({m.split(".")[0] for m in sys.modules} & {"pydriller", "git", "lizard"})
+heavy += sorted(m for m in sys.modules if m.startswith("src.minero.") and m not in ("src.minero.main", "src.minero.options"))
+print("HEAVY:" + ",".join(heavy))
+"""
+
+def test_help_does_not_import_analysis_modules():
+    result = subprocess.run([sys.executable, "-c", HELP_SCRIPT], cwd=ROOT, capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip().endswith("HEAVY:")
+
+def test_help_startup_budget():
+    timings = []
+    for _ in range(3):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-m", "src.minero.main", "--help"], cwd=ROOT, stdout=subprocess.DEVNULL, check=True)
+        timings.append(time.perf_counter() - start)
+
+    assert min(timings) < HELP_STARTUP_BUDGET
+
+@patch("src.minero.code_smells_analysis.check_code_smells")
+def test_code_smells_command_snapshot(mock_check_smells):
+    repo_url = "https://github.com/user/repo"
+
+    result = runner.invoke(app, ["code-smells", repo_url, "--snapshot"])
+
+    mock_check_smells.assert_called_once_with(repo_url, None, AnalysisOptions(snapshot=True))
+    assert result.exit_code == 0
+
+def test_snapshot_rejects_ranges():
+    result = runner.invoke(app, ["loc", "https://github.com/user/repo", "--snapshot", "--last", "3"])
+
+    assert result.exit_code != 0
+
+@patch("src.minero.param_analysis.check_functions_exceed_param_limit")
+def test_params_command_staged(mock_check_params, tmp_path):
+    result = runner.invoke(app, ["params", str(tmp_path), "--staged"])
+
+    mock_check_params.assert_called_once_with(str(tmp_path), None, 5, AnalysisOptions(staged=True))
+    assert result.exit_code == 0
+
+SELECTIONS = [
+    (["abc123"], "abc123", {}),
+    (["--from", "v1", "--to", "v2"], None, {"from_rev": "v1", "to_rev": "v2"}),
+    (["--last", "1"], None, {"last": 1}),
+    (["--snapshot"], None, {"snapshot": True}),
+    (["--staged"], None, {"staged": True}),
+    (["--worktree"], None, {"worktree": True}),
+]
+
+@pytest.mark.parametrize("args, commit_hash, selection", SELECTIONS)
+def test_limits_with_every_selection(args, commit_hash, selection, tmp_path):
+    repo_url = str(tmp_path)
+    with patch("src.minero.param_analysis.check_functions_exceed_param_limit") as mock_params, \
+         patch("src.minero.cognitive_analysis.show_cognitive_analysis") as mock_cog, \
+         patch("src.minero.analysis_engine.show_full_analysis") as mock_all:
+        params = runner.invoke(app, ["params", repo_url, *args, "--param-limit", "2"])
+        cog = runner.invoke(app, ["cog-analysis", repo_url, *args, "--complexity-threshold", "7"])
+        full = runner.invoke(app, ["all", repo_url, *args, "--param-limit", "2", "--complexity-threshold", "7"])
+
+    assert (params.exit_code, cog.exit_code, full.exit_code) == (0, 0, 0), params.output + cog.output + full.output
+    options = AnalysisOptions(**selection)
+    mock_params.assert_called_once_with(repo_url, commit_hash, 2, options)
+    mock_cog.assert_called_once_with(repo_url, commit_hash, 7, options)
+    mock_all.assert_called_once_with(repo_url, commit_hash, 2, 7, options)
+
+@patch("src.minero.analysis_engine.show_full_analysis")
+def test_all_command_deprecated_positional_limits(mock_show_full):
+    result = runner.invoke(app, ["all", "https://github.com/user/repo", "abc123", "3", "9"])
+
+    assert result.exit_code == 0
+    mock_show_full.assert_called_once_with("https://github.com/user/repo", "abc123", 3, 9, AnalysisOptions())
+    assert "use --param-limit 3" in result.output
+    assert "use --complexity-threshold 9" in result.output
+
+@pytest.mark.parametrize("args", [
+    ["--staged", "--worktree"],
+    ["--staged", "--last", "2"],
+    ["abc123", "--worktree"],
+    ["--worktree", "--snapshot"],
+])
+def test_working_tree_rejects_other_selections(args, tmp_path):
+    result = runner.invoke(app, ["code-smells", str(tmp_path), *args])
+
+    assert result.exit_code != 0
+
+def test_working_tree_rejects_remote_repository():
+    result = runner.invoke(app, ["all", "https://github.com/user/repo", "--staged"])
+
+    assert result.exit_code != 0
+    assert "repositório local" in result.output
+
+@patch("src.minero.loc_analysis.check_function_exceed_limit_size")
+def test_loc_command_changed_only(mock_check_loc):
+    repo_url = "https://github.com/user/repo"
+
+    result = runner.invoke(app, ["loc", repo_url, "--last", "2", "--changed-only"])
+
+    mock_check_loc.assert_called_once_with(repo_url, None, AnalysisOptions(last=2, changed_only=True))
+    assert result.exit_code == 0
+
+def test_changed_only_rejects_snapshot():
+    result = runner.invoke(app, ["cog-analysis", "https://github.com/user/repo", "--snapshot", "--changed-only"])
+
+    assert result.exit_code != 0
+
+@patch("src.minero.trend_analysis.show_function_trend")
+def test_trend_command(mock_trend):
+    repo_url = "https://github.com/user/repo"
+
+    result = runner.invoke(app, ["trend", repo_url, "--function", "Classe.*", "-j", "2"])
+
+    mock_trend.assert_called_once_with(repo_url, "Classe.*", AnalysisOptions(jobs=2))
+    assert result.exit_code == 0
+
+@patch("src.minero.hotspots.show_hotspots")
+def test_hotspots_command(mock_hotspots):
+    repo_url = "https://github.com/user/repo"
+
+    result = runner.invoke(app, ["hotspots", repo_url, "--candidates", "30", "--top", "5", "--format", "ndjson"])
+
+    mock_hotspots.assert_called_once_with(repo_url, 30, AnalysisOptions(top=5, output_format=OutputFormat.ndjson))
+    assert result.exit_code == 0
+    assert result.output == ""
+
+@patch("src.minero.summary_analysis.show_summary")
+def test_summary_command_defaults_to_snapshot(mock_summary):
+    repo_url = "https://github.com/user/repo"
+
+    result = runner.invoke(app, ["summary", repo_url, "--percentile", "95", "--depth", "2"])
+
+    mock_summary.assert_called_once_with(repo_url, None, 95.0, 2, AnalysisOptions(snapshot=True))
+    assert result.exit_code == 0
+
+@patch("src.minero.summary_analysis.show_summary")
+def test_summary_command_range(mock_summary):
+    repo_url = "https://github.com/user/repo"
+
+    result = runner.invoke(app, ["summary", repo_url, "--last", "10", "--top", "3"])
+
+    mock_summary.assert_called_once_with(repo_url, None, None, 1, AnalysisOptions(last=10, top=3))
+    assert result.exit_code == 0
+
+def test_summary_rejects_invalid_percentile():
+    result = runner.invoke(app, ["summary", ".", "--percentile", "120"])
+    assert result.exit_code != 0
+
+@patch("src.minero.batch_analysis.show_batch_analysis")
+def test_batch_command_exits_with_error_on_failures(mock_batch, tmp_path):
+    manifest = tmp_path / "manifest.txt"
+    manifest.write_text("/repo\n")
+    mock_batch.return_value = MagicMock(failed=1)
+
+    result = runner.invoke(app, ["batch", str(manifest), "--analysis", "params", "--io-jobs", "8", "--last", "3"])
+
+    mock_batch.assert_called_once_with(manifest, BatchAnalysis.params, AnalysisOptions(last=3), 8, 5, 12)
+    assert result.exit_code == 1
+
+@patch("src.minero.cognitive_analysis.show_cognitive_analysis")
+def test_cog_analysis_command_top_and_only_violations(mock_show_cog):
+    repo_url = "https://github.com/user/repo"
+
+    result = runner.invoke(app, ["cog-analysis", repo_url, "abc123", "--top", "10", "--only-violations"])
+
+    mock_show_cog.assert_called_once_with(repo_url, "abc123", 12, AnalysisOptions(top=10, only_violations=True))
+    assert result.exit_code == 0
+
+@patch("src.minero.code_smells_analysis.check_code_smells")
+def test_code_smells_command_profile_dump_implies_profile(mock_check_smells):
+    repo_url = "https://github.com/user/repo"
+
+    result = runner.invoke(app, ["code-smells", repo_url, "abc123", "--profile-dump", "run.pstats", "--profile-files", "5"])
+
+    mock_check_smells.assert_called_once_with(repo_url, "abc123", AnalysisOptions(profile=True, profile_files=5,
+                                                                                  profile_dump=Path("run.pstats")))
     assert result.exit_code == 0
@@ -0,0 +1,33 @@
+import io
+import json
+
+from src.minero.cognitive_analysis import FunctionComplexity
+from src.minero.ndjson_output import function_record, is_ndjson, smell_record, write_record
+from src.minero.options import AnalysisOptions, OutputFormat
+
+
+def test_is_ndjson():
+    assert is_ndjson(AnalysisOptions(output_format=OutputFormat.ndjson))
+    assert not is_ndjson(AnalysisOptions())
+    assert not is_ndjson(None)
+
+
+def test_write_record_one_line_per_record():
+    stream = io.StringIO()
+    write_record({"kind": "smell", "description": "Função 'f'\ncom quebra"}, stream)
+    write_record({"kind": "function"}, stream)
+
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 2
+    assert json.loads(lines[0])["description"] == "Função 'f'\ncom quebra"
+
+
+def test_records():
+    function = FunctionComplexity("a.py", "f", 3, lineno=1, end_lineno=4)
+    assert function_record("abc", function, complexity=3) == {
+        "kind": "function", "commit_hash": "abc", "file_path": "a.py", "function_name": "f",
+        "start_line": 1, "end_line": 4, "complexity": 3,
+    }
+
+    smell = {"smell_type": "magic_number", "line_number": 2, "description": "Magic number 42", "file_path": "a.py"}
+    assert smell_record("abc", smell)["smell_type"] == "magic_number"
@@ -0,0 +1,87 @@
+import pytest
+
+from src.minero.cache import AnalysisCache
+from src.minero.parallel import analyze_files, keep_worker_pools, worker_pool
+from src.minero.cognitive_analysis import analyze_functions_in_source
+from src.minero.param_analysis import check_functions_num_params
+
+
+class FakeFile:
+    def __init__(self, filename, source, sha=None):
+        self.filename = filename
+        self.blob_sha = sha
+        self._source = source
+        self.reads = 0
+
+    @property
+    def source_code(self):
+        self.reads += 1
+        return self._source
+
+
+def make_files(count):
+    files = []
+    for i in range(count):
+        nested = "\n".join("    " * (d + 1) + f"if x{d}:" for d in range(i % 4)) or "    pass"
+        source = f"def f{i}(a, b, c, d, e, f):\n{nested}\n" + "    " * (i % 4 + 1) + "return 1\n"
+        files.append(FakeFile(f"mod_{i}.py", source))
+    return files
+
+
+def test_worker_pool_serial():
+    with worker_pool(1) as pool:
+        assert pool is None
+
+
+def test_kept_worker_pools_are_reused_per_jobs():
+    files = make_files(4)
+
+    with keep_worker_pools():
+        with worker_pool(2) as first:
+            expected = analyze_files(files, analyze_functions_in_source, pool=first)
+        with worker_pool(2) as second:
+            assert second is first
+            # o pool segue aceitando tarefas depois do primeiro comando
+            assert analyze_files(files, analyze_functions_in_source, pool=second) == expected
+        with worker_pool(3) as other:
+            assert other is not first
+
+    assert first._shutdown_thread
+    with worker_pool(2) as pool:
+        assert pool is not first
+
+
+def test_parallel_results_match_serial_and_keep_order():
+    files = make_files(12)
+
+    serial = analyze_files(files, analyze_functions_in_source)
+    with worker_pool(3) as pool:
+        parallel = analyze_files(files, analyze_functions_in_source, pool=pool)
+
+    assert [f.filename for f, _ in parallel] == [f.filename for f in files]
+    assert [[(r.function_name, r.complexity) for r in result] for _, result in parallel] == \
+           [[(r.function_name, r.complexity) for r in result] for _, result in serial]
+
+
+def test_parallel_passes_extra_args():
+    files = make_files(4)
+
+    with worker_pool(2) as pool:
+        results = analyze_files(files, check_functions_num_params, 6, pool=pool)
+
+    assert all(result == [] for _, result in results)
+
+
+def test_parallel_skip_empty_and_cache(tmp_path):
+    cache = AnalysisCache(tmp_path / "analysis.sqlite3")
+    files = [FakeFile("a.py", "def a(): pass", "a" * 40), FakeFile("empty.py", None), FakeFile("b.py", "def b(): pass", "b" * 40)]
+
+    with worker_pool(2) as pool:
+        first = analyze_files(files, analyze_functions_in_source, cache=cache, pool=pool, skip_empty=True)
+        again = [FakeFile("a.py", "def a(): pass", "a" * 40), FakeFile("b.py", "def b(): pass", "b" * 40)]
+        second = analyze_files(again, analyze_functions_in_source, cache=cache, pool=pool, skip_empty=True)
+    cache.close()
+
+    assert first[1][1] is None
+    assert [r[0].function_name for _, r in second] == ["a", "b"]
+    assert all(f.reads == 0 for f in again)
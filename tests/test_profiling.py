@@ -0,0 +1,66 @@
+import json
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.minero import profiling
+from src.minero.profiling import Profiler, StageTime, TimedSource, stage
+
+
+def test_profiler_accumulates_stages_and_keeps_slowest_files():
+    profiler = Profiler(slowest_files=2)
+    with profiler.stage("traversal"):
+        time.sleep(0.001)
+    with profiler.stage("traversal"):
+        pass
+    profiler.add_stages({"ast_parse": StageTime(0.5, 0.4, 1)})
+    profiler.add_stages({"ast_parse": StageTime(0.25, 0.2, 1)})
+    for seconds, label in [(0.1, "a.py"), (0.3, "b.py"), (0.2, "c.py")]:
+        profiler.add_file(label, seconds)
+
+    assert profiler.stages["traversal"].calls == 2
+    assert profiler.stages["traversal"].wall >= 0.001
+    parse = profiler.stages["ast_parse"]
+    assert (parse.wall, parse.cpu, parse.calls) == (pytest.approx(0.75), pytest.approx(0.6), 2)
+    assert [label for _, label in profiler.slowest.items()] == ["b.py", "c.py"]
+
+
+def test_stage_without_profiler_measures_nothing():
+    with stage(None, "rendering"):
+        pass
+
+
+def test_timed_source_measures_reads_and_delegates():
+    profiler = Profiler()
+    timed_file = TimedSource(MagicMock(filename="app.py", source_code="x = 1\n"), profiler)
+
+    assert timed_file.source_code == "x = 1\n"
+    assert timed_file.filename == "app.py"
+    assert profiler.stages["source_read"].calls == 1
+    assert timed_file.read_seconds >= 0
+
+
+def test_report_ndjson_orders_stages_by_wall_time(capsys):
+    profiler = Profiler()
+    profiler.add_stages({"fast": StageTime(0.1, 0.1, 1), "slow": StageTime(2.0, 1.5, 3)})
+    profiler.add_file("abc app.py", 2.1)
+
+    profiler.report(ndjson=True)
+
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(r["kind"], r.get("stage")) for r in records[:2]] == [("profile_stage", "slow"), ("profile_stage", "fast")]
+    assert records[2] == {"kind": "profile_file", "file": "abc app.py", "seconds": 2.1}
+    assert records[3]["kind"] == "profile_total"
+
+
+def test_report_table():
+    profiler = Profiler()
+    profiler.add_stages({"ast_parse": StageTime(0.1, 0.1, 1)})
+    profiler.add_file("abc app.py", 0.1)
+
+    with patch.object(profiling, "console") as mock_console:
+        profiler.report()
+
+    tables = [call.args[0] for call in mock_console.print.call_args_list if call.args and hasattr(call.args[0], "row_count")]
+    assert [table.row_count for table in tables] == [1, 1]
@@ -0,0 +1,55 @@
+import json
+import pickle
+
+from src.minero.cognitive_analysis import FunctionComplexity
+from src.minero.code_smells_analysis import detect_code_smells
+from src.minero.loc_analysis import check_function_sizes
+from src.minero.ndjson_output import smell_record
+from src.minero.records import LARGE_CLASS, LongFunctionRecord, SmellRecord
+
+
+def test_smell_record_reads_like_the_old_dict():
+    smell = SmellRecord("large_class", 3, "app.py", LARGE_CLASS, "Service", 12)
+
+    assert smell["smell_type"] == "large_class"
+    assert smell["description"] == "Classe 'Service' tem 12 métodos (recomendado: ≤10) - possível God Class"
+    assert smell == {"smell_type": "large_class", "line_number": 3, "file_path": "app.py",
+                     "description": "Classe 'Service' tem 12 métodos (recomendado: ≤10) - possível God Class"}
+    assert json.loads(json.dumps(smell_record("abc", smell)))["line_number"] == 3
+    assert not hasattr(smell, "__dict__")
+
+
+def test_description_is_built_only_when_read():
+    class Template(str):
+        calls = 0
+
+        def format(self, *args):
+            Template.calls += 1
+            return super().format(*args)
+
+    smell = SmellRecord("magic_number", 1, "app.py", Template("Magic number {}"), 42)
+    assert Template.calls == 0
+    assert smell.description == "Magic number 42"
+    assert Template.calls == 1
+
+
+def test_records_pickle_and_intern_paths():
+    source = "x = 100\ny = 200\n\n" + "def long():\n" + "    a = 1\n" * 205
+    path = "".join(["pkg/", "mod.py"])
+
+    smells = pickle.loads(pickle.dumps(detect_code_smells(source, path)))
+    functions = pickle.loads(pickle.dumps(check_function_sizes(source, path)))
+
+    assert [s.description for s in smells if s.smell_type == "magic_number"] == ["Magic number 100", "Magic number 200"]
+    assert functions == [LongFunctionRecord("long", 206, 4, 209, "pkg/mod.py")]
+    assert {**functions[0]}["line_count"] == 206
+    assert smells[0].file_path is smells[1].file_path is functions[0].file_path
+
+
+def test_function_complexity_has_slots_and_interned_path():
+    first = FunctionComplexity("".join(["a", ".py"]), "f", 1)
+    second = FunctionComplexity("".join(["a", ".py"]), "g", 2)
+
+    assert not hasattr(first, "__dict__")
+    assert first.file_path is second.file_path
+    assert pickle.loads(pickle.dumps(first)) == first
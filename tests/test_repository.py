@@ -0,0 +1,129 @@
+import shutil
+import subprocess
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from src.minero import repository
+from src.minero.repository import git_repository, keep_git_repositories, local_repository, mirror_path, mirrored_repository
+
+
+@pytest.fixture
+def remote(tmp_path, monkeypatch, git_repo):
+    monkeypatch.setenv("MINERO_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(repository, "_updated", set())
+    origin = git_repo(tmp_path / "origin")
+    origin.commit("primeiro", {"app.py": "# primeiro\n"})
+    return origin
+
+
+def test_local_paths_are_not_mirrored(tmp_path):
+    assert mirrored_repository(str(tmp_path)) == str(tmp_path)
+
+
+def test_mirror_path_is_stable_and_readable(tmp_path, monkeypatch):
+    monkeypatch.setenv("MINERO_CACHE_DIR", str(tmp_path))
+
+    path = mirror_path("https://github.com/user/repo.git")
+
+    assert path == mirror_path("https://github.com/user/repo.git")
+    assert path != mirror_path("https://gitlab.com/user/repo.git")
+    assert path.parent == tmp_path / "mirrors"
+    assert path.name.startswith("repo-") and path.name.endswith(".git")
+
+
+def test_mirror_is_cloned_once_and_fetched_on_later_uses(remote, monkeypatch):
+    url = f"file://{remote}"
+    path = mirrored_repository(url)
+    assert remote.git("-C", path, "rev-parse", "HEAD") == remote.git("rev-parse", "HEAD")
+
+    new_head = remote.commit("segundo", {"app.py": "# segundo\n"})
+    # outra execução do minero: o espelho é atualizado com um fetch, sem clonar de novo
+    monkeypatch.setattr(repository, "_updated", set())
+    with patch("src.minero.repository._git", wraps=repository._git) as spy:
+        with local_repository(url) as again:
+            assert again == path
+            assert remote.git("-C", again, "rev-parse", "HEAD") == new_head
+        # no mesmo processo, a URL já atualizada não é buscada de novo
+        mirrored_repository(url)
+
+    assert [call.args[2] for call in spy.call_args_list] == ["fetch"]
+
+
+def test_concurrent_uses_share_one_clone(remote):
+    url = f"file://{remote}"
+    results = []
+    with patch("src.minero.repository._git", wraps=repository._git) as spy:
+        threads = [threading.Thread(target=lambda: results.append(mirrored_repository(url))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert len(set(results)) == 1
+    assert [call.args[0] for call in spy.call_args_list] == ["clone"]
+    assert not [p for p in mirror_path(url).parent.iterdir() if p.is_dir() and p != mirror_path(url)]
+
+
+def test_failed_clone_leaves_no_mirror(tmp_path, monkeypatch):
+    monkeypatch.setenv("MINERO_CACHE_DIR", str(tmp_path / "cache"))
+    url = f"file://{tmp_path / 'missing'}"
+
+    with pytest.raises(subprocess.CalledProcessError) as error:
+        mirrored_repository(url)
+
+    assert "missing" in error.value.stderr
+    assert not mirror_path(url).exists()
+
+
+def test_git_repository_is_closed_after_each_use(tmp_path, git_repo):
+    git_repo(tmp_path / "repo").commit("primeiro")
+
+    with patch.object(repository.Git, "clear") as clear:
+        for _ in range(2):
+            with git_repository(str(tmp_path / "repo")) as git:
+                assert git.get_head().msg == "primeiro"
+
+    assert clear.call_count == 2
+
+
+def test_kept_git_repositories_are_reused(tmp_path, monkeypatch, git_repo):
+    repo = git_repo(tmp_path / "repo")
+    head = repo.commit("primeiro")
+
+    with keep_git_repositories():
+        with git_repository(str(tmp_path / "repo")) as first:
+            assert first.get_commit(head).msg == "primeiro"
+        # o mesmo repositório por um caminho relativo, e um commit novo já é visto
+        monkeypatch.chdir(tmp_path / "repo")
+        second_head = repo.commit("segundo")
+        with git_repository(".") as second:
+            assert second is first
+            assert second.get_commit(second_head).msg == "segundo"
+
+        # trocado por outro repositório no mesmo caminho: outro Git, com os objetos novos
+        monkeypatch.chdir(tmp_path)
+        shutil.move(tmp_path / "repo", tmp_path / "antigo")
+        other_head = git_repo(tmp_path / "repo").commit("outro")
+        with git_repository(str(tmp_path / "repo")) as third:
+            assert third is not first
+            assert third.get_commit(other_head).msg == "outro"
+
+    assert repository._kept_repositories is None
+
+
+def test_kept_git_repositories_are_limited(tmp_path, monkeypatch, git_repo):
+    monkeypatch.setattr(repository, "KEPT_REPOSITORIES", 2)
+    for name in ("a", "b", "c"):
+        git_repo(tmp_path / name).commit("primeiro")
+
+    with keep_git_repositories():
+        opened = {}
+        for name in ("a", "b", "a", "c"):
+            with git_repository(str(tmp_path / name)) as git:
+                opened.setdefault(name, git)
+        kept = list(repository._kept_repositories.values())
+
+    # "b" foi o menos usado recentemente
+    assert kept == [opened["a"], opened["c"]]
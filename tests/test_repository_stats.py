@@ -0,0 +1,190 @@
+import subprocess
+from itertools import islice
+from unittest.mock import patch
+
+import pytest
+from pydriller import Repository
+
+from src.minero.cache import AnalysisCache
+from src.minero import repository_stats
+from src.minero.repository_stats import collect_repository_stats, first_commits, head_commit, incremental_checkpoint, iter_log, list_branches
+
+
+@pytest.fixture
+def history(git_repo):
+    """Repositório com vários autores, subdiretórios, renomeação, remoção, branch e merge."""
+    history = git_repo()
+    history.commit("root", {"a.py": "a = 1\n", "pkg/b.py": "b = 1\n"}, author="Ana")
+
+    history.git("checkout", "-q", "-b", "feature")
+    history.commit("feature", {"pkg/c.py": "c = 1\n"}, author="Bruno")
+
+    history.git("checkout", "-q", "main")
+    history.git("mv", "a.py", "renamed.py")
+    history.commit("rename", author="Ana")
+    history.commit("delete", {"pkg/b.py": None}, author="Carla")
+    history.git("merge", "-q", "--no-ff", "-m", "merge", "feature", author="Ana")
+
+    history.git("checkout", "-q", "-b", "other", "HEAD~1")
+    history.git("checkout", "-q", "main")
+    return history
+
+
+@pytest.fixture
+def repo(history):
+    return str(history)
+
+
+def pydriller_stats(repo_path):
+    """Cálculo original do comando generic, via PyDriller, usado como referência."""
+    total_files, total_branches, authors = set(), set(), {}
+    total_commits = 0
+    for commit in Repository(repo_path).traverse_commits():
+        total_commits += 1
+        total_branches.update(commit.branches)
+        authors[commit.author.name] = authors.get(commit.author.name, 0) + 1
+        for file in commit.modified_files:
+            total_files.add(file.filename)
+    return total_commits, total_files, total_branches, authors
+
+
+def test_stats_match_pydriller(repo):
+    stats = collect_repository_stats(repo)
+    total_commits, total_files, total_branches, authors = pydriller_stats(repo)
+
+    assert stats.total_commits == total_commits == 5
+    assert stats.total_files == total_files
+    assert stats.total_branches == total_branches
+    assert stats.authors_commit_number == authors
+    # a ordem dos autores (primeiro commit de cada um) também é preservada
+    assert list(stats.authors_commit_number) == list(authors)
+
+
+def test_iter_log_oldest_first_and_merges_without_files(repo):
+    log = list(iter_log(repo))
+
+    assert len(log) == 5
+    assert log[0][1] == "Ana"
+    assert sorted(log[0][2]) == ["a.py", "pkg/b.py"]
+    assert log[-1][2] == []
+
+
+def test_list_branches(repo):
+    assert list_branches(repo) == {"main", "feature", "other"}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = AnalysisCache(tmp_path / "cache" / "analysis.sqlite3")
+    yield cache
+    cache.close()
+
+
+def commit_file(history, name, author="Dan"):
+    history.commit(f"add {name}", {name: f"{name} = 1\n"}, author=author)
+
+
+def assert_same_stats(stats, expected):
+    assert stats.total_commits == expected.total_commits
+    assert stats.total_files == expected.total_files
+    assert stats.total_branches == expected.total_branches
+    assert stats.authors_commit_number == expected.authors_commit_number
+
+
+def rev_parse(repo, rev="HEAD"):
+    return subprocess.run(["git", "-C", repo, "rev-parse", rev], capture_output=True, text=True).stdout.strip()
+
+
+def test_checkpoint_reads_only_new_commits(repo, history, cache):
+    collect_repository_stats(repo, cache, "repo")
+    old_head = rev_parse(repo)
+    commit_file(history, "new.py", author="Eva")
+
+    with patch.object(repository_stats, "iter_log", wraps=iter_log) as spy:
+        stats = collect_repository_stats(repo, cache, "repo")
+
+    spy.assert_called_once_with(repo, f"{old_head}..{rev_parse(repo)}")
+    assert_same_stats(stats, collect_repository_stats(repo))
+    assert stats.authors_commit_number["Eva"] == 1
+
+
+def test_checkpoint_unchanged_head_skips_log(repo, cache):
+    first = collect_repository_stats(repo, cache, "repo")
+
+    with patch.object(repository_stats, "iter_log", wraps=iter_log) as spy:
+        second = collect_repository_stats(repo, cache, "repo")
+
+    spy.assert_not_called()
+    assert_same_stats(second, first)
+
+
+def test_checkpoint_rebuilds_after_history_rewrite(repo, history, cache):
+    commit_file(history, "temp.py", author="Eva")
+    collect_repository_stats(repo, cache, "repo")
+
+    history.git("reset", "-q", "--hard", "HEAD~1")
+    commit_file(history, "other.py", author="Fabio")
+    stats = collect_repository_stats(repo, cache, "repo")
+
+    assert "Eva" not in stats.authors_commit_number
+    assert "temp.py" not in stats.total_files
+    assert_same_stats(stats, collect_repository_stats(repo))
+
+
+def test_first_commits_match_pydriller(repo, history):
+    for i in range(8):
+        commit_file(history, f"f{i}.py")
+
+    records = first_commits(repo, 10)
+    expected = list(islice(Repository(repo).traverse_commits(), 10))
+
+    assert [r.hash for r in records] == [c.hash for c in expected]
+    assert [r.msg for r in records] == [c.msg for c in expected]
+    assert [r.author for r in records] == [c.author.name for c in expected]
+    assert [r.files for r in records] == [[f.filename for f in c.modified_files] for c in expected]
+
+
+def test_first_commits_checkpoint(repo, history, cache):
+    first = first_commits(repo, 3, cache, "repo")
+
+    with patch.object(repository_stats, "git_repository", side_effect=AssertionError("não deveria carregar commits")):
+        assert first_commits(repo, 3, cache, "repo") == first
+        # HEAD mudou, mas os 3 primeiros commits já são conhecidos
+        commit_file(history, "new.py")
+        assert first_commits(repo, 3, cache, "repo") == first
+
+
+def test_empty_repository(tmp_path, git_repo):
+    git_repo()
+    assert collect_repository_stats(str(tmp_path)).total_commits == 0
+    assert first_commits(str(tmp_path)) == []
+
+
+def test_incremental_checkpoint(repo, history, cache):
+    calls = []
+
+    def build(rev):
+        calls.append(("build", rev))
+        return [rev]
+
+    def extend(value, rev):
+        calls.append(("extend", rev))
+        return value + [rev]
+
+    def run():
+        return incremental_checkpoint(cache, "teste|1", repo, head_commit(repo), build, extend)
+
+    first = head_commit(repo)
+    assert run() == [first]
+    # sem commits novos, o valor guardado volta sem chamar build nem extend
+    assert run() == [first]
+    commit_file(history, "new.py")
+    second = head_commit(repo)
+    assert run() == [first, f"{first}..{second}"]
+
+    # histórico reescrito: recalculado do zero
+    history.git("reset", "-q", "--hard", "HEAD~1")
+    commit_file(history, "other.py")
+    third = head_commit(repo)
+    assert run() == [third]
+    assert calls == [("build", first), ("extend", f"{first}..{second}"), ("build", third)]
@@ -0,0 +1,76 @@
+import os
+import subprocess
+
+import pytest
+
+from src.minero.analysis_engine import analyze_source
+from src.minero.code_smells_analysis import check_code_smells
+from src.minero.options import AnalysisOptions, OutputFormat
+from src.minero.parallel import analyze_files, worker_pool
+from src.minero.snapshot import snapshot_commits, tree_files
+
+
+@pytest.fixture
+def repo(tmp_path, git_repo):
+    repo = git_repo()
+    os.symlink("app.py", tmp_path / "link.py")
+    repo.commit("primeiro", {
+        "app.py": "def main(a, b, c, d, e, f, g):\n    return 42\n",
+        "pkg/__init__.py": "",
+        "pkg/sub/__init__.py": "x = 1\n",
+        "README.md": "# docs\n",
+    })
+    repo.git("tag", "v1.0")
+
+    # o commit seguinte modifica só um arquivo: o snapshot de HEAD ainda vê a árvore inteira
+    repo.commit("segundo", {"app.py": "def main():\n    return 1\n"})
+    return str(repo)
+
+
+def test_tree_files_lists_only_python_blobs(repo):
+    head = subprocess.run(["git", "-C", repo, "rev-parse", "HEAD"], capture_output=True, text=True).stdout.strip()
+
+    paths = sorted(path for path, _ in tree_files(repo, head))
+
+    assert paths == ["app.py", "pkg/__init__.py", "pkg/sub/__init__.py"]
+
+
+def test_snapshot_reads_whole_tree_at_tag(repo):
+    commits = 0
+    # os blobs são lidos enquanto o gerador está aberto
+    for snapshot in snapshot_commits(repo, "v1.0"):
+        commits += 1
+        files = {f.filename: f for f in snapshot.modified_files}
+        sources = {name: f.source_code for name, f in files.items()}
+
+    assert commits == 1
+    assert snapshot.msg == "primeiro"
+    assert set(files) == {"app.py", "pkg/__init__.py", "pkg/sub/__init__.py"}
+    assert sources["app.py"].startswith("def main(a, b, c, d, e, f, g)")
+    assert sources["pkg/sub/__init__.py"] == "x = 1\n"
+    assert all(len(f.blob_sha) == 40 for f in snapshot.modified_files)
+
+
+def test_snapshot_defaults_to_head_and_streams_through_pool(repo, monkeypatch):
+    monkeypatch.setattr("src.minero.parallel.BATCH_PER_WORKER", 1)
+
+    for snapshot in snapshot_commits(repo):
+        serial = analyze_files(snapshot.modified_files, analyze_source, skip_empty=True)
+        with worker_pool(2) as pool:
+            parallel = analyze_files(snapshot.modified_files, analyze_source, pool=pool, skip_empty=True)
+
+    assert snapshot.msg == "segundo"
+    assert [f.filename for f, _ in parallel] == [f.filename for f, _ in serial]
+    assert [a and [fn.function_name for fn in a.functions] for _, a in parallel] == \
+           [a and [fn.function_name for fn in a.functions] for _, a in serial]
+
+
+def test_code_smells_snapshot(repo, capsys):
+    options = AnalysisOptions(use_cache=False, output_format=OutputFormat.ndjson, snapshot=True)
+
+    check_code_smells(repo, "v1.0", options)
+
+    out = capsys.readouterr().out
+    assert '"file_path": "app.py"' in out
+    assert '"smell_type": "long_parameter_list"' in out
+    assert '"file_path": "pkg/sub/__init__.py"' in out
@@ -0,0 +1,138 @@
+import json
+from array import array
+from types import SimpleNamespace
+
+import pytest
+
+from src.minero.options import AnalysisOptions, OutputFormat
+from src.minero.summary_analysis import (
+    MetricColumns,
+    collect_metrics,
+    directory_of,
+    function_metrics,
+    histogram,
+    percentile,
+    show_summary,
+    summarize,
+)
+
+SOURCE = """
+def simple(a):
+    return a
+
+def nested(a, b, c):
+    if a:
+        for x in b:
+            if x:
+                return c
+    return None
+"""
+
+
+def _file(path, source, old_path=None):
+    return SimpleNamespace(filename=path.split("/")[-1], new_path=path, old_path=old_path or path,
+                           source_code=source, blob_sha=None)
+
+
+def _commit(*files):
+    return SimpleNamespace(hash="abc", msg="", modified_files=list(files))
+
+
+def test_percentile_interpolates_like_numpy():
+    ordered = [1, 2, 3, 4]
+    assert percentile(ordered, 0) == 1
+    assert percentile(ordered, 50) == 2.5
+    assert percentile(ordered, 90) == pytest.approx(3.7)
+    assert percentile(ordered, 100) == 4
+    assert percentile([7], 95) == 7
+
+
+def test_histogram_counts_each_bucket():
+    assert histogram([0, 0, 1, 3, 4, 9, 60], (0, 1, 2, 5, 10, 50)) == [2, 1, 2, 1, 0, 1]
+
+
+def test_summarize_fixed_and_percentile_thresholds():
+    values = array("I", [0, 1, 2, 13, 20])
+
+    fixed = summarize(values, "complexity")
+    assert (fixed.functions, fixed.maximum, fixed.mean) == (5, 20, 7.2)
+    assert (fixed.threshold, fixed.above_threshold) == (12, 2)
+    assert fixed.percentiles[50] == 2
+    assert sum(fixed.histogram) == 5
+
+    relative = summarize(values, "complexity", threshold_percentile=50)
+    assert (relative.threshold, relative.above_threshold) == (2, 2)
+
+
+def test_function_metrics_columns():
+    columns = function_metrics(SOURCE, "a.py")
+
+    assert list(columns.complexity) == [1, 8]
+    assert list(columns.loc) == [2, 6]
+    assert list(columns.param_count) == [1, 3]
+    assert function_metrics("def (", "a.py") is None
+
+
+@pytest.mark.parametrize("path, depth, expected", [
+    ("a.py", 1, "."),
+    ("src/a.py", 1, "src"),
+    ("src/minero/a.py", 1, "src"),
+    ("src/minero/a.py", 2, "src/minero"),
+])
+def test_directory_of(path, depth, expected):
+    assert directory_of(path, depth) == expected
+
+
+def test_collect_metrics_keeps_latest_version_of_each_file():
+    commits = [
+        _commit(_file("src/a.py", SOURCE), _file("src/old.py", SOURCE), _file("tests/t.py", SOURCE)),
+        _commit(_file("src/a.py", "def f():\n    pass\n"), _file("lib/new.py", SOURCE, old_path="src/old.py"),
+                SimpleNamespace(filename="t.py", new_path=None, old_path="tests/t.py"),
+                _file("src/broken.py", "def (")),
+    ]
+
+    directories, parse_errors = collect_metrics(commits)
+
+    assert set(directories) == {"src", "lib"}
+    assert list(directories["src"].complexity) == [0]
+    assert list(directories["lib"].complexity) == [1, 8]
+    assert parse_errors == 1
+
+
+def test_collect_metrics_newest_first_skips_older_versions():
+    commits = [
+        _commit(_file("src/a.py", "def f():\n    pass\n"), SimpleNamespace(filename="t.py", new_path=None, old_path="t.py")),
+        _commit(_file("src/a.py", SOURCE), _file("t.py", SOURCE)),
+    ]
+
+    directories, _ = collect_metrics(commits, newest_first=True)
+
+    assert list(directories) == ["src"]
+    assert len(directories["src"]) == 1
+
+
+def test_metric_columns_extend():
+    total = MetricColumns()
+    total.extend(function_metrics(SOURCE, "a.py"))
+    total.extend(function_metrics(SOURCE, "b.py"))
+
+    assert len(total) == 4
+    assert list(total.column("param_count")) == [1, 3, 1, 3]
+
+
+def test_show_summary_ndjson(tmp_path, capsys, git_repo):
+    repo = git_repo(tmp_path / "repo")
+    repo.commit("primeiro", {"pkg/mod.py": SOURCE, "main.py": "def main():\n    return 0\n"})
+
+    show_summary(str(repo), threshold_percentile=50,
+                 options=AnalysisOptions(use_cache=False, snapshot=True, output_format=OutputFormat.ndjson))
+
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    summaries = {r["metric"]: r for r in records if r["kind"] == "metric_summary"}
+    assert summaries["complexity"]["functions"] == 3
+    assert summaries["complexity"]["threshold"] == 1
+    assert summaries["complexity"]["above_threshold"] == 1
+    assert sum(r["functions"] for r in records if r["kind"] == "metric_histogram" and r["metric"] == "loc") == 3
+    directories = [r for r in records if r["kind"] == "directory_summary"]
+    assert [r["directory"] for r in directories] == ["pkg", "."]
+    assert directories[0]["complexity_max"] == 8
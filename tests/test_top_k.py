@@ -0,0 +1,37 @@
+import random
+
+from src.minero.top_k import TopK
+
+
+def test_keeps_only_the_k_largest():
+    values = list(range(1000))
+    random.Random(7).shuffle(values)
+    ranking = TopK(5, key=lambda v: v)
+
+    for value in values:
+        ranking.push(value)
+
+    assert ranking.items() == [999, 998, 997, 996, 995]
+    assert len(ranking) == 5
+    assert ranking.seen == 1000
+    assert ranking.truncated
+
+
+def test_ties_keep_the_first_items_like_a_stable_sort():
+    items = [("a", 1), ("b", 3), ("c", 3), ("d", 2), ("e", 3)]
+    ranking = TopK(2, key=lambda item: item[1])
+
+    for item in items:
+        ranking.push(item)
+
+    assert ranking.items() == sorted(items, key=lambda item: item[1], reverse=True)[:2] == [("b", 3), ("c", 3)]
+
+
+def test_without_k_keeps_everything_sorted():
+    ranking = TopK(None, key=len)
+
+    for word in ["aa", "a", "aaa", "bb"]:
+        ranking.push(word)
+
+    assert ranking.items() == ["aaa", "aa", "bb", "a"]
+    assert not ranking.truncated
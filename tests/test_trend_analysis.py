@@ -0,0 +1,105 @@
+import json
+from array import array
+from unittest.mock import patch
+
+import pytest
+
+from src.minero.cache import AnalysisCache
+from src.minero.options import AnalysisOptions, OutputFormat
+from src.minero.parallel import worker_pool
+from src.minero import trend_analysis
+from src.minero.trend_analysis import collect_trend_history, iter_python_changes, matching_series, show_function_trend
+
+
+@pytest.fixture
+def repo(git_repo):
+    repo = git_repo()
+    repo.commit("primeiro", {
+        "app.py": "def run(a):\n    return a\n\nclass Job:\n    def step(self):\n        return 1\n",
+        "old.py": "def gone():\n    return 0\n",
+        "README.md": "# docs\n",
+    })
+    repo.commit("segundo", {
+        "app.py": "def run(a, b):\n    if a:\n        if b:\n            return b\n    return a\n\n"
+                  "class Job:\n    def step(self):\n        return 1\n",
+        "old.py": None,
+    })
+    repo.commit("só docs", {"README.md": "# mais docs\n"})
+    return repo
+
+
+def test_iter_python_changes_skips_deleted_and_non_python(repo):
+    changes = list(iter_python_changes(str(repo), "HEAD"))
+
+    assert [sorted(path for path, _ in files) for _, files in changes] == [["app.py", "old.py"], ["app.py"], []]
+    assert all(len(sha) == 40 for _, files in changes for _, sha in files)
+
+
+def test_history_records_points_per_commit(repo):
+    history = collect_trend_history(str(repo))
+
+    assert len(history.commits) == 2
+    run = history.series[("app.py", "run")]
+    assert isinstance(run.complexity, array)
+    assert list(run.commits) == [0, 1]
+    assert list(run.param_count) == [1, 2]
+    assert list(run.loc) == [2, 5]
+    assert run.complexity[1] > run.complexity[0]
+    assert list(history.series[("old.py", "gone")].commits) == [0]
+    assert [key for key, _ in matching_series(history, "Job.*")] == [("app.py", "Job.step")]
+
+
+def test_history_is_incremental_with_cache(repo, tmp_path):
+    cache = AnalysisCache(tmp_path / "cache.sqlite3")
+    collect_trend_history(str(repo), cache, "repo")
+    head = repo.git("rev-parse", "HEAD")
+    new_head = repo.commit("terceiro", {"app.py": "def run():\n    return 1\n"})
+
+    with patch("src.minero.trend_analysis.iter_python_changes", wraps=iter_python_changes) as spy:
+        history = collect_trend_history(str(repo), cache, "repo")
+        again = collect_trend_history(str(repo), cache, "repo")
+    cache.close()
+
+    spy.assert_called_once_with(str(repo), f"{head}..{new_head}")
+    assert list(history.series[("app.py", "run")].param_count) == [1, 2, 0]
+    assert list(again.series[("app.py", "run")].param_count) == [1, 2, 0]
+    assert ("app.py", "Job.step") in history.series
+
+
+def test_history_is_rebuilt_after_rewrite(repo, tmp_path):
+    cache = AnalysisCache(tmp_path / "cache.sqlite3")
+    collect_trend_history(str(repo), cache, "repo")
+    repo.git("reset", "-q", "--hard", "HEAD~2")
+    repo.commit("reescrito", {"app.py": "def run(a, b, c):\n    return a\n"})
+
+    history = collect_trend_history(str(repo), cache, "repo")
+    cache.close()
+
+    assert len(history.commits) == 2
+    assert list(history.series[("app.py", "run")].param_count) == [1, 3]
+    assert ("app.py", "Job.step") in history.series
+
+
+def test_history_with_pool_matches_serial(repo, monkeypatch):
+    monkeypatch.setattr("src.minero.parallel.BATCH_PER_WORKER", 1)
+    serial = collect_trend_history(str(repo))
+    with worker_pool(2) as pool:
+        parallel = collect_trend_history(str(repo), pool=pool)
+
+    assert parallel == serial
+
+
+def test_show_function_trend_ndjson(repo, capsys):
+    show_function_trend(str(repo), "run", AnalysisOptions(use_cache=False, output_format=OutputFormat.ndjson))
+
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(r["kind"], r["function_name"], r["param_count"]) for r in records] == \
+           [("trend_point", "run", 1), ("trend_point", "run", 2)]
+
+
+def test_show_function_trend_table(repo):
+    with patch.object(trend_analysis, "console") as mock_console:
+        show_function_trend(str(repo), None, AnalysisOptions(use_cache=False))
+
+    tables = [call.args[0] for call in mock_console.print.call_args_list if hasattr(call.args[0], "row_count")]
+    assert tables[0].row_count == 3
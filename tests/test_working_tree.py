@@ -0,0 +1,83 @@
+import pytest
+
+from src.minero.code_smells_analysis import check_code_smells
+from src.minero.options import AnalysisOptions, OutputFormat
+from src.minero.parallel import analyze_files
+from src.minero.param_analysis import check_functions_num_params
+from src.minero.working_tree import STAGED, WORKTREE, staged_files, working_tree_commits, worktree_paths
+
+
+@pytest.fixture
+def repo(tmp_path, git_repo):
+    repo = git_repo()
+    repo.commit("primeiro", {
+        "app.py": "def main():\n    return 1\n",
+        "old.py": "x = 1\n",
+        "pkg/util.py": "y = 2\n",
+        ".gitignore": "ignored.py\n",
+    })
+
+    # no índice: app.py modificado, staged.py novo e old.py removido
+    (tmp_path / "app.py").write_text("def main(a, b, c, d, e, f):\n    return 1\n")
+    (tmp_path / "staged.py").write_text("z = 3\n")
+    repo.git("add", "app.py", "staged.py")
+    repo.git("rm", "-q", "old.py")
+    # só no diretório de trabalho: app.py alterado de novo, util.py, um arquivo novo e um ignorado
+    (tmp_path / "app.py").write_text("def main(a, b, c, d, e, f, g):\n    return 1\n")
+    (tmp_path / "pkg" / "util.py").write_text("y = 3\n")
+    (tmp_path / "new.py").write_text("w = 4\n")
+    (tmp_path / "ignored.py").write_text("v = 5\n")
+    (tmp_path / "notes.txt").write_text("texto\n")
+    return tmp_path
+
+
+def test_staged_files_lists_index_blobs(repo):
+    files = dict(staged_files(str(repo)))
+
+    assert set(files) == {"app.py", "staged.py"}
+    assert all(len(sha) == 40 for sha in files.values())
+
+
+def test_worktree_paths_include_untracked_and_skip_ignored(repo):
+    assert sorted(worktree_paths(str(repo))) == ["app.py", "new.py", "pkg/util.py", "staged.py"]
+
+
+def test_staged_reads_index_content_not_disk(repo):
+    commits = 0
+    # os blobs são lidos enquanto o gerador está aberto
+    for commit in working_tree_commits(str(repo / "pkg"), staged=True):
+        commits += 1
+        results = {f.filename: r for f, r in analyze_files(commit.modified_files, check_functions_num_params, 5)}
+
+    assert commits == 1
+    assert commit.hash == STAGED
+    assert results["app.py"][0]["param_count"] == 6
+    assert results["staged.py"] == []
+
+
+def test_worktree_reads_disk_from_subdirectory(repo):
+    for commit in working_tree_commits(str(repo / "pkg")):
+        files = {f.filename: f for f in commit.modified_files}
+        assert commit.hash == WORKTREE
+        assert files["app.py"].blob_sha is None
+        assert files["app.py"].source_code.startswith("def main(a, b, c, d, e, f, g)")
+        assert files["pkg/util.py"].source_code == "y = 3\n"
+
+
+def test_worktree_before_first_commit(tmp_path, git_repo):
+    repo = git_repo()
+    (tmp_path / "a.py").write_text("a = 1\n")
+    (tmp_path / "b.py").write_text("b = 1\n")
+    repo.git("add", "a.py")
+
+    assert sorted(worktree_paths(str(tmp_path))) == ["a.py", "b.py"]
+    assert dict(staged_files(str(tmp_path))).keys() == {"a.py"}
+
+
+def test_code_smells_staged_ndjson(repo, capsys):
+    check_code_smells(str(repo), None, AnalysisOptions(staged=True, use_cache=False, output_format=OutputFormat.ndjson))
+
+    out = capsys.readouterr().out
+    assert '"commit_hash": "staged"' in out
+    assert '"file_path": "staged.py"' in out
+    assert "new.py" not in out